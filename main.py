@@ -1,15 +1,17 @@
 from fastapi import FastAPI, Request, Form
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.encoders import jsonable_encoder
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.concurrency import run_in_threadpool
 
 
-import pandas as pd
 import numpy as np
 from typing import Dict, Callable, Optional
 import json
+import logging
+import os
 
 from tools.tools import get_function_names 
 from tools.sympyUtilities import (
@@ -18,13 +20,16 @@ from tools.sympyUtilities import (
 
 
 # ===================== Ecuaciones no lineales =====================
-from tools.methods.newton import newton_method_controller
+from tools.methods.newton import newton_method_controller, newton_batch_controller, newton_basins_controller
 from tools.methods.modified_newton import newton_multiple_controller
 from tools.methods.bisection import bisection_controller
 from tools.methods.secant import secant_method_controller
-from tools.methods.false_position import false_position_controller
+from tools.methods.false_position import false_position_controller, VARIANTS as FALSE_POSITION_VARIANTS
+from tools.methods.brent import brent_controller
 from tools.methods.incremental_search import incremental_search
-from tools.methods.fixed_point import run_fixed_point_web
+from tools.root_isolation import isolate_roots
+from tools.methods.fixed_point import run_fixed_point_web, run_fixed_point_progress, compile_expr
+from tools.java_methods.muller.Muller import muller_controller, muller_batch, warm_up_muller
 
 # ===================== Sistemas de ecuaciones lineales =====================
 from tools.methods.gaussian_elimination_simple import gauss_simple
@@ -50,11 +55,19 @@ from tools.methods.lagrange import lagrange_interpolation_object
 #Trazadores
 from tools.methods.cubic_tracers import cubic_spline_method, save_cubic_tracer
 from tools.methods.quadratic_tracers import quadratic_spline_method, save_quadratic_tracer
+from tools.spline_log import spline_log
+from tools.progress import ProgressChannel, auto_every
+from tools.matrix_input import InputError, read_payload, require, as_matrix, as_vector, to_float_safe
+from tools.tables import Table, MEDIA_TYPES, lean, lean_log, packb, parse_format, render_html
+from tools.step_stream import StepStream
+from tools.jobs import JobManager, JobStoreFull, JobTooLarge
+from tools.result_cache import ResultCache, ResultCacheMiddleware
+from tools.admission import AdmissionControl, AdmissionMiddleware
 
 METHOD_CATEGORIES = {
     'Solution_of_Nonlinear_Equations': [
         'newton', 'modified_newton', 'bisection', 'secant',
-        'false_position', 'incremental_search', 'fixed_point'
+        'false_position', 'incremental_search', 'fixed_point', 'brent'
     ],
     'Solution_of_linear_system_equations': [
         'gaussian_elimination_simple', 'gaussian_elimination_with_pivot_partial',
@@ -67,54 +80,73 @@ METHOD_CATEGORIES = {
     ]
 }
 
+# Rutas deterministas: la misma entrada da siempre la misma respuesta, así
+# que se sirven desde la caché de resultados (no incluye /stream, trazadores
+# cúbicos/cuadráticos que escriben log, fixed_point que genera gráfico, ni
+# muller / muller_batch: su respuesta lleva timing.call_ms de esa llamada)
+CACHEABLE_PATHS = [
+    "/eval/" + name for name in (
+        "newton_method", "newton_batch", "newton_basins", "modified_newton", "bisection", "brent",
+        "secant", "false_position", "incremental_search",
+        "gauss_simple", "gauss_partial", "gauss_total", "crout", "doolittle", "lu_simple",
+        "lu_partial", "cholesky", "jacobi", "gauss_seidel", "SOR",
+        "vandermonde", "newton_interpolant", "lagrange", "lineal_tracers",
+    )
+]
+# RESULT_CACHE_DB=ruta.sqlite activa el nivel en disco (sobrevive reinicios)
+result_cache = ResultCache(db_path=os.environ.get("RESULT_CACHE_DB"))
+
+# Límites de tamaño por método y slots por familia (ver tools/admission.py)
+admission = AdmissionControl()
+
 app = FastAPI()
+# Logger de uvicorn: los mensajes de arranque salen junto a los del servidor
+logger = logging.getLogger("uvicorn.error")
+# El último middleware añadido es el exterior: la caché responde aciertos y
+# peticiones unidas sin ocupar slots de admisión
+app.add_middleware(AdmissionMiddleware, control=admission)
+app.add_middleware(ResultCacheMiddleware, cache=result_cache, paths=CACHEABLE_PATHS)
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
+
+@app.on_event("startup")
+def start_java_bridge():
+    # Arranca la JVM y enlaza la clase Muller una sola vez (no por request)
+    timing = warm_up_muller()
+    logger.info("Muller JVM bridge: %s", timing)
+
+
+@app.on_event("shutdown")
+def flush_spline_log():
+    # Vacía la cola del log de trazadores antes de salir
+    spline_log.close()
+
+
+@app.on_event("shutdown")
+def stop_job_pool():
+    # Cancela los jobs en cola y termina los procesos worker
+    jobs.shutdown()
+
 #Funciones auxiliares (Por favor no lo toquen que todo expltota)
 # ============================================================
 # FUNCIONES AUXILIARES PARA EL ENDPOINT gauss_simple_post
 # ============================================================
 
 import numpy as np
-import pandas as pd
 from fastapi.responses import JSONResponse
 from fastapi.encoders import jsonable_encoder
 
 
-def to_float_safe(x):
-    if x is None:
-        return None
-    if isinstance(x, (int, float, np.floating, np.integer)):
-        return float(x)
-    s = str(x).strip()
-    if s == "":
-        return None
-    s = s.replace(",", ".")
-    try:
-        return float(s)
-    except Exception:
-        return None
-
-def df_to_html(df: pd.DataFrame, decimals: int = 6):
-    float_fmt = f"%.{decimals}f"
-    # redondea para evitar representaciones largas y utiliza float_format
-    return df.round(decimals).to_html(index=False, classes="gauss-table", border=0, float_format=float_fmt)
-
-def df_to_json(df: pd.DataFrame):
-    return {"columns": list(df.columns.astype(str)), "rows": df.values.tolist()}
-
 def serialize_value(val, decimals: int = 6):
     """
-    Serializa DataFrame/Series/ndarray a {'html','json'} o lista/primitivo.
+    Serializa Table/ndarray a {'html','json'} o lista/primitivo.
     Si no es ninguno de esos, devuelve tal cual (serializable).
     """
-    if isinstance(val, pd.DataFrame):
-        return {"html": df_to_html(val, decimals), "json": df_to_json(val)}
-    if isinstance(val, pd.Series):
-        df = val.to_frame(name=val.name if val.name else "value")
-        return {"html": df_to_html(df, decimals), "json": df_to_json(df)}
+    if isinstance(val, Table):
+        # HTML con render_html (mismo marcado gauss-table que pandas.to_html, sin pandas)
+        return {"html": val.to_html(decimals), "json": val.to_json()}
     if isinstance(val, np.ndarray):
         return val.tolist()
     # para tipos simples (list, dict, str, int, float) devolvemos tal cual
@@ -146,9 +178,9 @@ def combine_A_b(log: dict, decimals: int = 6):
                 rowB = rowsB[i] if i < len(rowsB) else [None]
                 combined_rows.append(rowA + [rowB[0] if rowB else None])
 
-            df_comb = pd.DataFrame(combined_rows, columns=combined_cols)
             log["matrix_json"] = {"columns": combined_cols, "rows": combined_rows}
-            log["matrix"] = df_to_html(df_comb, decimals)
+            # None (filas de distinto largo) -> NaN, como hacía el DataFrame
+            log["matrix"] = render_html(np.array(combined_rows, dtype=float), combined_cols, decimals)
             return
 
         # si no hay nada con qué construir, dejar placeholder controlado
@@ -158,6 +190,77 @@ def combine_A_b(log: dict, decimals: int = 6):
         log["matrix_json"] = {"columns": [], "rows": []}
         log["matrix"] = "<p style='color:gray;font-style:italic;'>No matrix available for this step.</p>"
 
+def serialize_log(log: dict, decimals: int = 6) -> dict:
+    """Un paso de un método de eliminación: tablas a HTML + JSON y matriz A|b (modifica `log`)."""
+    # hacemos una copia de las claves porque las modificaremos
+    original_keys = list(log.keys())
+    for k in original_keys:
+        v = log.get(k)
+
+        # serializamos el valor
+        try:
+            ser = serialize_value(v, decimals)
+        except Exception:
+            # fallback a str si algo raro
+            ser = str(v)
+
+        # Si el serializador devolvió dict con html/json
+        if isinstance(ser, dict) and "html" in ser and "json" in ser:
+            if k == "matrix":
+                # mantener la clave 'matrix' como HTML (compatibilidad frontend)
+                log["matrix"] = ser["html"]
+                log["matrix_json"] = ser["json"]
+            else:
+                # para A, b, u otros: crear sufijos y eliminar original
+                log[f"{k}_html"] = ser["html"]
+                log[f"{k}_json"] = ser["json"]
+                # eliminar la clave original para no duplicar
+                if k in log:
+                    del log[k]
+        else:
+            log[k] = ser
+
+    combine_A_b(log, decimals)
+    return log
+
+def solve_and_serialize(method: Callable, A: list, b: list, decimals: int = 6, fmt: str = "html"):
+    """
+    Ejecuta un método de eliminación / factorización (gauss_*, crout,
+    doolittle) y serializa sus logs: tablas a HTML + JSON, matriz A|b.
+    fmt "json" / "msgpack": solo los números de cada tabla (sin pandas ni HTML).
+    Bloqueante: las rutas lo llaman con run_in_threadpool.
+    """
+    result = method(A, b, decimals)
+    if fmt == "msgpack":
+        return packb(lean(result))
+    if fmt == "json":
+        return lean(result)
+
+    for log in result.get("logs", []):
+        serialize_log(log, decimals)
+
+    # jsonable_encoder para asegurar serialización
+    return jsonable_encoder(result)
+
+async def solve_response(method: Callable, A, b, decimals: int, fmt: str):
+    """
+    Respuesta de un método de eliminación. html / json: cada paso se serializa
+    en cuanto el método lo produce y, si el log es grande, se envía en streaming
+    (tools/step_stream.py). msgpack: un solo cuerpo.
+    """
+    if fmt == "msgpack":
+        content = await run_in_threadpool(solve_and_serialize, method, A, b, decimals, fmt)
+        return Response(content=content, media_type=MEDIA_TYPES["msgpack"])
+    if fmt == "json":
+        stream = StepStream("logs", lean_log)
+    else:
+        stream = StepStream("logs", lambda log: jsonable_encoder(serialize_log(log, decimals)), jsonable_encoder)
+    return await stream.response(lambda steps: method(A, b, decimals, logs=steps))
+
+def response_format(request: Request, data: dict) -> str:
+    """format de la query (?format=json) o del cuerpo; 'html' por defecto. ValueError si no es válido."""
+    return parse_format(request.query_params.get("format") or data.get("format"))
+
 # ===================== VISTAS =====================
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
@@ -196,109 +299,81 @@ async def derivate_post(request: Request, function: str = Form(...)):
     return JSONResponse(content={"result": answer})
 
 @app.post("/eval/newton_method", response_class=HTMLResponse)
-async def newton_method_post(request: Request, function: str = Form(...), x0: float = Form(...), Nmax: int = Form(...), tol: float = Form(...), nrows: int = Form(...)):
-    answer = newton_method_controller(function=function, x0=x0, Nmax=Nmax, tol=tol, nrows=nrows)
+async def newton_method_post(request: Request, function: str = Form(...), x0: float = Form(...), Nmax: int = Form(...), tol: float = Form(...), nrows: int = Form(...), mode: str = Form("single"), trace_stride: int = Form(0)):
+    # mode="all_roots": todas las raíces de un polinomio (matriz compañera)
+    # trace_stride > 0: traza de toda la corrida (filas 0, s, 2s, ... y la última)
+    answer = newton_method_controller(function=function, x0=x0, Nmax=Nmax, tol=tol, nrows=nrows, mode=mode, trace_stride=trace_stride)
+    return JSONResponse(content=answer)
+
+@app.post("/eval/newton_batch", response_class=JSONResponse)
+async def newton_batch_post(request: Request, function: str = Form(...), a: float = Form(...), b: float = Form(...), n_starts: int = Form(50), Nmax: int = Form(...), tol: float = Form(...)):
+    # Newton vectorizado desde n_starts puntos de [a, b]; raíces sin duplicados
+    answer = await run_in_threadpool(newton_batch_controller, function, a, b, n_starts, Nmax, tol)
     return JSONResponse(content=answer)
 
+@app.post("/eval/newton_basins")
+async def newton_basins_post(request: Request, function: str = Form(...), re_min: float = Form(-2.0), re_max: float = Form(2.0), im_min: float = Form(-2.0), im_max: float = Form(2.0), width: int = Form(500), height: int = Form(500), Nmax: int = Form(50), tol: float = Form(1e-8), workers: int = Form(0), output: str = Form("png")):
+    # output="png" -> image/png; output="raw" -> JSON con etiquetas/iteraciones uint8 en base64
+    try:
+        answer = await run_in_threadpool(newton_basins_controller, function, re_min, re_max, im_min, im_max, width, height, Nmax, tol, workers, output)
+    except (ValueError, TypeError) as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+
+    if output == "raw":
+        return JSONResponse(content=answer)
+    return Response(
+        content=answer["png"],
+        media_type="image/png",
+        headers={
+            "X-Basins-Roots": str(len(answer["roots"])),
+            "X-Basins-Converged": f"{answer['converged_fraction']:.4f}",
+            "X-Compute-Ms": f"{answer['compute_ms']:.1f}",
+        },
+    )
+
 @app.post("/eval/modified_newton", response_class=HTMLResponse)
-async def modified_newton_post(request: Request, function: str = Form(...), df: Optional[str] = Form(None), d2f: Optional[str] = Form(None), x0: float = Form(...), Nmax: int = Form(...), tol: float = Form(...), nrows: int = Form(...)):
-    answer = newton_multiple_controller(function=function, x0=x0, Nmax=Nmax, tol=tol, nrows=nrows, df=df, d2f=d2f)
+async def modified_newton_post(request: Request, function: str = Form(...), df: Optional[str] = Form(None), d2f: Optional[str] = Form(None), x0: float = Form(...), Nmax: int = Form(...), tol: float = Form(...), nrows: int = Form(...), mode: str = Form("single"), trace_stride: int = Form(0)):
+    answer = newton_multiple_controller(function=function, x0=x0, Nmax=Nmax, tol=tol, nrows=nrows, df=df, d2f=d2f, mode=mode, trace_stride=trace_stride)
     return JSONResponse(content=answer)
 
 @app.post("/eval/bisection", response_class=HTMLResponse)
-async def bisection_post(request: Request, function: str = Form(...), a: float = Form(...), b: float = Form(...), nmax: int = Form(...), tolerance: float = Form(...), last_n_rows: int = Form(...)):
-    answer = bisection_controller(function=function, a=a, b=b, nmax=nmax, tolerance=tolerance, last_n_rows=last_n_rows)
+async def bisection_post(request: Request, function: str = Form(...), a: float = Form(...), b: float = Form(...), nmax: int = Form(...), tolerance: float = Form(...), last_n_rows: int = Form(...), trace_stride: int = Form(0)):
+    answer = bisection_controller(function=function, a=a, b=b, nmax=nmax, tolerance=tolerance, last_n_rows=last_n_rows, trace_stride=trace_stride)
+    return JSONResponse(content=answer)
+
+@app.post("/eval/brent", response_class=JSONResponse)
+async def brent_post(request: Request, function: str = Form(...), a: float = Form(...), b: float = Form(...), nmax: int = Form(...), tolerance: float = Form(...), last_n_rows: int = Form(...), trace_stride: int = Form(0)):
+    answer = brent_controller(function=function, a=a, b=b, nmax=nmax, tolerance=tolerance, last_n_rows=last_n_rows, trace_stride=trace_stride)
     return JSONResponse(content=answer)
 
 @app.post("/eval/gauss_simple", response_class=JSONResponse)
 async def gauss_simple_post(request: Request):
     try:
         try:
-            data = await request.json()
-        except Exception:
-            return JSONResponse(content={"error": "Invalid JSON body."}, status_code=400)
-
-        A = data.get("A")
-        b = data.get("b")
+            data = await read_payload(request)
+            require(data, "A", "b")
+            # A y b a float64 contiguos en un paso (reporta la primera celda inválida)
+            A_conv = as_matrix(data["A"], "A")
+            b_conv = as_vector(data["b"], "b")
+        except InputError as e:
+            return JSONResponse(content={"error": str(e)}, status_code=400)
         decimals = data.get("decimals", 6)
 
-        if A is None or b is None:
-            return JSONResponse(content={"error": "Parameters 'A' and 'b' are required."}, status_code=400)
-
-        # Validaciones básicas
-        if not (isinstance(A, list) and all(isinstance(row, list) for row in A) and A):
-            return JSONResponse(content={"error": "Matrix 'A' must be a non-empty list of lists."}, status_code=400)
-        if not (isinstance(b, list) and b):
-            return JSONResponse(content={"error": "Vector 'b' must be a non-empty list."}, status_code=400)
-
-        cols = len(A[0])
-        if not all(len(row) == cols for row in A):
-            return JSONResponse(content={"error": "All rows in 'A' must have the same length."}, status_code=400)
-
-        # Conversión a floats
-        A_conv = []
-        for i, row in enumerate(A):
-            row_conv = []
-            for j, val in enumerate(row):
-                f = to_float_safe(val)
-                if f is None:
-                    return JSONResponse(content={"error": f"Non-numeric value at A[{i+1}][{j+1}] → {repr(val)}"}, status_code=400)
-                row_conv.append(f)
-            A_conv.append(row_conv)
-
-        b_conv = []
-        for i, val in enumerate(b):
-            f = to_float_safe(val)
-            if f is None:
-                return JSONResponse(content={"error": f"Non-numeric value at b[{i+1}] → {repr(val)}"}, status_code=400)
-            b_conv.append(f)
-
         try:
             decimals = int(decimals)
             if not (0 <= decimals <= 10):
                 raise ValueError
         except (TypeError, ValueError):
             return JSONResponse(content={"error": "Parameter 'decimals' must be an integer between 0 and 10."}, status_code=400)
+        try:
+            fmt = response_format(request, data)
+        except ValueError as e:
+            return JSONResponse(content={"error": str(e)}, status_code=400)
 
         # Llamada al cálculo (tu función)
-        result = gauss_simple(A_conv, b_conv, decimals)
-
-        # Serializar logs correctamente
-        for log in result.get("logs", []):
-            # hacemos una copia de las claves porque las modificaremos
-            original_keys = list(log.keys())
-            for k in original_keys:
-                v = log.get(k)
-
-                # serializamos el valor
-                try:
-                    ser = serialize_value(v, decimals)
-                except Exception:
-                    # fallback a str si algo raro
-                    ser = str(v)
-
-                # Si el serializador devolvió dict con html/json
-                if isinstance(ser, dict) and "html" in ser and "json" in ser:
-                    if k == "matrix":
-                        # mantener la clave 'matrix' como HTML (compatibilidad frontend)
-                        log["matrix"] = ser["html"]
-                        log["matrix_json"] = ser["json"]
-                    else:
-                        # para A, b, u otros: crear sufijos y eliminar original
-                        log[f"{k}_html"] = ser["html"]
-                        log[f"{k}_json"] = ser["json"]
-                        # eliminar la clave original para no duplicar
-                        if k in log:
-                            del log[k]
-                else:
-                    
-                    log[k] = ser
-
-            
-            combine_A_b(log, decimals)
-
-        # Responder con jsonable_encoder para asegurar serialización
-        return JSONResponse(content=jsonable_encoder(result), status_code=200)
+        # Cálculo + serialización fuera del event loop (las peticiones idénticas
+        # que llegan mientras tanto se unen a este mismo cálculo)
+        return await solve_response(gauss_simple, A_conv, b_conv, decimals, fmt)
 
     except Exception as e:
         return JSONResponse(content={"error": f"Internal server error: {str(e)}"}, status_code=500)
@@ -308,54 +383,15 @@ async def gauss_total_post(request: Request):
     try:
     
         try:
-            data = await request.json()
-        except Exception:
-            return JSONResponse(content={"error": "Invalid JSON body."}, status_code=400)
-
-        A = data.get("A")
-        b = data.get("b")
+            data = await read_payload(request)
+            require(data, "A", "b")
+            # A y b a float64 contiguos en un paso (reporta la primera celda inválida)
+            A_conv = as_matrix(data["A"], "A")
+            b_conv = as_vector(data["b"], "b")
+        except InputError as e:
+            return JSONResponse(content={"error": str(e)}, status_code=400)
         decimals = data.get("decimals", 6)
 
-        if A is None or b is None:
-            return JSONResponse(
-                content={"error": "Parameters 'A' and 'b' are required."},
-                status_code=400
-            )
-
-
-        if not (isinstance(A, list) and all(isinstance(row, list) for row in A) and A):
-            return JSONResponse(content={"error": "Matrix 'A' must be a non-empty list of lists."}, status_code=400)
-        if not (isinstance(b, list) and b):
-            return JSONResponse(content={"error": "Vector 'b' must be a non-empty list."}, status_code=400)
-
-        cols = len(A[0])
-        if not all(len(row) == cols for row in A):
-            return JSONResponse(content={"error": "All rows in 'A' must have the same length."}, status_code=400)
-
-
-        A_conv = []
-        for i, row in enumerate(A):
-            row_conv = []
-            for j, val in enumerate(row):
-                f = to_float_safe(val)
-                if f is None:
-                    return JSONResponse(
-                        content={"error": f"Non-numeric value at A[{i+1}][{j+1}] → {repr(val)}"},
-                        status_code=400
-                    )
-                row_conv.append(f)
-            A_conv.append(row_conv)
-
-        b_conv = []
-        for i, val in enumerate(b):
-            f = to_float_safe(val)
-            if f is None:
-                return JSONResponse(
-                    content={"error": f"Non-numeric value at b[{i+1}] → {repr(val)}"},
-                    status_code=400
-                )
-            b_conv.append(f)
-
      
         try:
             decimals = int(decimals)
@@ -363,36 +399,15 @@ async def gauss_total_post(request: Request):
                 raise ValueError
         except (TypeError, ValueError):
             return JSONResponse(content={"error": "Parameter 'decimals' must be an integer between 0 and 10."}, status_code=400)
+        try:
+            fmt = response_format(request, data)
+        except ValueError as e:
+            return JSONResponse(content={"error": str(e)}, status_code=400)
 
        
-        result = gauss_total(A_conv, b_conv, decimals)
-
-       
-        for log in result.get("logs", []):
-            original_keys = list(log.keys())
-            for k in original_keys:
-                v = log.get(k)
-                try:
-                    ser = serialize_value(v, decimals)
-                except Exception:
-                    ser = str(v)
-
-                if isinstance(ser, dict) and "html" in ser and "json" in ser:
-                    if k == "matrix":
-                        log["matrix"] = ser["html"]
-                        log["matrix_json"] = ser["json"]
-                    else:
-                        log[f"{k}_html"] = ser["html"]
-                        log[f"{k}_json"] = ser["json"]
-                        if k in log:
-                            del log[k]
-                else:
-                    log[k] = ser
-
-          
-            combine_A_b(log, decimals)
-
-        return JSONResponse(content=jsonable_encoder(result), status_code=200)
+        # Cálculo + serialización fuera del event loop (las peticiones idénticas
+        # que llegan mientras tanto se unen a este mismo cálculo)
+        return await solve_response(gauss_total, A_conv, b_conv, decimals, fmt)
 
     except Exception as e:
         return JSONResponse(content={"error": f"Internal server error: {str(e)}"}, status_code=500)
@@ -402,54 +417,15 @@ async def gauss_partial_post(request: Request):
     try:
     
         try:
-            data = await request.json()
-        except Exception:
-            return JSONResponse(content={"error": "Invalid JSON body."}, status_code=400)
-
-        A = data.get("A")
-        b = data.get("b")
+            data = await read_payload(request)
+            require(data, "A", "b")
+            # A y b a float64 contiguos en un paso (reporta la primera celda inválida)
+            A_conv = as_matrix(data["A"], "A")
+            b_conv = as_vector(data["b"], "b")
+        except InputError as e:
+            return JSONResponse(content={"error": str(e)}, status_code=400)
         decimals = data.get("decimals", 6)
 
-        if A is None or b is None:
-            return JSONResponse(
-                content={"error": "Parameters 'A' and 'b' are required."},
-                status_code=400
-            )
-
-
-        if not (isinstance(A, list) and all(isinstance(row, list) for row in A) and A):
-            return JSONResponse(content={"error": "Matrix 'A' must be a non-empty list of lists."}, status_code=400)
-        if not (isinstance(b, list) and b):
-            return JSONResponse(content={"error": "Vector 'b' must be a non-empty list."}, status_code=400)
-
-        cols = len(A[0])
-        if not all(len(row) == cols for row in A):
-            return JSONResponse(content={"error": "All rows in 'A' must have the same length."}, status_code=400)
-
-
-        A_conv = []
-        for i, row in enumerate(A):
-            row_conv = []
-            for j, val in enumerate(row):
-                f = to_float_safe(val)
-                if f is None:
-                    return JSONResponse(
-                        content={"error": f"Non-numeric value at A[{i+1}][{j+1}] → {repr(val)}"},
-                        status_code=400
-                    )
-                row_conv.append(f)
-            A_conv.append(row_conv)
-
-        b_conv = []
-        for i, val in enumerate(b):
-            f = to_float_safe(val)
-            if f is None:
-                return JSONResponse(
-                    content={"error": f"Non-numeric value at b[{i+1}] → {repr(val)}"},
-                    status_code=400
-                )
-            b_conv.append(f)
-
      
         try:
             decimals = int(decimals)
@@ -457,37 +433,15 @@ async def gauss_partial_post(request: Request):
                 raise ValueError
         except (TypeError, ValueError):
             return JSONResponse(content={"error": "Parameter 'decimals' must be an integer between 0 and 10."}, status_code=400)
+        try:
+            fmt = response_format(request, data)
+        except ValueError as e:
+            return JSONResponse(content={"error": str(e)}, status_code=400)
 
        
-        result = gauss_partial(A_conv, b_conv, decimals)
-
-       
-        for log in result.get("logs", []):
-            original_keys = list(log.keys())
-            for k in original_keys:
-                v = log.get(k)
-
-                try:
-                    ser = serialize_value(v, decimals)
-                except Exception:
-                    ser = str(v)
-
-                if isinstance(ser, dict) and "html" in ser and "json" in ser:
-                    if k == "matrix":
-                        log["matrix"] = ser["html"]
-                        log["matrix_json"] = ser["json"]
-                    else:
-                        log[f"{k}_html"] = ser["html"]
-                        log[f"{k}_json"] = ser["json"]
-                        if k in log:
-                            del log[k]
-                else:
-                    log[k] = ser
-
-          
-            combine_A_b(log, decimals)
-
-        return JSONResponse(content=jsonable_encoder(result), status_code=200)
+        # Cálculo + serialización fuera del event loop (las peticiones idénticas
+        # que llegan mientras tanto se unen a este mismo cálculo)
+        return await solve_response(gauss_partial, A_conv, b_conv, decimals, fmt)
 
     except Exception as e:
         return JSONResponse(content={"error": f"Internal server error: {str(e)}"}, status_code=500)
@@ -497,55 +451,15 @@ async def crout_post(request: Request):
     try:
         # Parse JSON safely
         try:
-            data = await request.json()
-        except Exception:
-            return JSONResponse(content={"error": "Invalid JSON body."}, status_code=400)
-
-        A = data.get("A")
-        b = data.get("b")
+            data = await read_payload(request)
+            require(data, "A", "b")
+            # A y b a float64 contiguos en un paso (reporta la primera celda inválida)
+            A_conv = as_matrix(data["A"], "A")
+            b_conv = as_vector(data["b"], "b")
+        except InputError as e:
+            return JSONResponse(content={"error": str(e)}, status_code=400)
         decimals = data.get("decimals", 6)
 
-        # Check required parameters
-        if A is None or b is None:
-            return JSONResponse(
-                content={"error": "Parameters 'A' and 'b' are required."},
-                status_code=400
-            )
-
-        # Validate matrix A and vector b structure
-        if not (isinstance(A, list) and all(isinstance(row, list) for row in A) and A):
-            return JSONResponse(content={"error": "Matrix 'A' must be a non-empty list of lists."}, status_code=400)
-        if not (isinstance(b, list) and b):
-            return JSONResponse(content={"error": "Vector 'b' must be a non-empty list."}, status_code=400)
-
-        cols = len(A[0])
-        if not all(len(row) == cols for row in A):
-            return JSONResponse(content={"error": "All rows in 'A' must have the same length."}, status_code=400)
-
-        # Convert to float safely
-        A_conv = []
-        for i, row in enumerate(A):
-            row_conv = []
-            for j, val in enumerate(row):
-                f = to_float_safe(val)
-                if f is None:
-                    return JSONResponse(
-                        content={"error": f"Non-numeric value at A[{i+1}][{j+1}] → {repr(val)}"},
-                        status_code=400
-                    )
-                row_conv.append(f)
-            A_conv.append(row_conv)
-
-        b_conv = []
-        for i, val in enumerate(b):
-            f = to_float_safe(val)
-            if f is None:
-                return JSONResponse(
-                    content={"error": f"Non-numeric value at b[{i+1}] → {repr(val)}"},
-                    status_code=400
-                )
-            b_conv.append(f)
-
         # Validate decimals
         try:
             decimals = int(decimals)
@@ -553,36 +467,15 @@ async def crout_post(request: Request):
                 raise ValueError
         except (TypeError, ValueError):
             return JSONResponse(content={"error": "Parameter 'decimals' must be an integer between 0 and 10."}, status_code=400)
+        try:
+            fmt = response_format(request, data)
+        except ValueError as e:
+            return JSONResponse(content={"error": str(e)}, status_code=400)
 
         # Compute Crout decomposition result
-        result = crout(A_conv, b_conv, decimals)
-
-        # Serialize DataFrames and combine A|b for visualization
-        for log in result.get("logs", []):
-            original_keys = list(log.keys())
-            for k in original_keys:
-                v = log.get(k)
-
-                try:
-                    ser = serialize_value(v, decimals)
-                except Exception:
-                    ser = str(v)
-
-                if isinstance(ser, dict) and "html" in ser and "json" in ser:
-                    if k == "matrix":
-                        log["matrix"] = ser["html"]
-                        log["matrix_json"] = ser["json"]
-                    else:
-                        log[f"{k}_html"] = ser["html"]
-                        log[f"{k}_json"] = ser["json"]
-                        if k in log:
-                            del log[k]
-                else:
-                    log[k] = ser
-
-            combine_A_b(log, decimals)
-
-        return JSONResponse(content=jsonable_encoder(result), status_code=200)
+        # Cálculo + serialización fuera del event loop (las peticiones idénticas
+        # que llegan mientras tanto se unen a este mismo cálculo)
+        return await solve_response(crout, A_conv, b_conv, decimals, fmt)
 
     except Exception as e:
         return JSONResponse(content={"error": f"Internal server error: {str(e)}"}, status_code=500)
@@ -592,55 +485,15 @@ async def doolittle_post(request: Request):
     try:
         # Parse JSON safely
         try:
-            data = await request.json()
-        except Exception:
-            return JSONResponse(content={"error": "Invalid JSON body."}, status_code=400)
-
-        A = data.get("A")
-        b = data.get("b")
+            data = await read_payload(request)
+            require(data, "A", "b")
+            # A y b a float64 contiguos en un paso (reporta la primera celda inválida)
+            A_conv = as_matrix(data["A"], "A")
+            b_conv = as_vector(data["b"], "b")
+        except InputError as e:
+            return JSONResponse(content={"error": str(e)}, status_code=400)
         decimals = data.get("decimals", 6)
 
-        # Check required parameters
-        if A is None or b is None:
-            return JSONResponse(
-                content={"error": "Parameters 'A' and 'b' are required."},
-                status_code=400
-            )
-
-        # Validate matrix A and vector b structure
-        if not (isinstance(A, list) and all(isinstance(row, list) for row in A) and A):
-            return JSONResponse(content={"error": "Matrix 'A' must be a non-empty list of lists."}, status_code=400)
-        if not (isinstance(b, list) and b):
-            return JSONResponse(content={"error": "Vector 'b' must be a non-empty list."}, status_code=400)
-
-        cols = len(A[0])
-        if not all(len(row) == cols for row in A):
-            return JSONResponse(content={"error": "All rows in 'A' must have the same length."}, status_code=400)
-
-        # Convert to float safely
-        A_conv = []
-        for i, row in enumerate(A):
-            row_conv = []
-            for j, val in enumerate(row):
-                f = to_float_safe(val)
-                if f is None:
-                    return JSONResponse(
-                        content={"error": f"Non-numeric value at A[{i+1}][{j+1}] → {repr(val)}"},
-                        status_code=400
-                    )
-                row_conv.append(f)
-            A_conv.append(row_conv)
-
-        b_conv = []
-        for i, val in enumerate(b):
-            f = to_float_safe(val)
-            if f is None:
-                return JSONResponse(
-                    content={"error": f"Non-numeric value at b[{i+1}] → {repr(val)}"},
-                    status_code=400
-                )
-            b_conv.append(f)
-
         # Validate decimals
         try:
             decimals = int(decimals)
@@ -648,36 +501,15 @@ async def doolittle_post(request: Request):
                 raise ValueError
         except (TypeError, ValueError):
             return JSONResponse(content={"error": "Parameter 'decimals' must be an integer between 0 and 10."}, status_code=400)
+        try:
+            fmt = response_format(request, data)
+        except ValueError as e:
+            return JSONResponse(content={"error": str(e)}, status_code=400)
 
         # Compute Doolittle decomposition result
-        result = doolittle(A_conv, b_conv, decimals)
-
-        # Serialize DataFrames and combine A|b for visualization
-        for log in result.get("logs", []):
-            original_keys = list(log.keys())
-            for k in original_keys:
-                v = log.get(k)
-
-                try:
-                    ser = serialize_value(v, decimals)
-                except Exception:
-                    ser = str(v)
-
-                if isinstance(ser, dict) and "html" in ser and "json" in ser:
-                    if k == "matrix":
-                        log["matrix"] = ser["html"]
-                        log["matrix_json"] = ser["json"]
-                    else:
-                        log[f"{k}_html"] = ser["html"]
-                        log[f"{k}_json"] = ser["json"]
-                        if k in log:
-                            del log[k]
-                else:
-                    log[k] = ser
-
-            combine_A_b(log, decimals)
-
-        return JSONResponse(content=jsonable_encoder(result), status_code=200)
+        # Cálculo + serialización fuera del event loop (las peticiones idénticas
+        # que llegan mientras tanto se unen a este mismo cálculo)
+        return await solve_response(doolittle, A_conv, b_conv, decimals, fmt)
 
     except Exception as e:
         return JSONResponse(content={"error": f"Internal server error: {str(e)}"}, status_code=500)
@@ -689,9 +521,30 @@ async def incremental_search_post(request: Request, function: str = Form(...), x
     answer = incremental_search(f=f, x0=x0, delta_x=delta_x, max_iter=max_iter)
     return JSONResponse(content=answer)
 
+@app.post("/eval/root_isolation")
+async def root_isolation_post(request: Request, function: str = Form(...), x0: float = Form(...), delta_x: float = Form(...), max_iter: int = Form(...), method: str = Form("bisection"), nmax: int = Form(100), tolerance: float = Form(1e-7)):
+    # Búsqueda incremental + refinamiento de todos los intervalos en paralelo.
+    # Respuesta NDJSON: una línea por evento (scan, root..., done) apenas está lista.
+    events = isolate_roots(function, x0, delta_x, max_iter, method=method, nmax=nmax, tolerance=tolerance)
+    try:
+        # El escaneo corre antes de abrir el stream: los errores de entrada son un 400
+        first = await run_in_threadpool(next, events)
+    except (ValueError, TypeError) as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+
+    def lines():
+        yield json.dumps(first) + "\n"
+        for event in events:
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 @app.post("/eval/false_position", response_class=HTMLResponse)
-async def false_position_post(request: Request, function: str = Form(...), a: float = Form(...), b: float = Form(...), nmax: int = Form(...), tolerance: float = Form(...), last_n_rows: int = Form(...)):
-    answer = false_position_controller(function=function, a=a, b=b, nmax=nmax, tolerance=tolerance, last_n_rows=last_n_rows)
+async def false_position_post(request: Request, function: str = Form(...), a: float = Form(...), b: float = Form(...), nmax: int = Form(...), tolerance: float = Form(...), last_n_rows: int = Form(...), variant: str = Form("classic"), trace_stride: int = Form(0)):
+    # variant: classic | illinois | pegasus | anderson_bjorck
+    if variant not in FALSE_POSITION_VARIANTS:
+        return JSONResponse(content={"error": f"Unknown variant '{variant}', expected one of: {', '.join(FALSE_POSITION_VARIANTS)}."}, status_code=400)
+    answer = false_position_controller(function=function, a=a, b=b, nmax=nmax, tolerance=tolerance, last_n_rows=last_n_rows, variant=variant, trace_stride=trace_stride)
     return JSONResponse(content=answer)
 
 
@@ -707,6 +560,7 @@ async def eval_fixed_point(request: Request):
     tol_str = form.get("tol") or "1e-6"
     max_iter_str = form.get("max_iter") or "100"
     use_rel = form.get("use_relative_error") is not None
+    acceleration = (form.get("acceleration") or "none").strip().lower()
 
     
     try:
@@ -730,17 +584,20 @@ async def eval_fixed_point(request: Request):
         "tol": tol,
         "max_iter": max_iter,
         "use_relative_error": use_rel,
+        "acceleration": acceleration,
     }
 
     try:
-        
-        result = run_fixed_point_web(
+        # Iteración + render del gráfico fuera del event loop
+        result = await run_in_threadpool(
+            run_fixed_point_web,
             g_text=g_text,
             f_text=f_text,
             x0=x0,
             tol=tol,
             max_iter=max_iter,
             use_relative_error=use_rel,
+            acceleration=acceleration,
         )
 
         context = {
@@ -759,9 +616,40 @@ async def eval_fixed_point(request: Request):
 
     return templates.TemplateResponse("methods/fixed_point.html", context)
 
+@app.post("/eval/muller", response_class=JSONResponse)
+async def muller_post(request: Request, function: str = Form(...), p0: float = Form(...), p1: float = Form(...), p2: float = Form(...), nmax: int = Form(...), tolerance: float = Form(...), last_n_rows: int = Form(...), mode: str = Form("single")):
+    # La llamada a Java es bloqueante: se ejecuta en el threadpool
+    answer = await run_in_threadpool(muller_controller, function, p0, p1, p2, nmax, last_n_rows, tolerance, mode)
+    return JSONResponse(content=answer)
+
+@app.post("/eval/muller_batch", response_class=JSONResponse)
+async def muller_batch_post(request: Request):
+    # Cuerpo JSON: {"function": str | "functions": [...], "starts": [[p0, p1, p2], ...], "nmax": int, "tolerance": float}
+    try:
+        data = await request.json()
+    except Exception:
+        return JSONResponse(content={"error": "Invalid JSON body."}, status_code=400)
+
+    functions = data.get("functions", data.get("function"))
+    starts = data.get("starts")
+    if not functions or not isinstance(starts, list) or not starts:
+        return JSONResponse(content={"error": "Parameters 'function(s)' and 'starts' are required."}, status_code=400)
+    if not all(isinstance(s, (list, tuple)) and len(s) == 3 for s in starts):
+        return JSONResponse(content={"error": "Each start must be a list [p0, p1, p2]."}, status_code=400)
+
+    try:
+        p0s, p1s, p2s = zip(*[[float(v) for v in s] for s in starts])
+        nmax = int(data.get("nmax", 100))
+        tolerance = float(data.get("tolerance", 1e-7))
+    except (TypeError, ValueError):
+        return JSONResponse(content={"error": "Starts, 'nmax' and 'tolerance' must be numeric."}, status_code=400)
+
+    answer = await run_in_threadpool(muller_batch, functions, p0s, p1s, p2s, nmax, tolerance)
+    return JSONResponse(content=answer)
+
 @app.post("/eval/secant", response_class=HTMLResponse)
-async def secant_method_post(request: Request, function: str = Form(...), x0: float = Form(...), x1: float = Form(...), Nmax: int = Form(...), tol: float = Form(...), nrows: int = Form(...)):
-    answer = secant_method_controller(function=function, x0=x0, x1=x1, Nmax=Nmax, tol=tol, nrows=nrows)
+async def secant_method_post(request: Request, function: str = Form(...), x0: float = Form(...), x1: float = Form(...), Nmax: int = Form(...), tol: float = Form(...), nrows: int = Form(...), trace_stride: int = Form(0)):
+    answer = secant_method_controller(function=function, x0=x0, x1=x1, Nmax=Nmax, tol=tol, nrows=nrows, trace_stride=trace_stride)
     return JSONResponse(content=answer)
 
 
@@ -778,41 +666,23 @@ def _is_number(x):
     except (TypeError, ValueError):
         return False
 
-def _validate_matrix(A):
-    if not (isinstance(A, list) and A and all(isinstance(row, list) for row in A)):
-        return "Matrix 'A' must be a non-empty list of lists."
-    cols = len(A[0])
-    if not all(len(row) == cols for row in A):
-        return "All rows in 'A' must have the same length."
-    for i, row in enumerate(A):
-        for j, val in enumerate(row):
-            if not _is_number(val):
-                return f"Non-numeric value at A[{i+1}][{j+1}] → {repr(val)}"
-    return None
-
-def _validate_vector(name, v):
-    if not (isinstance(v, list) and v):
-        return f"Vector '{name}' must be a non-empty list."
-    for i, val in enumerate(v):
-        if not _is_number(val):
-            return f"Non-numeric value at {name}[{i+1}] → {repr(val)}"
-    return None
-
-
 @app.post("/eval/lu_partial", response_class=JSONResponse)
 async def lu_partial_eval(request: Request):
     try:
         try:
-            data = await request.json()
-        except Exception:
-            return JSONResponse({"error": "Invalid JSON body."}, status_code=400)
+            data = await read_payload(request)
+        except InputError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
 
         A = data.get("A"); b = data.get("b")
-        err = _validate_matrix(A) or _validate_vector("b", b)
-        if err: return JSONResponse({"error": err}, status_code=400)
+        try:
+            A = as_matrix(A); b = as_vector(b, "b")
+        except InputError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
 
-        result = compute_gauss_pivote_parcial(A, b, track_etapas=True)
-        return JSONResponse(content=result, status_code=200)
+        # Cada etapa sale en cuanto se calcula (streaming si el log es grande)
+        return await StepStream("etapas").response(
+            lambda steps: compute_gauss_pivote_parcial(A, b, track_etapas=True, steps=steps))
     except Exception as e:
         return JSONResponse({"error": f"Internal server error: {str(e)}"}, status_code=500)
     
@@ -820,16 +690,19 @@ async def lu_partial_eval(request: Request):
 async def lu_simple_eval(request: Request):
     try:
         try:
-            data = await request.json()
-        except Exception:
-            return JSONResponse({"error": "Invalid JSON body."}, status_code=400)
+            data = await read_payload(request)
+        except InputError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
 
         A = data.get("A"); b = data.get("b")
-        err = _validate_matrix(A) or _validate_vector("b", b)
-        if err: return JSONResponse({"error": err}, status_code=400)
+        try:
+            A = as_matrix(A); b = as_vector(b, "b")
+        except InputError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
 
-        result = compute_lu_simple(A, b, track_etapas=True)
-        return JSONResponse(content=result, status_code=200)
+        # Cada etapa sale en cuanto se calcula (streaming si el log es grande)
+        return await StepStream("etapas").response(
+            lambda steps: compute_lu_simple(A, b, track_etapas=True, steps=steps))
     except Exception as e:
         return JSONResponse({"error": f"Internal server error: {str(e)}"}, status_code=500)
 
@@ -851,7 +724,7 @@ async def vandermonde_eval(request: Request):
             if not _is_number(v):
                 return JSONResponse({"error": f"Non-numeric value at y[{i+1}] → {repr(v)}"}, status_code=400)
 
-        result = compute_vandermonde(x, y)
+        result = await run_in_threadpool(compute_vandermonde, x, y)
         return JSONResponse(content=result, status_code=200)
     except Exception as e:
         return JSONResponse({"error": f"Internal server error: {str(e)}"}, status_code=500)
@@ -874,7 +747,7 @@ async def newton_interpolant(request: Request):
             if not _is_number(v):
                 return JSONResponse({"error": f"Non-numeric value at y[{i+1}] → {repr(v)}"}, status_code=400)
 
-        result = newton_interpolant_object(x, y)
+        result = await run_in_threadpool(newton_interpolant_object, x, y)
         return JSONResponse(content=result, status_code=200)
     except Exception as e:
         return JSONResponse({"error": f"Internal server error: {str(e)}"}, status_code=500)
@@ -898,7 +771,7 @@ async def newton_interpolant(request: Request):
             if not _is_number(v):
                 return JSONResponse({"error": f"Non-numeric value at y[{i+1}] → {repr(v)}"}, status_code=400)
 
-        result = lagrange_interpolation_object(x, y)
+        result = await run_in_threadpool(lagrange_interpolation_object, x, y)
         return JSONResponse(content=result, status_code=200)
     except Exception as e:
         return JSONResponse({"error": f"Internal server error: {str(e)}"}, status_code=500)
@@ -925,7 +798,7 @@ async def lineal_tracers_eval(request: Request):
             if not _is_number(v):
                 return JSONResponse({"error": f"Non-numeric value at y[{i+1}] → {repr(v)}"}, status_code=400)
 
-        result = compute_trazadores_lineales(x, y)
+        result = await run_in_threadpool(compute_trazadores_lineales, x, y)
         return JSONResponse(content=result, status_code=200)
     except Exception as e:
         return JSONResponse({"error": f"Internal server error: {str(e)}"}, status_code=500)
@@ -935,18 +808,21 @@ async def lineal_tracers_eval(request: Request):
 async def cholesky_eval(request: Request):
     try:
         try:
-            data = await request.json()
-        except Exception:
-            return JSONResponse({"error": "Invalid JSON body."}, status_code=400)
+            data = await read_payload(request)
+        except InputError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
 
         A = data.get("A"); b = data.get("b")
-        err = _validate_matrix(A) or _validate_vector("b", b)
-        if err: return JSONResponse({"error": err}, status_code=400)
+        try:
+            A = as_matrix(A); b = as_vector(b, "b")
+        except InputError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
         if len(A) != len(A[0]) or len(A) != len(b):
             return JSONResponse({"error": "A must be square and size(A) must match len(b)."}, status_code=400)
 
-        result = compute_cholesky(A, b, track_etapas=True)
-        return JSONResponse(content=result, status_code=200)
+        # Cada etapa sale en cuanto se calcula (streaming si el log es grande)
+        return await StepStream("etapas").response(
+            lambda steps: compute_cholesky(A, b, track_etapas=True, steps=steps))
     except Exception as e:
         return JSONResponse({"error": f"Internal server error: {str(e)}"}, status_code=500)
 
@@ -955,15 +831,17 @@ async def cholesky_eval(request: Request):
 async def jacobi_eval(request: Request):
     try:
         try:
-            data = await request.json()
-        except Exception:
-            return JSONResponse({"error": "Invalid JSON body."}, status_code=400)
+            data = await read_payload(request)
+        except InputError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
 
         A = data.get("A"); b = data.get("b"); x0 = data.get("x0")
         tol = data.get("tol", 1e-7); nmax = data.get("nmax", 100); norma = data.get("norma", "inf")
 
-        err = _validate_matrix(A) or _validate_vector("b", b) or _validate_vector("x0", x0)
-        if err: return JSONResponse({"error": err}, status_code=400)
+        try:
+            A = as_matrix(A); b = as_vector(b, "b"); x0 = as_vector(x0, "x0")
+        except InputError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
 
         try:
             tol = float(tol); nmax = int(nmax)
@@ -974,7 +852,7 @@ async def jacobi_eval(request: Request):
         if len(A) != len(A[0]) or len(A) != len(b) or len(A) != len(x0):
             return JSONResponse({"error": "A must be square and size(A) must match len(b) and len(x0)."}, status_code=400)
 
-        result = compute_jacobi(A, b, x0, tol=tol, nmax=nmax, norma=norma)
+        result = await run_in_threadpool(compute_jacobi, A, b, x0, tol=tol, nmax=nmax, norma=norma)
         return JSONResponse(content=result, status_code=200)
     except Exception as e:
         return JSONResponse({"error": f"Internal server error: {str(e)}"}, status_code=500)
@@ -984,17 +862,19 @@ async def jacobi_eval(request: Request):
 async def gauss_seidel_eval(request: Request):
     try:
         try:
-            data = await request.json()
-        except Exception:
-            return JSONResponse({"error": "Invalid JSON body."}, status_code=400)
+            data = await read_payload(request)
+        except InputError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
 
         A = data.get("A"); b = data.get("b"); x0 = data.get("x0")
         tol = data.get("tol", 1e-7); 
         nmax = data.get("nmax", 100); 
         norma = data.get("norma", "inf")
         decimals = data.get("decimales")
-        err = _validate_matrix(A) or _validate_vector("b", b) or _validate_vector("x0", x0)
-        if err: return JSONResponse({"error": err}, status_code=400)
+        try:
+            A = as_matrix(A); b = as_vector(b, "b"); x0 = as_vector(x0, "x0")
+        except InputError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
 
         try:
             tol = float(tol); nmax = int(nmax); decimals=int(decimals)
@@ -1005,7 +885,7 @@ async def gauss_seidel_eval(request: Request):
         if len(A) != len(A[0]) or len(A) != len(b) or len(A) != len(x0):
             return JSONResponse({"error": "A must be square and size(A) must match len(b) and len(x0)."}, status_code=400)
 
-        result = gauss_seidel(A=A, b=b, tolerance=tol, x_0=x0,n_max=nmax, decimals=decimals ,norma=norma)
+        result = await run_in_threadpool(gauss_seidel, A=A, b=b, tolerance=tol, x_0=x0,n_max=nmax, decimals=decimals ,norma=norma)
         return JSONResponse(content=result, status_code=200)
     except Exception as e:
         return JSONResponse({"error": f"Internal server error: {str(e)}"}, status_code=500)
@@ -1014,9 +894,9 @@ async def gauss_seidel_eval(request: Request):
 async def gauss_seidel_eval(request: Request):
     try:
         try:
-            data = await request.json()
-        except Exception:
-            return JSONResponse({"error": "Invalid JSON body."}, status_code=400)
+            data = await read_payload(request)
+        except InputError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
 
         A = data.get("A"); b = data.get("b"); x0 = data.get("x0")
         tol = data.get("tol", 1e-7); 
@@ -1025,9 +905,10 @@ async def gauss_seidel_eval(request: Request):
         omega = data.get("omega", 1)
 
         
-        err = _validate_matrix(A) or _validate_vector("b", b) or _validate_vector("x0", x0)
-        
-        if err: return JSONResponse({"error": err}, status_code=400)
+        try:
+            A = as_matrix(A); b = as_vector(b, "b"); x0 = as_vector(x0, "x0")
+        except InputError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
 
         try:
             tol = float(tol); nmax = int(nmax); omega=float(omega)
@@ -1038,19 +919,174 @@ async def gauss_seidel_eval(request: Request):
         if len(A) != len(A[0]) or len(A) != len(b) or len(A) != len(x0):
             return JSONResponse({"error": "A must be square and size(A) must match len(b) and len(x0)."}, status_code=400)
 
-        result = sor(A=A, b=b, omega=omega, tolerance=tol, x_0=x0,n_max=nmax,norma=norma)
+        result = await run_in_threadpool(sor, A=A, b=b, omega=omega, tolerance=tol, x_0=x0,n_max=nmax,norma=norma)
         return JSONResponse(content=result, status_code=200)
     except Exception as e:
         return JSONResponse({"error": f"Internal server error: {str(e)}"}, status_code=500)
     
-    #Endpoint para trazadores
-def to_float_safe(value):
-    """Attempts to convert to float safely."""
+# ===================== Streaming (SSE) para métodos iterativos =====================
+# Mismo cuerpo JSON que la ruta normal (+ "progress_every" opcional). Emite
+# eventos "progress" (iteración, error, residuo ||b - Ax||∞) cada
+# progress_every iteraciones y un "done" final sin el log por iteración.
+# Si el cliente se desconecta, el bucle del método se detiene.
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+async def _read_iterative_system(request: Request):
+    """(data, A, b, x0, tol, nmax, norma, every) o (None, JSONResponse de error)."""
+    try:
+        data = await read_payload(request)
+        A = as_matrix(data.get("A")); b = as_vector(data.get("b"), "b"); x0 = as_vector(data.get("x0"), "x0")
+    except InputError as e:
+        return None, JSONResponse({"error": str(e)}, status_code=400)
+    if A.shape[0] != A.shape[1] or len(A) != len(b) or len(A) != len(x0):
+        return None, JSONResponse({"error": "A must be square and size(A) must match len(b) and len(x0)."}, status_code=400)
+
+    try:
+        tol = float(data.get("tol", 1e-7)); nmax = int(data.get("nmax", 100))
+        every = int(data.get("progress_every") or auto_every(nmax))
+    except Exception:
+        return None, JSONResponse({"error": "Invalid 'tol', 'nmax' or 'progress_every'."}, status_code=400)
+    norma = data.get("norma", "inf")
+    if norma not in ("inf", "2", "1"): norma = "inf"
+
+    return (data, A, b, x0, tol, nmax, norma, every), None
+
+
+def _residual_inf(A, b):
+    return lambda x: float(np.max(np.abs(b - A @ x)))
+
+
+@app.post("/eval/jacobi/stream")
+async def jacobi_stream(request: Request):
+    parsed, error = await _read_iterative_system(request)
+    if error: return error
+    data, A, b, x0, tol, nmax, norma, every = parsed
+
+    channel = ProgressChannel(every, residual=_residual_inf(A, b))
+    solve = lambda ch: compute_jacobi(A, b, x0, tol=tol, nmax=nmax, norma=norma,
+                                      progress=ch.report, keep_history=False)
+    return StreamingResponse(channel.stream(request, solve), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@app.post("/eval/gauss_seidel/stream")
+async def gauss_seidel_stream(request: Request):
+    parsed, error = await _read_iterative_system(request)
+    if error: return error
+    data, A, b, x0, tol, nmax, norma, every = parsed
+    try:
+        decimals = int(data.get("decimales", 6))
+    except (TypeError, ValueError):
+        return JSONResponse({"error": "Invalid 'decimales'."}, status_code=400)
+
+    channel = ProgressChannel(every, residual=_residual_inf(A, b))
+    solve = lambda ch: gauss_seidel(A=A, b=b, tolerance=tol, x_0=x0, n_max=nmax, decimals=decimals, norma=norma,
+                                    progress=ch.report, keep_logs=False)
+    return StreamingResponse(channel.stream(request, solve), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@app.post("/eval/SOR/stream")
+async def sor_stream(request: Request):
+    parsed, error = await _read_iterative_system(request)
+    if error: return error
+    data, A, b, x0, tol, nmax, norma, every = parsed
+    try:
+        omega = float(data.get("omega", 1))
+    except (TypeError, ValueError):
+        return JSONResponse({"error": "Invalid 'omega'."}, status_code=400)
+
+    channel = ProgressChannel(every, residual=_residual_inf(A, b))
+    solve = lambda ch: sor(A=A, b=b, omega=omega, tolerance=tol, x_0=x0, n_max=nmax, norma=norma,
+                           progress=ch.report, keep_logs=False)
+    return StreamingResponse(channel.stream(request, solve), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@app.post("/eval/fixed_point/stream")
+async def fixed_point_stream(request: Request):
+    # Mismos campos de formulario que /eval/fixed_point; residuo = |f(x)| o |g(x) - x|
+    form = await request.form()
+    g_text = (form.get("g") or "").strip()
+    f_text = (form.get("f") or "").strip()
+    use_rel = form.get("use_relative_error") is not None
+    try:
+        x0 = float(form.get("x0") or 0.0)
+        tol = float(form.get("tol") or 1e-6)
+        max_iter = int(form.get("max_iter") or 100)
+        every = int(form.get("progress_every") or auto_every(max_iter))
+        g_fun = compile_expr(g_text)[0] if g_text else None
+        f_fun = compile_expr(f_text)[0] if f_text else None
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    if g_fun is None and f_fun is None:
+        return JSONResponse({"error": "Debes proporcionar g(x) o f(x)."}, status_code=400)
+
+    residual = (lambda x: abs(f_fun(x))) if f_fun is not None else (lambda x: abs(g_fun(x) - x))
+    channel = ProgressChannel(every, residual=residual)
+    solve = lambda ch: run_fixed_point_progress(g_text, f_text, x0, tol, max_iter, use_rel, ch.report)
+    return StreamingResponse(channel.stream(request, solve), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@app.get("/cache", response_class=JSONResponse)
+async def cache_info():
+    # Aciertos / fallos / tamaño de la caché de resultados
+    return JSONResponse(content=result_cache.info())
+
+
+@app.get("/admission", response_class=JSONResponse)
+async def admission_info():
+    # Slots ocupados / en espera / rechazos por familia de métodos
+    return JSONResponse(content=admission.info())
+
+
+# ===================== Jobs asíncronos =====================
+# POST /jobs {"method": "gauss_simple", "payload": {...mismo cuerpo que /eval/...}}
+# responde 202 con el id; el cálculo corre en un pool de procesos local.
+# Las rutas de formulario se detectan solas; las que leen request.form() a
+# mano (fixed_point) necesitan "encoding": "form".
+# GET /jobs/{id} -> estado, progreso (rutas /stream y root_isolation) y resultado.
+# "timeout" (s, opcional) baja el límite de tiempo del job (máx. JOB_TIMEOUT_S).
+# POST /jobs/{id}/cancel -> cancela un job en cola o en curso.
+# Los payloads se validan con los límites de job de tools/admission.py (413).
+
+jobs = JobManager(app, "main:app", check=admission.check_job)
+
+@app.post("/jobs", response_class=JSONResponse)
+async def submit_job(request: Request):
+    try:
+        data = await request.json()
+    except Exception:
+        return JSONResponse({"error": "Invalid JSON body."}, status_code=400)
+    if not isinstance(data, dict):
+        return JSONResponse({"error": "Body must be an object with 'method' and 'payload'."}, status_code=400)
+
     try:
-        return float(value)
-    except:
-        return None
+        job = jobs.submit(data.get("method"), data.get("payload", {}), data.get("encoding"), data.get("timeout"))
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    except JobTooLarge as e:
+        return JSONResponse({"error": str(e)}, status_code=413)
+    except JobStoreFull as e:
+        return JSONResponse({"error": str(e)}, status_code=503)
 
+    return JSONResponse({"id": job.id, "status": job.status, "url": f"/jobs/{job.id}"}, status_code=202)
+
+
+@app.get("/jobs/{job_id}", response_class=JSONResponse)
+async def get_job(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        return JSONResponse({"error": "Job not found or expired."}, status_code=404)
+    return JSONResponse(content=jsonable_encoder(jobs.describe(job)))
+
+
+@app.post("/jobs/{job_id}/cancel", response_class=JSONResponse)
+async def cancel_job(job_id: str):
+    # Un job en curso se detiene terminando su worker (en POLL_INTERVAL_S)
+    job = jobs.cancel(job_id)
+    if job is None:
+        return JSONResponse({"error": "Job not found or expired."}, status_code=404)
+    return JSONResponse(content=jsonable_encoder(jobs.describe(job)))
+
+    #Endpoint para trazadores
 @app.post("/eval/cubic_spline", response_class=JSONResponse)
 async def cubic_spline_post(request: Request):
     try:
@@ -5,6 +5,7 @@ const bInput = document.getElementById("b")
 const nmax = document.getElementById("nmax")
 const tol = document.getElementById("tol")
 const nrows = document.getElementById("nrows")
+const variant = document.getElementById("variant")
 
 function pythonPowToJS(expr) {
     return expr.replace(/\*\*/g, "^");
@@ -23,7 +24,8 @@ function getFormValues() {
         b: (isNaN(bValue) ? 2 : bValue),
         Nmax: (isNaN(nmaxValue) ? 100 : nmaxValue),
         tol: (isNaN(tolValue) ? 0.0000001 : tolValue),
-        nrows: (isNaN(nrowsValue) ? 30 : nrowsValue)
+        nrows: (isNaN(nrowsValue) ? 30 : nrowsValue),
+        variant: variant.value || "classic"
     };
 }
 
@@ -244,7 +246,8 @@ document.getElementById("calculation-btn").addEventListener("click", (event) =>
             b: formValues.b,
             nmax: formValues.Nmax,
             tolerance: formValues.tol,
-            last_n_rows: formValues.nrows
+            last_n_rows: formValues.nrows,
+            variant: formValues.variant
         })
     })
         .then(response => {
@@ -257,7 +260,7 @@ document.getElementById("calculation-btn").addEventListener("click", (event) =>
             console.log("Received data:", data);
 
             // Mostrar mensaje que viene del backend
-            showMessage(data.message, "success");
+            showMessage(`${data.message} (${data.evaluations} evaluations of f)`, data.final_root === null ? "danger" : "success");
 
             // Limpiar y poblar la tabla
             const tbody = document.querySelector("#result-table tbody");
@@ -0,0 +1,338 @@
+# tools/admission.py
+# ---------------------------------------------------------------
+# Admission control for the /eval/* routes (pure ASGI middleware).
+# - Size limits per method (n = len(A), points = len(x), iterations =
+#   nmax / Nmax / max_iter, pixels, starts). For uploaded matrix files n
+#   comes from the file header (.npy / Matrix Market) or the CSV rows. Oversized requests get 413
+#   right away; they can still run as a job (POST /jobs) up to the job
+#   limits (the same ones scaled by JOB_LIMIT_SCALE, always finite).
+# - Only the first MEASURE_PREFIX_BYTES of a body are read to measure it;
+#   the rest is streamed to the route. The prefix grows only while a
+#   limited measure is still missing (e.g. nmax sent after a big file).
+# - Methods are grouped in families; each family has weighted slots. A
+#   request's weight grows with its cost (n^3 for direct methods, ...),
+#   so one huge gauss_total takes several slots and cheap requests of
+#   other families are never blocked by it.
+# - Bounded FIFO wait queue per family: queue full -> 429, waited longer
+#   than max_wait -> 503, both with Retry-After.
+# - Jobs (scope["job"]) skip the slots and queue (they already run on their
+#   own pool) but are still checked against the job limits.
+# ---------------------------------------------------------------
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+
+from tools.asgi import parse_body, parse_prefix, read_prefix, replay_body, send_json, with_headers
+from tools.matrix_input import sniff_shape
+
+# family -> slots (total weight running at once), queue (requests waiting),
+# max_wait (s), cost(measures) and unit (cost of one slot)
+FAMILIES: Dict[str, Dict[str, Any]] = {
+    "direct": {"slots": 8, "queue": 32, "max_wait": 15.0,
+               "cost": lambda m: m.get("n", 0) ** 3, "unit": 40 ** 3},
+    "iterative": {"slots": 8, "queue": 32, "max_wait": 15.0,
+                  "cost": lambda m: m.get("n", 0) ** 2 * m.get("iterations", 100), "unit": 100 ** 2 * 1000},
+    "interpolation": {"slots": 8, "queue": 32, "max_wait": 15.0,
+                      "cost": lambda m: m.get("points", 0) ** 2, "unit": 50 ** 2},
+    "roots": {"slots": 16, "queue": 64, "max_wait": 10.0,
+              "cost": lambda m: m.get("iterations", 0), "unit": 100_000},
+    "heavy": {"slots": 4, "queue": 8, "max_wait": 30.0,
+              "cost": lambda m: max(m.get("pixels", 0), m.get("starts", 0)) * max(m.get("iterations", 1), 1),
+              "unit": 500 * 500 * 50},
+}
+
+# path -> (family, {measure: max})
+METHOD_POLICIES: Dict[str, Tuple[str, Dict[str, int]]] = {
+    # Directos: los logs por etapa crecen como n^3
+    "/eval/gauss_simple": ("direct", {"n": 80}),
+    "/eval/gauss_partial": ("direct", {"n": 80}),
+    "/eval/gauss_total": ("direct", {"n": 80}),
+    "/eval/crout": ("direct", {"n": 80}),
+    "/eval/doolittle": ("direct", {"n": 80}),
+    "/eval/lu_simple": ("direct", {"n": 100}),
+    "/eval/lu_partial": ("direct", {"n": 100}),
+    "/eval/cholesky": ("direct", {"n": 100}),
+    # Iterativos
+    "/eval/jacobi": ("iterative", {"n": 500, "iterations": 100_000}),
+    "/eval/gauss_seidel": ("iterative", {"n": 500, "iterations": 100_000}),
+    "/eval/SOR": ("iterative", {"n": 500, "iterations": 100_000}),
+    "/eval/jacobi/stream": ("iterative", {"n": 500, "iterations": 10_000_000}),
+    "/eval/gauss_seidel/stream": ("iterative", {"n": 500, "iterations": 10_000_000}),
+    "/eval/SOR/stream": ("iterative", {"n": 500, "iterations": 10_000_000}),
+    # Interpolación (lagrange es simbólico)
+    "/eval/vandermonde": ("interpolation", {"points": 200}),
+    "/eval/newton_interpolant": ("interpolation", {"points": 200}),
+    "/eval/lagrange": ("interpolation", {"points": 60}),
+    "/eval/lineal_tracers": ("interpolation", {"points": 2000}),
+    "/eval/cubic_spline": ("interpolation", {"points": 500}),
+    "/eval/quadratic_spline": ("interpolation", {"points": 500}),
+    # Ecuaciones no lineales
+    "/eval/newton_method": ("roots", {"iterations": 1_000_000}),
+    "/eval/modified_newton": ("roots", {"iterations": 1_000_000}),
+    "/eval/bisection": ("roots", {"iterations": 1_000_000}),
+    "/eval/brent": ("roots", {"iterations": 1_000_000}),
+    "/eval/secant": ("roots", {"iterations": 1_000_000}),
+    "/eval/false_position": ("roots", {"iterations": 1_000_000}),
+    "/eval/incremental_search": ("roots", {"iterations": 1_000_000}),
+    "/eval/muller": ("roots", {"iterations": 1_000_000}),
+    "/eval/fixed_point": ("roots", {"iterations": 1_000_000}),
+    "/eval/fixed_point/stream": ("roots", {"iterations": 10_000_000}),
+    # Pesados: barridos y lotes
+    "/eval/newton_basins": ("heavy", {"pixels": 2000 * 2000, "iterations": 500}),
+    "/eval/newton_batch": ("heavy", {"starts": 100_000, "iterations": 10_000}),
+    "/eval/muller_batch": ("heavy", {"starts": 100_000, "iterations": 10_000}),
+    "/eval/root_isolation": ("heavy", {"iterations": 1_000_000}),
+}
+
+# Valores por defecto de la ruta para lo que el cliente omite (Form(...) en main.py)
+MEASURE_DEFAULTS: Dict[str, Dict[str, int]] = {
+    "/eval/newton_basins": {"pixels": 500 * 500, "iterations": 50},
+}
+
+# Jobs (POST /jobs) corren fuera de los slots, con límites más altos pero finitos
+JOB_LIMIT_SCALE: Dict[str, int] = {"n": 2, "points": 2, "iterations": 100, "pixels": 1, "starts": 10}
+
+MAX_RETRY_AFTER_S = 60
+MEASURE_PREFIX_BYTES = 256 * 1024
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status: int, message: str, retry_after: int):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        v = float(value)
+    except (TypeError, ValueError):
+        return None
+    return v if math.isfinite(v) else None
+
+
+def measure(data: Dict[str, Any]) -> Dict[str, int]:
+    """Size of a request body: n, points, iterations, pixels, starts (only those present)."""
+    m: Dict[str, int] = {}
+    # Cuerpo JSON leído solo en parte (parse_prefix): filas ya contadas
+    rows = data.get("_rows", {})
+    for key, name in (("A", "n"), ("x", "points"), ("starts", "starts")):
+        if key in rows:
+            m[name] = rows[key]
+    if isinstance(data.get("A"), list):
+        m["n"] = len(data["A"])
+    elif isinstance(data.get("A"), memoryview):
+        # Archivo subido (multipart): solo se lee la cabecera
+        shape = sniff_shape(data["A"])
+        if shape is not None:
+            m["n"] = max(shape)
+    if isinstance(data.get("x"), list):
+        m["points"] = len(data["x"])
+    iterations = [_number(data.get(k)) for k in ("nmax", "Nmax", "max_iter")]
+    iterations = [v for v in iterations if v is not None]
+    if iterations:
+        m["iterations"] = int(max(iterations))
+    width, height = _number(data.get("width")), _number(data.get("height"))
+    if width is not None or height is not None:
+        m["pixels"] = int((width or 500) * (height or 500))
+    if isinstance(data.get("starts"), list):
+        m["starts"] = len(data["starts"])
+    elif _number(data.get("n_starts")) is not None:
+        m["starts"] = int(_number(data.get("n_starts")))
+    return m
+
+
+class WeightedSlots:
+    """FIFO weighted semaphore with a bounded wait queue (event-loop only)."""
+
+    def __init__(self, name: str, slots: int, queue: int, max_wait: float):
+        self.name = name
+        self.slots = int(slots)
+        self.max_queue = int(queue)
+        self.max_wait = float(max_wait)
+        self.in_use = 0
+        self._waiters: "deque[Tuple[asyncio.Future, int]]" = deque()
+        self.ewma_s = 1.0  # duración media de una petición (para Retry-After)
+        self.stats = {"admitted": 0, "queued": 0, "rejected_queue_full": 0,
+                      "rejected_timeout": 0, "rejected_size": 0}
+
+    def retry_after(self, weight: int) -> int:
+        waiting = sum(w for _, w in self._waiters) + weight
+        return max(1, min(MAX_RETRY_AFTER_S, math.ceil(self.ewma_s * waiting / self.slots)))
+
+    async def acquire(self, weight: int) -> None:
+        weight = max(1, min(int(weight), self.slots))
+        if not self._waiters and self.in_use + weight <= self.slots:
+            self.in_use += weight
+            self.stats["admitted"] += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.stats["rejected_queue_full"] += 1
+            raise AdmissionRejected(429, f"Too many '{self.name}' requests waiting; try again later.",
+                                    self.retry_after(weight))
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (future, weight)
+        self._waiters.append(entry)
+        self.stats["queued"] += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.max_wait)
+        except asyncio.TimeoutError:
+            if future.done():
+                self.stats["admitted"] += 1
+                return
+            self._drop(entry)
+            self.stats["rejected_timeout"] += 1
+            raise AdmissionRejected(503, f"Server busy with '{self.name}' requests; try again later.",
+                                    self.retry_after(weight))
+        except asyncio.CancelledError:
+            # Cliente desconectado mientras esperaba
+            if future.done():
+                self.release(weight)
+            else:
+                self._drop(entry)
+            raise
+        self.stats["admitted"] += 1
+
+    def release(self, weight: int, elapsed_s: Optional[float] = None) -> None:
+        self.in_use -= max(1, min(int(weight), self.slots))
+        if elapsed_s is not None:
+            self.ewma_s = 0.8 * self.ewma_s + 0.2 * elapsed_s
+        self._wake()
+
+    def _drop(self, entry) -> None:
+        try:
+            self._waiters.remove(entry)
+        except ValueError:
+            pass
+        entry[0].cancel()
+        self._wake()
+
+    def _wake(self) -> None:
+        # Estricto FIFO: una petición pesada en cabeza no es adelantada por las ligeras
+        while self._waiters and self.in_use + self._waiters[0][1] <= self.slots:
+            future, weight = self._waiters.popleft()
+            if future.done():
+                continue
+            self.in_use += weight
+            future.set_result(True)
+
+    def info(self) -> Dict[str, Any]:
+        return {"slots": self.slots, "in_use": self.in_use, "waiting": len(self._waiters),
+                "max_queue": self.max_queue, "avg_ms": self.ewma_s * 1000.0, **self.stats}
+
+
+class AdmissionControl:
+    """Per-method limits and per-family slots; pass custom tables to override the defaults."""
+
+    def __init__(self, policies: Optional[Dict[str, Tuple[str, Dict[str, int]]]] = None,
+                 families: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.policies = dict(METHOD_POLICIES if policies is None else policies)
+        self.families = dict(FAMILIES if families is None else families)
+        self.slots = {name: WeightedSlots(name, f["slots"], f["queue"], f["max_wait"])
+                      for name, f in self.families.items()}
+
+    def limits(self, path: str, job: bool = False) -> Dict[str, int]:
+        """Size limits of one method; for jobs, scaled by JOB_LIMIT_SCALE."""
+        _, limits = self.policies[path]
+        if not job:
+            return dict(limits)
+        return {name: limit * JOB_LIMIT_SCALE.get(name, 1) for name, limit in limits.items()}
+
+    def with_defaults(self, path: str, measures: Dict[str, int]) -> Dict[str, int]:
+        """Measures plus the route defaults (MEASURE_DEFAULTS) of what was omitted."""
+        return {**MEASURE_DEFAULTS.get(path, {}), **measures}
+
+    def check(self, path: str, measures: Dict[str, int], job: bool = False) -> Optional[str]:
+        """Error message if the request exceeds the limits of its method."""
+        for name, limit in self.limits(path, job).items():
+            value = measures.get(name)
+            if value is not None and value > limit:
+                if job:
+                    return f"{name} = {value} exceeds the job limit for {path} (max {limit})."
+                job_limit = self.limits(path, job=True)[name]
+                if value > job_limit:
+                    return f"{name} = {value} exceeds the limit for {path} (max {limit}, {job_limit} as a job)."
+                return (f"{name} = {value} exceeds the limit for {path} (max {limit}). "
+                        f"Jobs (POST /jobs) accept up to {job_limit}.")
+        return None
+
+    def check_job(self, path: str, payload: Dict[str, Any]) -> Optional[str]:
+        """check() for a job payload (POST /jobs), before it is queued."""
+        if path not in self.policies:
+            return None
+        return self.check(path, self.with_defaults(path, measure(payload)), job=True)
+
+    def weight(self, family: str, measures: Dict[str, int]) -> int:
+        f = self.families[family]
+        try:
+            cost = f["cost"](measures)
+        except Exception:
+            cost = 0
+        return max(1, min(f["slots"], math.ceil(cost / f["unit"])))
+
+    def info(self) -> Dict[str, Any]:
+        return {name: s.info() for name, s in self.slots.items()}
+
+
+class AdmissionMiddleware:
+    def __init__(self, app, control: AdmissionControl):
+        self.app = app
+        self.control = control
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.control.policies:
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        family, _ = self.control.policies[path]
+        slots = self.control.slots[family]
+        job = bool(scope.get("job"))
+
+        content_type = dict(scope["headers"]).get(b"content-type", b"").decode("latin-1")
+        body, complete = await read_prefix(receive, MEASURE_PREFIX_BYTES)
+        measures = self._measure(content_type, body, complete)
+        limited = self.control.limits(path, job)
+        while not complete and any(name not in measures for name in limited):
+            # Falta una medida: se lee otro tanto (el prefijo se duplica)
+            more, complete = await read_prefix(receive, len(body))
+            body += more
+            measures = self._measure(content_type, body, complete)
+        receive = replay_body(body, receive, more_body=not complete)
+        measures = self.control.with_defaults(path, measures)
+
+        error = self.control.check(path, measures, job=job)
+        if error:
+            slots.stats["rejected_size"] += 1
+            await send_json(send, 413, {"error": error})
+            return
+        if job:
+            # Los jobs no ocupan slots: ya corren en su propio pool
+            await self.app(scope, receive, send)
+            return
+
+        weight = self.control.weight(family, measures)
+        t_wait = time.perf_counter()
+        try:
+            await slots.acquire(weight)
+        except AdmissionRejected as e:
+            await send_json(send, e.status, {"error": str(e)}, [(b"retry-after", str(e.retry_after).encode())])
+            return
+
+        t0 = time.perf_counter()
+        extra = [(b"x-admission-weight", str(weight).encode()),
+                 (b"x-admission-wait-ms", f"{(t0 - t_wait) * 1000.0:.1f}".encode())]
+        try:
+            await self.app(scope, receive, with_headers(send, extra))
+        finally:
+            slots.release(weight, time.perf_counter() - t0)
+
+    @staticmethod
+    def _measure(content_type: str, body: bytes, complete: bool) -> Dict[str, int]:
+        if complete:
+            return measure(parse_body(content_type, body) or {})
+        return measure(parse_prefix(content_type, body))
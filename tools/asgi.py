@@ -0,0 +1,198 @@
+# tools/asgi.py
+# ---------------------------------------------------------------
+# Small helpers for the pure-ASGI middlewares (result cache, admission):
+# read the request body (or only its first bytes) and replay it to the
+# app, add headers, send a JSON error without going through FastAPI.
+# ---------------------------------------------------------------
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+
+async def read_body(receive) -> bytes:
+    """Whole request body (all http.request messages)."""
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+async def read_prefix(receive, limit: int) -> Tuple[bytes, bool]:
+    """
+    At least `limit` bytes of the request body (fewer if it ends first) and
+    whether the whole body was read. The rest stays in `receive`.
+    """
+    chunks, size = [], 0
+    while size < limit:
+        message = await receive()
+        if message["type"] != "http.request":
+            return b"".join(chunks), True
+        chunk = message.get("body", b"")
+        chunks.append(chunk)
+        size += len(chunk)
+        if not message.get("more_body", False):
+            return b"".join(chunks), True
+    return b"".join(chunks), False
+
+
+def replay_body(body: bytes, receive, more_body: bool = False):
+    """
+    `receive` that hands out `body` once more, then defers to the real one.
+    more_body=True when `body` is only a prefix (read_prefix): the rest is
+    streamed from the real `receive` without buffering it.
+    """
+    sent = False
+
+    async def replay():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": more_body}
+        return await receive()
+    return replay
+
+
+def with_headers(send, extra: List[Tuple[bytes, bytes]]):
+    """`send` that appends `extra` headers to the response start."""
+    async def wrapped(message):
+        if message["type"] == "http.response.start":
+            message = {**message, "headers": list(message.get("headers", [])) + extra}
+        await send(message)
+    return wrapped
+
+
+def parse_body(content_type: str, body: bytes) -> Optional[Dict[str, Any]]:
+    """
+    JSON object or form fields of a request body; None if neither.
+    multipart/form-data: text fields as strings (JSON lists decoded), file
+    parts as a memoryview of their content (no copy). See parse_prefix for
+    a body that was only partly read.
+    """
+    if content_type.startswith("application/json"):
+        try:
+            data = json.loads(body or b"null")
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+    if content_type.startswith("application/x-www-form-urlencoded"):
+        return dict(parse_qsl(body.decode("utf-8", errors="replace"), keep_blank_values=True))
+    if content_type.startswith("multipart/form-data"):
+        return _parse_multipart(content_type, body)
+    return None
+
+
+_JSON_SCALAR = re.compile(rb'"(\w+)"\s*:\s*"?([-+0-9.eE]+)"?\s*[,}]')
+_JSON_LIST = re.compile(rb'"(\w+)"\s*:\s*\[')
+
+
+def parse_prefix(content_type: str, prefix: bytes) -> Dict[str, Any]:
+    """
+    What can be told from the first bytes of a body (read_prefix):
+    - multipart: the complete text fields, and the file part being
+      uploaded as a memoryview of the part of it that arrived;
+    - urlencoded: the complete fields;
+    - JSON: top-level numbers and, for lists, a "_rows" entry
+      {key: number of rows} when the list closes in the prefix, or the
+      length of its first row when only that arrived (square A).
+    """
+    if content_type.startswith("multipart/form-data"):
+        return _parse_multipart(content_type, prefix, partial=True) or {}
+    if content_type.startswith("application/x-www-form-urlencoded"):
+        complete = prefix[:prefix.rfind(b"&")]
+        return dict(parse_qsl(complete.decode("utf-8", errors="replace"), keep_blank_values=True))
+    if content_type.startswith("application/json"):
+        return _scan_json_prefix(prefix)
+    return {}
+
+
+def _scan_json_prefix(prefix: bytes) -> Dict[str, Any]:
+    data: Dict[str, Any] = {k.decode(): v.decode() for k, v in _JSON_SCALAR.findall(prefix)}
+    rows: Dict[str, int] = {}
+    for match in _JSON_LIST.finditer(prefix):
+        key, start = match.group(1).decode(), match.end()
+        depth, count, pos = 1, 0, start
+        nested = prefix[start:start + 64].lstrip().startswith(b"[")
+        # Cuenta elementos de primer nivel hasta que la lista cierre
+        while depth and pos < len(prefix):
+            c = prefix[pos:pos + 1]
+            if c == b"[":
+                depth += 1
+            elif c == b"]":
+                depth -= 1
+                if nested and depth == 1:
+                    count += 1
+            elif c == b"," and depth == 1 and not nested:
+                count += 1
+            pos += 1
+        if depth == 0:
+            empty = not prefix[start:pos - 1].strip()
+            rows[key] = count if nested else (0 if empty else count + 1)
+        elif nested:
+            # Solo llegó el principio: la primera fila de una matriz cuadrada da n
+            first = prefix.find(b"]", start)
+            if first >= 0:
+                rows[key] = prefix[start:first].count(b",") + 1
+    if rows:
+        data["_rows"] = rows
+    return data
+
+
+_BOUNDARY = re.compile(r'boundary="?([^";]+)"?')
+_NAME = re.compile(r'[\s;]name="([^"]*)"')
+_FILENAME = re.compile(r'filename="([^"]*)"')
+MAX_TEXT_FIELD = 1024 * 1024
+
+
+def _parse_multipart(content_type: str, body: bytes, partial: bool = False) -> Optional[Dict[str, Any]]:
+    match = _BOUNDARY.search(content_type)
+    if not match:
+        return None
+    delimiter = b"--" + match.group(1).encode("latin-1")
+    view = memoryview(body)
+    fields: Dict[str, Any] = {}
+    pos = body.find(delimiter)
+    while pos >= 0:
+        pos += len(delimiter)
+        if body.startswith(b"--", pos):
+            break
+        head_end = body.find(b"\r\n\r\n", pos)
+        end = body.find(b"\r\n" + delimiter, head_end + 4) if head_end >= 0 else -1
+        if end < 0:
+            if partial and head_end >= 0:
+                # Parte de archivo aún subiendo: basta su comienzo (cabecera .npy / .mtx / CSV)
+                headers = body[pos:head_end].decode("latin-1")
+                name = _NAME.search(headers)
+                if name and _FILENAME.search(headers):
+                    fields[name.group(1)] = view[head_end + 4:]
+            return fields or None
+        headers = body[pos:head_end].decode("latin-1")
+        name = _NAME.search(headers)
+        if name:
+            start = head_end + 4
+            if _FILENAME.search(headers):
+                fields[name.group(1)] = view[start:end]
+            elif end - start <= MAX_TEXT_FIELD:
+                text = body[start:end].decode("utf-8", errors="replace")
+                if text.lstrip().startswith("["):
+                    try:
+                        text = json.loads(text)
+                    except ValueError:
+                        pass
+                fields[name.group(1)] = text
+        pos = end + 2
+    return fields
+
+
+async def send_json(send, status: int, content: Dict[str, Any], headers: List[Tuple[bytes, bytes]] = ()) -> None:
+    body = json.dumps(content).encode()
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", b"application/json"),
+                            (b"content-length", str(len(body)).encode())] + list(headers)})
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,81 @@
+# tools/history.py
+# ---------------------------------------------------------------
+# Compact iteration history shared by the scalar root-finding methods.
+# - Rows are tuples stored in a preallocated list used as a ring buffer:
+#   append is one slot assignment (O(1)) and memory is bounded by `tail`
+#   rows (instead of list.pop(0), which is O(n) per call). Columns are
+#   only assembled when the response is built.
+# - tail=None keeps every row; tail <= 0 keeps none (old pop(0) loops in
+#   newton / secant returned an empty history for nrows <= 0). Callers
+#   whose old "[-n:]" slice kept every row for n = 0 pass `n or None`.
+# - Optional stride-decimated trace of the whole run: rows 0, s, 2s, ...
+#   plus the last one, for plotting long runs without keeping them all.
+# ---------------------------------------------------------------
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class IterationHistory:
+    """Last `tail` rows of an iteration, read back by column."""
+
+    __slots__ = ("names", "tail", "stride", "count", "_rows", "_trace", "_last")
+
+    def __init__(self, names: Sequence[str], tail: Optional[int] = None, stride: int = 0):
+        self.names: Tuple[str, ...] = tuple(names)
+        self.tail: Optional[int] = max(int(tail), 0) if tail is not None else None
+        self.stride = int(stride) if stride and int(stride) > 0 else 0
+        self.count = 0  # rows appended so far (not only the retained ones)
+        self._rows: List[Optional[Tuple[Any, ...]]] = [None] * (self.tail or 0)
+        self._trace: Optional[List[Tuple[Any, ...]]] = [] if self.stride else None
+        self._last: Optional[Tuple[Any, ...]] = None
+
+    # ===== write =====
+    def append(self, *values: Any) -> None:
+        """Add one row (one value per column)."""
+        if self.tail is None:
+            self._rows.append(values)
+        elif self.tail:
+            self._rows[self.count % self.tail] = values
+        if self._trace is not None and self.count % self.stride == 0:
+            self._trace.append(values)
+        self._last = values
+        self.count += 1
+
+    # ===== read =====
+    def __len__(self) -> int:
+        return self.count if self.tail is None else min(self.count, self.tail)
+
+    def rows(self) -> List[Tuple[Any, ...]]:
+        """Retained rows as tuples, oldest first."""
+        if self.tail is None:
+            return list(self._rows)
+        if self.count <= self.tail:
+            return self._rows[:self.count]
+        if self.tail == 0:
+            return []
+        k = self.count % self.tail
+        return self._rows[k:] + self._rows[:k]
+
+    def column(self, name: str) -> List[Any]:
+        """Retained values of one column, oldest first."""
+        j = self.names.index(name)
+        return [r[j] for r in self.rows()]
+
+    def last(self) -> Optional[Tuple[Any, ...]]:
+        """Most recent row, retained or not (None before the first append)."""
+        return self._last
+
+    def as_dict(self, names: Optional[Iterable[str]] = None) -> Dict[str, List[Any]]:
+        """{column: values} for the given columns (all by default)."""
+        rows = self.rows()
+        wanted = names if names is not None else self.names
+        return {n: [r[self.names.index(n)] for r in rows] for n in wanted}
+
+    def trace(self) -> Optional[Dict[str, List[Any]]]:
+        """Stride-decimated trace of the whole run ({column: values}), or None if disabled."""
+        if self._trace is None:
+            return None
+        rows = list(self._trace)
+        if self._last is not None and (self.count - 1) % self.stride != 0:
+            rows.append(self._last)
+        return {n: [r[j] for r in rows] for j, n in enumerate(self.names)}
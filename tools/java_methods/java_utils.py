@@ -1,27 +1,73 @@
 import jpype
 import json
+import logging
 import os
 import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Estado compartido del puente Python–Java (un solo JVM por proceso)
+_lock = threading.RLock()
+_jvm_cold_start_ms = None
+_bound_classes = {}
+
+
+def start_jvm(classpath=None):
+    """
+    Initialize the JVM once per process (thread-safe).
+    `classpath` defaults to the current directory. Classpath entries can
+    only be set here: once the JVM is running they cannot be added.
+    Returns the cold-start time in ms, or None if the JVM was started
+    outside this module.
+    """
+    global _jvm_cold_start_ms
+    if jpype.isJVMStarted():
+        return _jvm_cold_start_ms
+
+    with _lock:
+        if not jpype.isJVMStarted():
+            classpath = classpath or [os.getcwd()]
+            try:
+                t0 = time.perf_counter()
+                jpype.startJVM(jpype.getDefaultJVMPath(), classpath=list(classpath))
+                _jvm_cold_start_ms = (time.perf_counter() - t0) * 1000.0
+                logger.info("JVM started (%.1f ms)", _jvm_cold_start_ms)
+            except Exception as e:
+                logger.error("Error starting JVM: %s", e)
+                raise RuntimeError(f"Error starting JVM: {e}")
+    return _jvm_cold_start_ms
+
+
+def bind_class(name, classpath=None):
+    """
+    Resolve `jpype.JClass(name)` once and cache it; starts the JVM if needed.
+    Later calls are a dict lookup.
+    """
+    cls = _bound_classes.get(name)
+    if cls is not None:
+        return cls
+    with _lock:
+        cls = _bound_classes.get(name)
+        if cls is None:
+            start_jvm(classpath)
+            cls = jpype.JClass(name)
+            _bound_classes[name] = cls
+    return cls
+
+
+def jvm_cold_start_ms():
+    """Time spent in startJVM (ms), None if not started by this module."""
+    return _jvm_cold_start_ms
 
-def start_jvm():
-    """Initialize JVM with the current directory in classpath"""
-    if not jpype.isJVMStarted():
-        # Get the current directory where the Java file should be compiled
-        current_dir = os.getcwd()
-        
-        try:
-            # Start JVM with current directory in classpath
-            jpype.startJVM(jpype.getDefaultJVMPath(), classpath=[current_dir])
-            print("JVM started successfully")
-        except Exception as e:
-            print(f"Error starting JVM: {e}")
-            raise RuntimeError(f"Error starting JVM: {e}")
 
 def shutdown_jvm():
     """Shutdown JVM when done"""
     if jpype.isJVMStarted():
         jpype.shutdownJVM()
-        print("JVM shutdown successfully")
+        _bound_classes.clear()
+        logger.info("JVM shut down")
 """
 # Example usage
 if __name__ == "__main__":
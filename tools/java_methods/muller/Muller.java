@@ -208,6 +208,100 @@ public class Muller {
         return result;
     }
     
+    /**
+     * Number of doubles per start in the mullerBatch output:
+     * {root real part, root imaginary part, last error, iterations, converged (1/0)}
+     */
+    public static final int BATCH_FIELDS = 5;
+
+    /**
+     * Muller iteration without history (no strings, no lists).
+     * Same steps as muller(); returns the BATCH_FIELDS values for one start.
+     */
+    private static double[] solve(String function, double p0, double p1, double p2,
+                                  int nmax, double tolerance) {
+        double f0 = evaluateFunction(function, p0);
+        double f1 = evaluateFunction(function, p1);
+        double f2 = evaluateFunction(function, p2);
+
+        double prevRoot = p2;
+        double real = p2;
+        double imag = 0.0;
+        double error = Double.NaN;
+
+        for (int i = 0; i < nmax; i++) {
+            double h0 = p1 - p0;
+            double h1 = p2 - p1;
+            double d0 = (f1 - f0) / h0;
+            double d1 = (f2 - f1) / h1;
+
+            double a = (d1 - d0) / (h1 + h0);
+            double b = a * h1 + d1;
+            double c = f2;
+
+            double discriminant = b * b - 4 * a * c;
+
+            if (discriminant >= 0) {
+                double sqrtDisc = Math.sqrt(discriminant);
+                double denom1 = b + sqrtDisc;
+                double denom2 = b - sqrtDisc;
+                double denom = (Math.abs(denom1) > Math.abs(denom2)) ? denom1 : denom2;
+                real = p2 - (2 * c) / denom;
+                imag = 0.0;
+            } else {
+                real = p2 - b / (2 * a);
+                imag = Math.sqrt(-discriminant) / (2 * a);
+            }
+
+            error = Math.abs(real - prevRoot);
+            if (error < tolerance) {
+                return new double[] {real, imag, error, i + 1, 1.0};
+            }
+
+            p0 = p1;
+            p1 = p2;
+            p2 = real;
+
+            f0 = f1;
+            f1 = f2;
+            f2 = evaluateFunction(function, p2);
+
+            prevRoot = real;
+        }
+        return new double[] {real, imag, error, nmax, 0.0};
+    }
+
+    /**
+     * Batch entry point: runs Muller for every start (p0[k], p1[k], p2[k])
+     * in one call from Python. `functions` has length 1 (shared by all
+     * starts) or one entry per start.
+     * Returns a flat primitive array of p0.length * BATCH_FIELDS doubles,
+     * so nothing has to be formatted or parsed as JSON.
+     */
+    public static double[] mullerBatch(String[] functions, double[] p0, double[] p1, double[] p2,
+                                       int nmax, double tolerance) {
+        int n = p0.length;
+        if (p1.length != n || p2.length != n) {
+            throw new IllegalArgumentException("p0, p1 and p2 must have the same length");
+        }
+        if (functions.length != 1 && functions.length != n) {
+            throw new IllegalArgumentException("functions must have length 1 or match the number of starts");
+        }
+
+        double[] out = new double[n * BATCH_FIELDS];
+        for (int k = 0; k < n; k++) {
+            String function = functions.length == 1 ? functions[0] : functions[k];
+            double[] r;
+            try {
+                r = solve(function, p0[k], p1[k], p2[k], nmax, tolerance);
+            } catch (RuntimeException e) {
+                r = new double[] {Double.NaN, Double.NaN, Double.NaN, 0, 0};
+            }
+            System.arraycopy(r, 0, out, k * BATCH_FIELDS, BATCH_FIELDS);
+        }
+        return out;
+    }
+
     /**
      * Convert MullerResult to JSON string manually
      */
@@ -1,72 +1,89 @@
-import jpype
 import json
+import logging
 import os
-import sys
+import threading
+import time
+
+import numpy as np
+
+from tools.sympyUtilities import polynomial_roots
+from tools.java_methods.java_utils import start_jvm as _start_jvm, bind_class, jvm_cold_start_ms
+
+logger = logging.getLogger(__name__)
+
+# Directory holding Muller.class (compiled in place: `javac Muller.java`)
+MULLER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Max simultaneous calls into the JVM. Muller's static methods keep no
+# shared state, so a few threads can run in parallel; the rest wait here.
+MAX_CONCURRENT_CALLS = 4
+_call_slots = threading.BoundedSemaphore(MAX_CONCURRENT_CALLS)
+
+_batch_warned = False
+
 
 def start_jvm():
-    """Start JVM with proper classpath"""
-    if not jpype.isJVMStarted():
-        # Get the absolute path to the muller directory
-        if hasattr(sys, '_MEIPASS'):  # If running from PyInstaller
-            base_path = sys._MEIPASS
-        else:
-            base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        
-        muller_dir = os.path.join(base_path, "tools", "java_methods", "muller")
-        
-        print(f"Looking for Java classes in: {muller_dir}")
-        print(f"Files in directory: {os.listdir(muller_dir) if os.path.exists(muller_dir) else 'Directory not found'}")
-        
-        # Start JVM with classpath
-        jpype.startJVM(jpype.getDefaultJVMPath(), f"-Djava.class.path={muller_dir}")
+    """Start JVM with the Muller directory in the classpath"""
+    return _start_jvm([MULLER_DIR])
+
+
+def _muller_class():
+    return bind_class("Muller", [MULLER_DIR])
+
+
+def _has_native_batch(MullerClass):
+    global _batch_warned
+    native = hasattr(MullerClass, "mullerBatch")
+    if not native and not _batch_warned:
+        _batch_warned = True
+        logger.warning("Muller.class has no mullerBatch (compiled from an older Muller.java; "
+                       "run `javac Muller.java` in %s); muller_batch falls back to one "
+                       "mullerController call per start", MULLER_DIR)
+    return native
+
+
+def warm_up_muller():
+    """
+    Start the JVM and bind the Muller class once (call at app startup).
+    Returns the timings so they can be logged; never raises.
+    """
+    try:
+        t0 = time.perf_counter()
+        MullerClass = _muller_class()
+        bind_ms = (time.perf_counter() - t0) * 1000.0
+        return {"jvm_cold_start_ms": jvm_cold_start_ms(), "bind_ms": bind_ms,
+                "native_batch": _has_native_batch(MullerClass)}
+    except Exception as e:
+        logger.warning("Muller warm-up failed: %s", e)
+        return {"error": str(e)}
+
 
 def muller_method(function: str, p0: float, p1: float, p2: float, nmax: int, last_n_rows: int, tolerance: float):
     """
     Python interface for Muller's method implemented in Java
     """
-    
-    # Start JVM if not already started
-    start_jvm()
-    
     try:
-        # Try different ways to access the class
-        try:
-            # First try: Simple class name
-            MullerClass = jpype.JClass("Muller")
-        except:
-            try:
-                # Second try: Add current directory to classpath
-                current_dir = os.getcwd()
-                muller_path = os.path.join(current_dir, "tools", "java_methods", "muller")
-                jpype.addClassPath(muller_path)
-                MullerClass = jpype.JClass("Muller")
-            except:
-                # Third try: Direct file path approach
-                import subprocess
-                result = subprocess.run([
-                    'java', '-cp', 'tools/java_methods/muller', 'Muller', 
-                    function, str(p0), str(p1), str(p2), str(nmax), str(last_n_rows), str(tolerance)
-                ], capture_output=True, text=True, cwd=os.getcwd())
-                
-                if result.returncode == 0:
-                    return json.loads(result.stdout)
-                else:
-                    raise Exception(f"Java execution failed: {result.stderr}")
-        
+        MullerClass = _muller_class()
+
         # Call Java method which returns JSON string
-        json_result = MullerClass.mullerController(function, float(p0), float(p1), float(p2), 
-                                                  int(nmax), int(last_n_rows), float(tolerance))
-        
+        with _call_slots:
+            t0 = time.perf_counter()
+            json_result = MullerClass.mullerController(function, float(p0), float(p1), float(p2),
+                                                      int(nmax), int(last_n_rows), float(tolerance))
+            call_ms = (time.perf_counter() - t0) * 1000.0
+
         # Parse JSON string to Python dictionary
         python_result = json.loads(str(json_result))
-        
+        python_result["timing"] = {
+            "jvm_cold_start_ms": jvm_cold_start_ms(),
+            "call_ms": call_ms
+        }
+
         return python_result
-        
+
     except Exception as e:
-        print(f"Error calling Java method: {e}")
-        print(f"Current working directory: {os.getcwd()}")
-        print(f"Python file location: {__file__}")
-        
+        logger.exception("Error calling Java method")
+
         return {
             "iterations": [],
             "roots": [],
@@ -75,6 +92,155 @@ def muller_method(function: str, p0: float, p1: float, p2: float, nmax: int, las
             "message": f"Error: {str(e)}"
         }
 
-def muller_controller(function: str, p0: float, p1: float, p2: float, nmax: int, last_n_rows: int, tolerance: float):
+
+# Layout of each row returned by Muller.mullerBatch (see BATCH_FIELDS in Muller.java)
+BATCH_FIELDS = ("root_real", "root_imag", "error", "iterations", "converged")
+
+
+def _as_starts(p0s, p1s, p2s):
+    p0 = np.ascontiguousarray(p0s, dtype=np.float64).ravel()
+    p1 = np.ascontiguousarray(p1s, dtype=np.float64).ravel()
+    p2 = np.ascontiguousarray(p2s, dtype=np.float64).ravel()
+    if not (p0.size == p1.size == p2.size):
+        raise ValueError("p0, p1 y p2 deben tener la misma longitud")
+    if p0.size == 0:
+        raise ValueError("Se requiere al menos un punto inicial")
+    return p0, p1, p2
+
+
+def _parse_complex(text):
+    """'a + bi' / 'a - bi' / 'a' (Complex.toString en Java) -> (a, b)"""
+    text = str(text).strip()
+    if text.endswith("i"):
+        z = complex(text.replace(" ", "").replace("+-", "-").replace("i", "j"))
+        return z.real, z.imag
+    return float(text), 0.0
+
+
+def _batch_fallback(MullerClass, functions, p0, p1, p2, nmax, tolerance):
+    """
+    One mullerController call per start, for a Muller.class compiled
+    before mullerBatch existed. Same output layout as the batch method.
+    """
+    out = np.full((p0.size, len(BATCH_FIELDS)), np.nan)
+    for k in range(p0.size):
+        function = functions[0] if len(functions) == 1 else functions[k]
+        try:
+            res = json.loads(str(MullerClass.mullerController(
+                function, float(p0[k]), float(p1[k]), float(p2[k]),
+                int(nmax), 1, float(tolerance))))
+            re, im = _parse_complex(res["final_root"])
+            errors = res.get("errors") or [np.nan]
+            iterations = res.get("iterations") or [0]
+            out[k] = (re, im, float(errors[-1]), float(iterations[-1]),
+                      1.0 if res.get("message") == "Converged" else 0.0)
+        except Exception:
+            out[k, 3:] = 0.0
+    return out
+
+
+def muller_batch(functions, p0s, p1s, p2s, nmax: int, tolerance: float):
+    """
+    Run Muller for many starts (p0[k], p1[k], p2[k]) with one crossing of
+    the Python–Java boundary. `functions` is a string shared by all starts
+    or a list with one function per start.
+    Inputs go over as primitive double[] and the result comes back as one
+    flat double[] (no per-start JSON). If the loaded Muller.class predates
+    mullerBatch, falls back to one mullerController call per start.
+    """
+    try:
+        p0, p1, p2 = _as_starts(p0s, p1s, p2s)
+        if isinstance(functions, str):
+            functions = [functions]
+        functions = [str(f) for f in functions]
+        if len(functions) not in (1, p0.size):
+            raise ValueError("functions debe tener 1 elemento o uno por punto inicial")
+
+        MullerClass = _muller_class()
+        native = _has_native_batch(MullerClass)
+
+        with _call_slots:
+            t0 = time.perf_counter()
+            if native:
+                import jpype
+                flat = MullerClass.mullerBatch(
+                    jpype.JArray(jpype.JString)(functions),
+                    jpype.JArray(jpype.JDouble)(p0),
+                    jpype.JArray(jpype.JDouble)(p1),
+                    jpype.JArray(jpype.JDouble)(p2),
+                    int(nmax), float(tolerance))
+                out = np.asarray(flat, dtype=np.float64).reshape(-1, len(BATCH_FIELDS))
+            else:
+                out = _batch_fallback(MullerClass, functions, p0, p1, p2, nmax, tolerance)
+            call_ms = (time.perf_counter() - t0) * 1000.0
+
+        def clean(col):
+            return [None if not np.isfinite(v) else float(v) for v in col]
+
+        return {
+            "starts": [[float(a), float(b), float(c)] for a, b, c in zip(p0, p1, p2)],
+            "roots_real": clean(out[:, 0]),
+            "roots_imag": clean(out[:, 1]),
+            "errors": clean(out[:, 2]),
+            "iterations": out[:, 3].astype(int).tolist(),
+            "converged": (out[:, 4] == 1.0).tolist(),
+            "message": "OK",
+            "timing": {
+                "jvm_cold_start_ms": jvm_cold_start_ms(),
+                "call_ms": call_ms,
+                "per_start_us": call_ms * 1000.0 / p0.size,
+                "native_batch": native,
+            },
+        }
+
+    except Exception as e:
+        logger.exception("Error calling Java method")
+        return {
+            "starts": [],
+            "roots_real": [],
+            "roots_imag": [],
+            "errors": [],
+            "iterations": [],
+            "converged": [],
+            "message": f"Error: {str(e)}"
+        }
+
+
+def _format_root(r):
+    # Mismo formato que Complex.toString() en Muller.java
+    if r["imag"] == 0.0:
+        return f"{r['real']:.6f}"
+    return f"{r['real']:.6f} + {r['imag']:.6f}i"
+
+
+def muller_all_roots(function: str, tolerance: float):
+    """
+    Modo "all_roots" para polinomios: todas las raíces en Python con la
+    matriz compañera, sin pasar por el JVM. Misma forma de respuesta que
+    muller_method (roots/errors como columnas, final_root como texto).
+    """
+    result = polynomial_roots(function, tol=float(tolerance))
+    if result is None:
+        return {
+            "iterations": [],
+            "roots": [],
+            "errors": [],
+            "final_root": "Error",
+            "message": "Error: all_roots mode needs a polynomial in x"
+        }
+    roots = result["roots"]
+    return {
+        "iterations": list(range(1, len(roots) + 1)),
+        "roots": [_format_root(r) for r in roots],
+        "errors": [r["residual"] for r in roots],
+        "final_root": _format_root(roots[0]),
+        "message": "All roots (companion matrix)",
+        "all_roots": result
+    }
+
+
+def muller_controller(function: str, p0: float, p1: float, p2: float, nmax: int, last_n_rows: int, tolerance: float, mode: str = "single"):
     """Controller function to match the bisection pattern"""
-    return muller_method(function, p0, p1, p2, nmax, last_n_rows, tolerance)
\ No newline at end of file
+    if mode == "all_roots":
+        return muller_all_roots(function, tolerance)
+    return muller_method(function, p0, p1, p2, nmax, last_n_rows, tolerance)
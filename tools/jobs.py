@@ -0,0 +1,555 @@
+# tools/jobs.py
+# ---------------------------------------------------------------
+# Asynchronous jobs for heavy /eval/* computations.
+# - POST /jobs takes an existing /eval/* payload plus the method name and
+#   returns a job id immediately; the request is replayed against the same
+#   FastAPI app inside a local process pool (spawn), so validation, errors
+#   and results are exactly those of the synchronous route.
+# - Workers report "running" and, for streaming routes (SSE / NDJSON), the
+#   latest progress event through a multiprocessing queue drained by a
+#   thread in the server process.
+# - Jobs live in a bounded in-memory store; finished jobs expire after a
+#   TTL. No external broker.
+# - Each job has a wall-clock limit (JOB_TIMEOUT_S, or a lower "timeout"
+#   per job) and can be cancelled. Every worker process runs one job at a
+#   time, so a job past its limit (or cancelled while running) is stopped
+#   by terminating its worker, which is replaced; the other jobs go on.
+# - Payloads are checked against the job size limits before queueing
+#   (`check`, see AdmissionControl.check_job).
+# ---------------------------------------------------------------
+
+import asyncio
+import base64
+import importlib
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+JOB_WORKERS = max(1, min(4, os.cpu_count() or 1))
+MAX_JOBS = 256           # jobs kept in memory (queued + running + finished)
+JOB_TTL_S = 600.0        # finished jobs are forgotten after this many seconds
+PROGRESS_INTERVAL_S = 0.2
+JOB_TIMEOUT_S = 300.0    # wall-clock limit of one job (queue time not included)
+POLL_INTERVAL_S = 0.2    # how often a runner checks its job for cancel / timeout
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+STREAM_TYPES = ("text/event-stream", "application/x-ndjson")
+
+
+class JobStoreFull(Exception):
+    """No room for a new job: every slot holds a job that has not finished."""
+
+
+class JobTooLarge(Exception):
+    """The payload exceeds the job size limits of its method."""
+
+
+class Job:
+    __slots__ = ("id", "method", "status", "progress", "result", "error", "http_status",
+                 "submitted_at", "started_at", "finished_at", "seq", "timeout", "cancel_requested")
+
+    def __init__(self, method: str, seq: int, timeout: float = JOB_TIMEOUT_S):
+        self.id = uuid.uuid4().hex
+        self.method = method
+        self.status = QUEUED
+        self.progress: Optional[Dict[str, Any]] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.http_status: Optional[int] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.seq = seq
+        self.timeout = float(timeout)
+        self.cancel_requested = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    def end(self, status: str, error: Optional[str] = None) -> None:
+        """Finish without a result (cancelled, timed out, worker died)."""
+        now = time.time()
+        self.status = status
+        self.error = error
+        if self.started_at is None:
+            self.started_at = now
+        self.finished_at = now
+
+    def as_dict(self, ttl: float, queue_position: Optional[int] = None) -> Dict[str, Any]:
+        end = self.finished_at or time.time()
+        out: Dict[str, Any] = {
+            "id": self.id,
+            "method": self.method,
+            "status": self.status,
+            "progress": self.progress,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "elapsed_ms": (end - self.started_at) * 1000.0 if self.started_at else None,
+            "timeout_s": self.timeout,
+        }
+        if queue_position is not None:
+            out["queue_position"] = queue_position
+        if self.finished:
+            out["http_status"] = self.http_status
+            out["expires_in"] = max(0.0, self.finished_at + ttl - time.time())
+        if self.status == DONE:
+            out["result"] = self.result
+        if self.status in (FAILED, CANCELLED):
+            out["error"] = self.error
+            if self.result is not None:
+                out["result"] = self.result
+        return out
+
+
+class JobStore:
+    """Bounded id -> Job map; finished jobs expire after `ttl` seconds."""
+
+    def __init__(self, max_jobs: int = MAX_JOBS, ttl: float = JOB_TTL_S):
+        self.max_jobs = int(max_jobs)
+        self.ttl = float(ttl)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, job: Job) -> None:
+        with self._lock:
+            self._purge(time.time())
+            if len(self._jobs) >= self.max_jobs:
+                # Sin expirados: se descarta el terminado más antiguo
+                oldest = next((k for k, j in self._jobs.items() if j.finished), None)
+                if oldest is None:
+                    raise JobStoreFull(f"Too many pending jobs (max {self.max_jobs}); try again later.")
+                del self._jobs[oldest]
+            self._jobs[job.id] = job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            self._purge(time.time())
+            return self._jobs.get(job_id)
+
+    def queue_position(self, job: Job) -> Optional[int]:
+        if job.status != QUEUED:
+            return None
+        with self._lock:
+            return sum(1 for j in self._jobs.values() if j.status == QUEUED and j.seq < job.seq)
+
+    def discard(self, job_id: str) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def _purge(self, now: float) -> None:
+        expired = [k for k, j in self._jobs.items() if j.finished and now - j.finished_at > self.ttl]
+        for k in expired:
+            del self._jobs[k]
+
+
+class JobManager:
+    """
+    Runs /eval/* requests of `app` on a lazily created set of worker
+    processes. `app_path` ("module:attribute") is how worker processes
+    import the app; `check(path, payload)` returns an error message for a
+    payload over the job limits (None if it fits).
+    """
+
+    def __init__(self, app, app_path: str, workers: int = JOB_WORKERS,
+                 max_jobs: int = MAX_JOBS, ttl: float = JOB_TTL_S, timeout: float = JOB_TIMEOUT_S,
+                 check: Optional[Callable[[str, Dict[str, Any]], Optional[str]]] = None):
+        self.app = app
+        self.app_path = app_path
+        self.workers = int(workers)
+        self.timeout = float(timeout)
+        self.check = check
+        self.store = JobStore(max_jobs, ttl)
+        self._seq = itertools.count()
+        self._tasks: "queue.Queue[Optional[Tuple[Job, str, bytes, str]]]" = queue.Queue()
+        self._runners: List[threading.Thread] = []
+        self._workers: List["_Worker"] = []
+        self._events = None
+        self._drain_thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    # ===== API =====
+    def submit(self, method: str, payload: Any, encoding: Optional[str] = None,
+               timeout: Optional[float] = None) -> Job:
+        path, body, content_type = self.encode_request(method, payload, encoding)
+        if self.check is not None:
+            error = self.check(path, payload)
+            if error:
+                raise JobTooLarge(error)
+        job = Job(path, next(self._seq), self._timeout(timeout))
+        self.store.add(job)
+        try:
+            self._start()
+        except Exception:
+            self.store.discard(job.id)
+            raise
+        self._tasks.put((job, path, body, content_type))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.store.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued or running job (no-op if it already finished); None if unknown."""
+        job = self.store.get(job_id)
+        if job is None or job.finished:
+            return job
+        job.cancel_requested.set()
+        if job.status == QUEUED:
+            # Aún sin worker: su runner lo salta al sacarlo de la cola
+            job.end(CANCELLED, "Cancelled before it started.")
+        return job
+
+    def describe(self, job: Job) -> Dict[str, Any]:
+        return job.as_dict(self.store.ttl, self.store.queue_position(job))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+            for _ in self._runners:
+                self._tasks.put(None)
+            # Un job en curso no se interrumpe solo: se terminan los workers
+            for worker in self._workers:
+                worker.stop()
+            if self._events is not None:
+                self._events.put(None)
+                self._events = None
+
+    def _timeout(self, timeout: Optional[float]) -> float:
+        if timeout is None:
+            return self.timeout
+        try:
+            value = float(timeout)
+        except (TypeError, ValueError):
+            raise ValueError("Parameter 'timeout' must be a number of seconds.")
+        if not value > 0:
+            raise ValueError("Parameter 'timeout' must be positive.")
+        return min(value, self.timeout)
+
+    # ===== request encoding =====
+    def encode_request(self, method: str, payload: Any, encoding: Optional[str] = None) -> Tuple[str, bytes, str]:
+        """(path, body, content type) for a POST to /eval/<method>; ValueError if invalid."""
+        if not isinstance(method, str) or not method.strip():
+            raise ValueError("Parameter 'method' is required (e.g. 'gauss_simple').")
+        path = method.strip()
+        if not path.startswith("/"):
+            path = "/eval/" + path
+        if not path.startswith("/eval/"):
+            raise ValueError("Only /eval/* methods can run as jobs.")
+        route = self._find_route(path)
+        if route is None:
+            raise ValueError(f"Unknown method '{method}'.")
+        if not isinstance(payload, dict):
+            raise ValueError("Parameter 'payload' must be an object.")
+
+        if encoding is None:
+            encoding = "form" if _uses_form(route) else "json"
+        if encoding == "form":
+            fields = {k: v for k, v in payload.items() if v is not None}
+            return path, urlencode(fields, doseq=True).encode(), "application/x-www-form-urlencoded"
+        if encoding == "json":
+            return path, json.dumps(payload).encode(), "application/json"
+        raise ValueError("Parameter 'encoding' must be 'json' or 'form'.")
+
+    def _find_route(self, path: str):
+        for route in self.app.routes:
+            if getattr(route, "path", None) == path and "POST" in (getattr(route, "methods", None) or ()):
+                return route
+        return None
+
+    # ===== workers / events =====
+    def _start(self) -> None:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The job manager is shut down.")
+            if self._runners:
+                return
+            # spawn: el servidor tiene hilos (threadpool, JVM) y fork no es seguro
+            ctx = multiprocessing.get_context("spawn")
+            self._events = ctx.Queue()
+            self._drain_thread = threading.Thread(target=self._drain, args=(self._events,),
+                                                  name="jobs-progress", daemon=True)
+            self._drain_thread.start()
+            for k in range(self.workers):
+                worker = _Worker(ctx, self.app_path, self._events)
+                self._workers.append(worker)
+                runner = threading.Thread(target=self._run, args=(worker,), name=f"jobs-runner-{k}", daemon=True)
+                self._runners.append(runner)
+                runner.start()
+
+    def _run(self, worker: "_Worker") -> None:
+        """One runner thread per worker process: takes the next job and watches it."""
+        while True:
+            item = self._tasks.get()
+            if item is None or self._closed:
+                return
+            job, path, body, content_type = item
+            if job.finished:
+                continue
+            try:
+                outcome = worker.run(job, (job.id, path, body, content_type))
+            except Exception as e:
+                outcome = ("error", f"{type(e).__name__}: {e}")
+            if job.finished:
+                continue
+            kind, data = outcome
+            if kind == "ok":
+                http_status, result, error, started_at = data
+                job.started_at = started_at
+                job.http_status = http_status
+                job.result = result
+                job.error = error
+                job.status = DONE if error is None else FAILED
+                job.finished_at = time.time()
+            elif kind == "cancelled":
+                job.end(CANCELLED, "Cancelled while running.")
+            elif kind == "timeout":
+                job.end(FAILED, f"Job exceeded its time limit ({job.timeout:g} s).")
+            else:
+                job.end(FAILED, data)
+
+    def _drain(self, events) -> None:
+        while True:
+            try:
+                msg = events.get()
+            except (EOFError, OSError):
+                return
+            if msg is None:
+                return
+            job_id, kind, data = msg
+            job = self.store.get(job_id)
+            if job is None or job.finished:
+                continue
+            if kind == "running":
+                job.status = RUNNING
+                job.started_at = data
+            elif kind == "progress":
+                job.progress = data
+
+
+class _Worker:
+    """One worker process (started on demand, replaced after it is terminated)."""
+
+    def __init__(self, ctx, app_path: str, events):
+        self.ctx = ctx
+        self.app_path = app_path
+        self.events = events
+        self.process = None
+        self.conn = None
+
+    def _spawn(self) -> None:
+        parent, child = self.ctx.Pipe()
+        self.process = self.ctx.Process(target=_worker_main, args=(self.app_path, self.events, child),
+                                        name="jobs-worker", daemon=True)
+        self.process.start()
+        child.close()
+        self.conn = parent
+
+    def stop(self) -> None:
+        process, self.process = self.process, None
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        if process is not None and process.is_alive():
+            process.terminate()
+            process.join(1.0)
+            if process.is_alive():
+                process.kill()
+
+    def run(self, job: Job, task: Tuple[str, str, bytes, str]) -> Tuple[str, Any]:
+        """("ok", result) / ("error", message) / ("cancelled", None) / ("timeout", None)."""
+        if self.process is None or not self.process.is_alive():
+            self.stop()
+            self._spawn()
+        self.conn.send(task)
+        deadline = time.monotonic() + job.timeout
+        while True:
+            if job.cancel_requested.is_set():
+                self.stop()
+                return "cancelled", None
+            if time.monotonic() > deadline:
+                self.stop()
+                return "timeout", None
+            try:
+                if self.conn.poll(POLL_INTERVAL_S):
+                    return self.conn.recv()
+            except (EOFError, OSError):
+                pass
+            else:
+                if self.process.is_alive():
+                    continue
+            # Un worker murió (p. ej. sin memoria): se recrea en el próximo job
+            code = self.process.exitcode if self.process is not None else None
+            self.stop()
+            return "error", f"Worker process died (exit code {code})."
+
+
+def _uses_form(route) -> bool:
+    dependant = getattr(route, "dependant", None)
+    if dependant is None:
+        return False
+    from fastapi import params
+    return any(isinstance(p.field_info, params.Form) for p in dependant.body_params)
+
+
+# ===================== worker process =====================
+_worker_app = None
+_worker_events = None
+
+
+def _worker_main(app_path: str, events, conn) -> None:
+    """Worker process loop: one job at a time from `conn`, result sent back on it."""
+    _init_worker(app_path, events)
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            outcome = ("ok", _run_job(*task))
+        except Exception as e:
+            outcome = ("error", f"{type(e).__name__}: {e}")
+        conn.send(outcome)
+
+
+def _init_worker(app_path: str, events) -> None:
+    global _worker_app, _worker_events
+    module, _, attr = app_path.partition(":")
+    _worker_app = getattr(importlib.import_module(module), attr or "app")
+    _worker_events = events
+    # Si el servidor muere sin pasar por shutdown (la JVM atrapa SIGINT/SIGTERM),
+    # el worker no debe seguir calculando huérfano
+    threading.Thread(target=_exit_with_parent, args=(os.getppid(),), daemon=True).start()
+
+
+def _exit_with_parent(parent_pid: int) -> None:
+    while os.getppid() == parent_pid:
+        time.sleep(1.0)
+    os._exit(1)
+
+
+def _post(job_id: str, kind: str, data: Any) -> None:
+    try:
+        _worker_events.put((job_id, kind, data))
+    except Exception:
+        pass
+
+
+def _run_job(job_id: str, path: str, body: bytes, content_type: str) -> Tuple[int, Any, Optional[str], float]:
+    """Replays the POST against the app; returns (http status, result, error or None, start time)."""
+    started_at = time.time()
+    _post(job_id, "running", started_at)
+    status, headers, chunks = asyncio.run(_dispatch(job_id, path, body, content_type))
+    media_type = headers.get("content-type", "").split(";")[0].strip()
+    result = _decode_body(media_type, b"".join(chunks), headers)
+
+    error = None
+    if status >= 400:
+        error = result.get("error") if isinstance(result, dict) and result.get("error") else f"HTTP {status}"
+    elif isinstance(result, list) and result and result[-1].get("event") == "error":
+        error = result[-1].get("error") or "error"
+    return status, result, error, started_at
+
+
+async def _dispatch(job_id: str, path: str, body: bytes, content_type: str):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"content-type", content_type.encode()),
+                    (b"content-length", str(len(body)).encode())],
+        "client": ("jobs", 0),
+        "server": ("jobs", 0),
+        # Marca para el control de admisión: los jobs ya tienen su propio pool
+        "job": job_id,
+    }
+    sent_body = False
+    never = asyncio.Event()
+
+    async def receive():
+        nonlocal sent_body
+        if not sent_body:
+            sent_body = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await never.wait()  # el "cliente" de un job no se desconecta
+
+    status = 500
+    headers: Dict[str, str] = {}
+    chunks: List[bytes] = []
+    streaming = False
+    pending = b""
+    last_post = 0.0
+
+    async def send(message):
+        nonlocal status, headers, streaming, pending, last_post
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            headers = {k.decode().lower(): v.decode() for k, v in message.get("headers", [])}
+            streaming = headers.get("content-type", "").startswith(STREAM_TYPES)
+        elif message["type"] == "http.response.body":
+            chunk = message.get("body", b"")
+            chunks.append(chunk)
+            if streaming and chunk:
+                pending += chunk
+                now = time.monotonic()
+                if now - last_post >= PROGRESS_INTERVAL_S:
+                    events = _parse_stream(headers["content-type"], pending)
+                    if events:
+                        _post(job_id, "progress", events[-1])
+                        pending = b""
+                        last_post = now
+
+    await _worker_app(scope, receive, send)
+    return status, headers, chunks
+
+
+def _parse_stream(content_type: str, data: bytes) -> List[Dict[str, Any]]:
+    events = []
+    text = data.decode("utf-8", errors="replace")
+    if content_type.startswith("text/event-stream"):
+        for frame in text.split("\n\n"):
+            for line in frame.splitlines():
+                if line.startswith("data:"):
+                    try:
+                        events.append(json.loads(line[5:]))
+                    except ValueError:
+                        pass
+    else:
+        for line in text.splitlines():
+            if line.strip():
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    pass
+    return events
+
+
+def _decode_body(media_type: str, data: bytes, headers: Dict[str, str]) -> Any:
+    if media_type == "application/json":
+        try:
+            return json.loads(data)
+        except ValueError:
+            return data.decode("utf-8", errors="replace")
+    if media_type in STREAM_TYPES:
+        # El progreso ya se reportó; el resultado son los eventos restantes (done/root/...)
+        return [e for e in _parse_stream(media_type, data) if e.get("event") != "progress"]
+    if media_type.startswith("text/"):
+        return {"media_type": media_type, "text": data.decode("utf-8", errors="replace")}
+    extra = {k: v for k, v in headers.items() if k.startswith("x-")}
+    return {"media_type": media_type, "base64": base64.b64encode(data).decode("ascii"), "headers": extra}
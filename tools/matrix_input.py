@@ -0,0 +1,355 @@
+# tools/matrix_input.py
+# ---------------------------------------------------------------
+# Shared ingestion of matrices / vectors from JSON request bodies.
+# - Body parsed with orjson when it is installed (json otherwise).
+# - A and b become contiguous float64 arrays in one numpy call; the
+#   per-cell path only runs when that fails, to report the first
+#   offending cell with the usual message.
+# - The solver modules take these arrays with np.asarray (no second copy).
+# - multipart/form-data: A, b and x0 can be uploaded as files in .npy,
+#   Matrix Market (array / coordinate) or CSV format. A float64 .npy that
+#   was spooled to disk is memory-mapped copy-on-write and reaches the
+#   solvers without any copy (the in-place eliminations only copy the
+#   pages they write).
+# ---------------------------------------------------------------
+
+import io
+import json
+import os
+import warnings
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from starlette.concurrency import run_in_threadpool
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # dependencia opcional
+    _loads = json.loads
+
+
+class InputError(ValueError):
+    """Invalid request input; the message goes back to the client (400)."""
+
+
+def to_float_safe(x) -> Optional[float]:
+    """float(x) or None if it is not numeric (numbers and numeric strings)."""
+    if x is None:
+        return None
+    try:
+        return float(x)
+    except (TypeError, ValueError):
+        return None
+
+
+async def read_json(request) -> Dict[str, Any]:
+    """JSON object of the request body (InputError if invalid or not an object)."""
+    try:
+        data = _loads(await request.body())
+    except ValueError:
+        raise InputError("Invalid JSON body.")
+    if not isinstance(data, dict):
+        raise InputError("Invalid JSON body.")
+    return data
+
+
+# Campos que pueden llegar como archivo en multipart/form-data
+MATRIX_FIELDS = ("A", "b", "x0")
+
+
+async def read_payload(request) -> Dict[str, Any]:
+    """
+    Like read_json, but multipart/form-data is accepted too: A, b and x0
+    as uploaded files (or text fields with a JSON list / CSV), the other
+    fields as strings.
+    """
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        return await read_json(request)
+    try:
+        form = await request.form()
+    except Exception as e:
+        raise InputError(f"Invalid multipart body: {e}")
+    data: Dict[str, Any] = {}
+    for key, value in form.multi_items():
+        if key in MATRIX_FIELDS:
+            # CSV / Matrix Market grandes tardan: fuera del event loop
+            data[key] = await run_in_threadpool(_load_field, value, key)
+        elif isinstance(value, str):
+            data[key] = value
+    return data
+
+
+def require(data: Dict[str, Any], *names: str) -> None:
+    if any(data.get(n) is None for n in names):
+        quoted = " and ".join(f"'{n}'" for n in names)
+        raise InputError(f"Parameters {quoted} are required." if len(names) > 1 else f"Parameter {quoted} is required.")
+
+
+def as_matrix(A: Any, name: str = "A") -> np.ndarray:
+    """List of lists -> C-contiguous float64 array (n x m); uploaded arrays pass through."""
+    if isinstance(A, np.ndarray):
+        if A.ndim != 2 or A.size == 0:
+            raise InputError(f"Matrix '{name}' must be a non-empty 2-D array (got shape {A.shape}).")
+        # float64 (memmap incluido) -> misma memoria, sin copia
+        return np.asarray(A, dtype=np.float64)
+    if not (isinstance(A, list) and A and all(isinstance(row, list) for row in A)):
+        raise InputError(f"Matrix '{name}' must be a non-empty list of lists.")
+    cols = len(A[0])
+    if any(len(row) != cols for row in A):
+        raise InputError(f"All rows in '{name}' must have the same length.")
+    try:
+        M = np.array(A, dtype=np.float64)
+        # None -> nan y listas anidadas -> ndim 3: se revisan celda a celda
+        if M.ndim == 2 and np.isfinite(M).all():
+            return M
+    except (TypeError, ValueError):
+        pass
+    return _matrix_by_cell(A, name)
+
+
+def as_vector(v: Any, name: str = "b") -> np.ndarray:
+    """List -> contiguous float64 array (n,); uploaded arrays pass through."""
+    if isinstance(v, np.ndarray):
+        if v.ndim != 1 or v.size == 0:
+            raise InputError(f"Vector '{name}' must be a non-empty 1-D array (got shape {v.shape}).")
+        return np.asarray(v, dtype=np.float64)
+    if not (isinstance(v, list) and v):
+        raise InputError(f"Vector '{name}' must be a non-empty list.")
+    try:
+        x = np.array(v, dtype=np.float64)
+        if x.ndim == 1 and np.isfinite(x).all():
+            return x
+    except (TypeError, ValueError):
+        pass
+    out = np.empty(len(v), dtype=np.float64)
+    for i, val in enumerate(v):
+        f = to_float_safe(val)
+        if f is None:
+            raise InputError(f"Non-numeric value at {name}[{i+1}] → {repr(val)}")
+        out[i] = f
+    return out
+
+
+def _matrix_by_cell(A: list, name: str) -> np.ndarray:
+    out = np.empty((len(A), len(A[0])), dtype=np.float64)
+    for i, row in enumerate(A):
+        for j, val in enumerate(row):
+            f = to_float_safe(val)
+            if f is None:
+                raise InputError(f"Non-numeric value at {name}[{i+1}][{j+1}] → {repr(val)}")
+            out[i, j] = f
+    return out
+
+
+# ===================== uploaded files =====================
+
+def _load_field(value: Any, name: str) -> Any:
+    """Upload or text field of A / b / x0 -> array (vectors flattened) or JSON list."""
+    if isinstance(value, str):
+        text = value.strip()
+        if text.startswith("["):
+            # Lista JSON: la validan as_matrix / as_vector como en el cuerpo JSON
+            try:
+                return _loads(text)
+            except ValueError:
+                raise InputError(f"Invalid JSON list in field '{name}'.")
+        M = load_matrix_file(io.BytesIO(text.encode()), None, name)
+    else:
+        M = load_matrix_file(value.file, value.filename, name)
+    if name != "A" and M.ndim == 2 and 1 in M.shape:
+        # b / x0 como columna o fila -> vector (vista, sin copia)
+        M = M.reshape(-1)
+    return M
+
+
+def _format_of(filename: Optional[str], head: bytes) -> str:
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext == ".npy" or head.startswith(b"\x93NUMPY"):
+        return "npy"
+    if ext in (".mtx", ".mm") or head.lstrip().lower().startswith(b"%%matrixmarket"):
+        return "mtx"
+    return "csv"
+
+
+def load_matrix_file(f, filename: Optional[str], name: str = "A") -> np.ndarray:
+    """Array from an uploaded file object (.npy, Matrix Market or CSV, by extension or content)."""
+    f.seek(0)
+    head = f.read(64)
+    f.seek(0)
+    fmt = _format_of(filename, head)
+    if fmt == "npy":
+        return _load_npy(f, name)
+    raw = f.read()
+    if fmt == "mtx":
+        return _load_mtx(raw, name)
+    return _load_csv(raw, name)
+
+
+def _read_npy_header(f) -> Tuple[Tuple[int, ...], bool, np.dtype]:
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        return np.lib.format.read_array_header_1_0(f)
+    if version == (2, 0):
+        return np.lib.format.read_array_header_2_0(f)
+    raise ValueError(f"unsupported .npy version {version[0]}.{version[1]}")
+
+
+def _load_npy(f, name: str) -> np.ndarray:
+    try:
+        shape, fortran, dtype = _read_npy_header(f)
+    except ValueError as e:
+        raise InputError(f"Invalid .npy file for '{name}': {e}")
+    if dtype.hasobject or dtype.kind not in "biuf":
+        raise InputError(f"'{name}': .npy must hold real numbers (got dtype {dtype}).")
+    count = int(np.prod(shape))
+    if count == 0:
+        raise InputError(f"'{name}': the .npy array is empty.")
+    offset = f.tell()
+    order = "F" if fortran else "C"
+
+    # SpooledTemporaryFile: en disco a partir de 1 MB (UploadFile de starlette)
+    disk = getattr(f, "_file", f)
+    try:
+        disk.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        disk = None
+    if disk is not None:
+        try:
+            # mode="c": copy-on-write, nunca escribe en el archivo
+            return np.memmap(disk, dtype=dtype, mode="c", offset=offset, shape=shape, order=order)
+        except ValueError:
+            raise InputError(f"'{name}': the .npy file is truncated.")
+
+    # En memoria (archivo pequeño): bytearray para que el arreglo sea escribible
+    buf = bytearray(f.read())
+    if len(buf) < count * dtype.itemsize:
+        raise InputError(f"'{name}': the .npy file is truncated.")
+    return np.frombuffer(buf, dtype=dtype, count=count).reshape(shape, order=order)
+
+
+def _load_mtx(raw: bytes, name: str) -> np.ndarray:
+    """Matrix Market: array (dense, column-major) or coordinate; general / symmetric / skew-symmetric."""
+    end = raw.find(b"\n")
+    end = len(raw) if end < 0 else end
+    banner = raw[:end].decode("latin-1").lower().split()
+    if len(banner) != 5 or banner[0] != "%%matrixmarket" or banner[1] != "matrix":
+        raise InputError(f"'{name}': invalid Matrix Market header.")
+    layout, field, symmetry = banner[2:]
+    if (layout not in ("array", "coordinate") or field not in ("real", "double", "integer", "pattern")
+            or symmetry not in ("general", "symmetric", "skew-symmetric")
+            or (layout == "array" and field == "pattern")):
+        raise InputError(f"'{name}': unsupported Matrix Market format '{layout} {field} {symmetry}'.")
+
+    # Comentarios / líneas vacías hasta la línea de tamaños
+    while True:
+        start = end + 1
+        if start >= len(raw):
+            raise InputError(f"'{name}': Matrix Market file without a size line.")
+        end = raw.find(b"\n", start)
+        end = len(raw) if end < 0 else end
+        line = raw[start:end].strip()
+        if line and not line.startswith(b"%"):
+            break
+    try:
+        size = [int(t) for t in line.split()]
+    except ValueError:
+        size = []
+    if len(size) != (2 if layout == "array" else 3) or min(size) < 0:
+        raise InputError(f"'{name}': invalid Matrix Market size line '{line.decode('latin-1')}'.")
+    rows, cols = size[0], size[1]
+    if rows == 0 or cols == 0:
+        raise InputError(f"'{name}': the matrix is empty.")
+    if symmetry != "general" and rows != cols:
+        raise InputError(f"'{name}': a {symmetry} matrix must be square.")
+
+    with warnings.catch_warnings():
+        # fromstring avisa (y se detiene) en el primer token no numérico
+        warnings.simplefilter("ignore", DeprecationWarning)
+        values = np.fromstring(raw[end + 1:].decode("latin-1"), sep=" ")
+
+    if layout == "array":
+        if symmetry == "general":
+            expected = rows * cols
+        else:
+            expected = rows * (rows + 1) // 2 if symmetry == "symmetric" else rows * (rows - 1) // 2
+        _check_count(values, expected, name)
+        if symmetry == "general":
+            return np.ascontiguousarray(values.reshape(cols, rows).T)
+        # Triángulo inferior por columnas = triángulo superior de A^T por filas
+        A = np.zeros((rows, cols))
+        k = 0 if symmetry == "symmetric" else 1
+        j, i = np.triu_indices(rows, k)
+        A[i, j] = values
+        A[j, i] = values if symmetry == "symmetric" else -values
+        return A
+
+    nnz = size[2]
+    width = 2 if field == "pattern" else 3
+    _check_count(values, nnz * width, name)
+    entries = values.reshape(nnz, width)
+    i = entries[:, 0].astype(np.intp) - 1
+    j = entries[:, 1].astype(np.intp) - 1
+    v = entries[:, 2] if width == 3 else np.ones(nnz)
+    if nnz and (i.min() < 0 or j.min() < 0 or i.max() >= rows or j.max() >= cols):
+        raise InputError(f"'{name}': Matrix Market entry outside the {rows}x{cols} matrix.")
+    A = np.zeros((rows, cols))
+    # Entradas repetidas se suman
+    np.add.at(A, (i, j), v)
+    if symmetry != "general":
+        off = i != j
+        np.add.at(A, (j[off], i[off]), v[off] if symmetry == "symmetric" else -v[off])
+    return A
+
+
+def _check_count(values: np.ndarray, expected: int, name: str) -> None:
+    if values.size != expected:
+        raise InputError(f"'{name}': Matrix Market data has {values.size} numeric values, expected {expected}.")
+
+
+def _load_csv(raw: bytes, name: str) -> np.ndarray:
+    """CSV (comma or whitespace separated), optional header row."""
+    text = raw.decode("utf-8-sig", errors="replace")
+    first = next((line for line in text.splitlines() if line.strip()), None)
+    if first is None:
+        raise InputError(f"'{name}': the CSV file is empty.")
+    delimiter = "," if "," in first else None
+    header = any(to_float_safe(t) is None for t in first.split(delimiter) if t.strip())
+    try:
+        M = np.loadtxt(io.StringIO(text), delimiter=delimiter, skiprows=1 if header else 0,
+                       ndmin=2, dtype=np.float64)
+    except ValueError as e:
+        raise InputError(f"Invalid CSV for '{name}': {e}")
+    if M.size == 0:
+        raise InputError(f"'{name}': the CSV file has no data rows.")
+    return M
+
+
+def sniff_shape(content) -> Optional[Tuple[int, int]]:
+    """
+    (rows, cols) of an uploaded matrix file read from its header only
+    (the whole text for CSV); None if it can't be told. Used by admission
+    control before the route parses the upload.
+    """
+    head = bytes(content[:64 * 1024])
+    try:
+        if head.startswith(b"\x93NUMPY"):
+            shape = _read_npy_header(io.BytesIO(head))[0]
+            return (shape + (1, 1))[:2] if len(shape) < 2 else (shape[0], shape[1])
+        if head.lstrip().lower().startswith(b"%%matrixmarket"):
+            for line in head.splitlines()[1:]:
+                line = line.strip()
+                if line and not line.startswith(b"%"):
+                    size = [int(t) for t in line.split()]
+                    return size[0], size[1]
+            return None
+        lines = [line for line in bytes(content).splitlines() if line.strip()]
+        if not lines:
+            return None
+        first = lines[0].decode("utf-8-sig", errors="replace")
+        delimiter = "," if "," in first else None
+        tokens = [t for t in first.split(delimiter) if t.strip()]
+        header = any(to_float_safe(t) is None for t in tokens)
+        return len(lines) - (1 if header else 0), len(tokens)
+    except (ValueError, IndexError):
+        return None
@@ -1,9 +1,11 @@
 import numpy as np
 
-def sor(A, b, omega, x_0, tolerance, n_max, norma="inf"):
-    A = np.array(A, dtype=float)
-    b = np.array(b, dtype=float)
-    x_0 = np.array(x_0, dtype=float)
+def sor(A, b, omega, x_0, tolerance, n_max, norma="inf", progress=None, keep_logs=True):
+    # progress(iteration, error, x): optional per-iteration hook (streaming);
+    # keep_logs=False skips the per-iteration log entries.
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    x_0 = np.asarray(x_0, dtype=float)
     n = len(b)
     logs = []
 
@@ -86,11 +88,14 @@ def sor(A, b, omega, x_0, tolerance, n_max, norma="inf"):
 
         error = _vec_norm(x - x_old, norma)
 
-        logs.append({
-            "step": f"Iteration {iteration}",
-            "x": x.tolist(),
-            "error": error
-        })
+        if keep_logs:
+            logs.append({
+                "step": f"Iteration {iteration}",
+                "x": x.tolist(),
+                "error": error
+            })
+        if progress is not None:
+            progress(iteration, error, x)
 
         if error < tolerance:
             return {
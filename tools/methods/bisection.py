@@ -1,50 +1,60 @@
+import time
+
 from sympy import *
+from tools.history import IterationHistory
 
-def bisection(f: str, a: float, b: float, nmax: int, last_n_rows: int, tolerance: float):
+def bisection(f: str, a: float, b: float, nmax: int, last_n_rows: int, tolerance: float, trace_stride: int = 0):
 
     x = symbols("x")
     f_math = lambdify(x, sympify(f), "math")
 
-    
-    list_ite, list_a, list_b, list_root, list_abs = [], [], [], [], []
+    t0 = time.perf_counter()
+
+    # Solo se devuelven las últimas last_n_rows filas: historial de tamaño fijo
+    # (last_n_rows <= 0: todas, como el antiguo [-n:])
+    history = IterationHistory(("iterations", "roots", "errors"), tail=last_n_rows if last_n_rows > 0 else None,
+                               stride=trace_stride)
+
+    def answer(middle, message):
+        result = {
+            **history.as_dict(),
+            "final_root": middle,
+            "evaluations": evaluations,
+            "elapsed_ms": (time.perf_counter() - t0) * 1000.0,
+            "message": message
+        }
+        if trace_stride:
+            result["trace"] = history.trace()
+        return result
+
+    # f(a) se arrastra: en cada iteración solo se evalúa f(middle)
+    fa = f_math(a)
+    evaluations = 1
 
     x_0 = a
     for i in range(nmax):
         middle = (a+b)/2
         abs_error = abs(x_0 - middle)
-        
-        if f_math(a) * f_math(middle) < 0:
+
+        f_middle = f_math(middle)
+        evaluations += 1
+
+        if fa * f_middle < 0:
             b = middle
         else:
-            a = middle
+            a, fa = middle, f_middle
 
-        list_ite.append(i+1)
-        list_a.append(a)
-        list_b.append(b)
-        list_root.append(middle)
-        list_abs.append(abs_error)
+        history.append(i+1, middle, abs_error)
 
         if abs_error < tolerance:
-            return {
-                "iterations": list_ite[-last_n_rows:],
-                "roots": list_root[-last_n_rows:],
-                "errors": list_abs[-last_n_rows:],
-                "final_root": middle,
-                "message": "Converged, tolerance satisfied"
-            }
+            return answer(middle, "Converged, tolerance satisfied")
 
         x_0 = middle
 
-    return {
-        "iterations": list_ite[-last_n_rows:],
-        "roots": list_root[-last_n_rows:],
-        "errors": list_abs[-last_n_rows:],
-        "final_root": middle,
-        "message": "Max iterations reached"
-    }
+    return answer(middle, "Max iterations reached")
 
 
-def bisection_controller(function: str, a: float, b: float, nmax: int, last_n_rows: int, tolerance: float):
+def bisection_controller(function: str, a: float, b: float, nmax: int, last_n_rows: int, tolerance: float, trace_stride: int = 0):
     # Debug prints
     print("=== Parámetros recibidos en bisection_controller ===")
     print(f"function: {function}")
@@ -55,6 +65,6 @@ def bisection_controller(function: str, a: float, b: float, nmax: int, last_n_ro
     print(f"tolerance: {tolerance}")
     print("====================================================")
     
-    answer = bisection(function, a, b, nmax, last_n_rows, tolerance)
+    answer = bisection(function, a, b, nmax, last_n_rows, tolerance, trace_stride)
 
     return answer
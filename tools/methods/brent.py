@@ -0,0 +1,117 @@
+import math
+from sympy import *
+from tools.history import IterationHistory
+
+# Brent (zeroin): en cada iteración intenta interpolación cuadrática inversa
+# o secante y cae a bisección cuando el paso no es aceptable. Conserva
+# siempre un intervalo con cambio de signo, así que converge como bisección
+# en el peor caso y superlinealmente cerca de la raíz.
+
+STEP_BISECTION = "bisection"
+STEP_SECANT = "secant"
+STEP_INVERSE_QUADRATIC = "inverse_quadratic"
+
+
+def brent(f: str, a: float, b: float, nmax: int, last_n_rows: int, tolerance: float, trace_stride: int = 0):
+
+    x = symbols("x")
+    f_math = lambdify(x, sympify(f), "math")
+
+    # Mismo criterio que bisection: last_n_rows <= 0 devuelve todas las filas
+    history = IterationHistory(("iterations", "roots", "fx", "errors", "steps"),
+                               tail=last_n_rows if last_n_rows > 0 else None, stride=trace_stride)
+    step_counts = {STEP_BISECTION: 0, STEP_SECANT: 0, STEP_INVERSE_QUADRATIC: 0}
+
+    def answer(root, message):
+        result = {
+            **history.as_dict(),
+            "step_counts": step_counts,
+            "evaluations": evaluations,
+            # Iteraciones que necesitaría bisección para la misma tolerancia
+            "bisection_iterations_bound": bisection_bound,
+            "final_root": root,
+            "message": message
+        }
+        if trace_stride:
+            result["trace"] = history.trace()
+        return result
+
+    a, b, tolerance = float(a), float(b), float(tolerance)
+    bisection_bound = max(0, math.ceil(math.log2(abs(b - a) / tolerance))) if tolerance > 0 and a != b else 0
+
+    fa, fb = f_math(a), f_math(b)
+    evaluations = 2
+
+    if fa == 0:
+        return answer(a, "Root found at a")
+    if fb == 0:
+        return answer(b, "Root found at b")
+    if fa * fb > 0:
+        return answer(None, "Function does not change sign on the interval [a, b]")
+
+    # c es el contrapunto: f(b) y f(c) tienen signos opuestos
+    c, fc = a, fa
+    d = e = b - a
+    eps = 2.220446049250313e-16
+
+    for i in range(1, nmax + 1):
+        if fb * fc > 0:
+            c, fc = a, fa
+            d = e = b - a
+        # b siempre es la mejor aproximación (|f(b)| <= |f(c)|)
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+
+        tol1 = 2 * eps * abs(b) + 0.5 * tolerance
+        xm = 0.5 * (c - b)
+
+        if abs(xm) <= tol1 or fb == 0:
+            return answer(b, "Converged, tolerance satisfied")
+
+        step = STEP_BISECTION
+        if abs(e) >= tol1 and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                # Secante con los dos últimos puntos
+                p = 2 * xm * s
+                q = 1 - s
+                step = STEP_SECANT
+            else:
+                # Interpolación cuadrática inversa con a, b, c
+                q = fa / fc
+                r = fb / fc
+                p = s * (2 * xm * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+                step = STEP_INVERSE_QUADRATIC
+            if p > 0:
+                q = -q
+            p = abs(p)
+            # Se acepta solo si cae dentro del intervalo y reduce el paso lo suficiente
+            if 2 * p < min(3 * xm * q - abs(tol1 * q), abs(e * q)):
+                e = d
+                d = p / q
+            else:
+                d = xm
+                e = d
+                step = STEP_BISECTION
+        else:
+            d = xm
+            e = d
+
+        a, fa = b, fb
+        b += d if abs(d) > tol1 else math.copysign(tol1, xm)
+        fb = f_math(b)
+        evaluations += 1
+        step_counts[step] += 1
+
+        history.append(i, b, fb, abs(b - a), step)
+
+    return answer(b, "Max iterations reached")
+
+
+def brent_controller(function: str, a: float, b: float, nmax: int, last_n_rows: int, tolerance: float, trace_stride: int = 0):
+
+    answer = brent(function, a, b, nmax, last_n_rows, tolerance, trace_stride)
+
+    return answer
@@ -170,7 +170,7 @@ def _vector_to_list_complex(v: np.ndarray):
     return [_format_complex(x) for x in v]
 
 
-def _cholesky_complex_with_steps(A_real: np.ndarray, b_real: np.ndarray) -> Dict[str, Any]:
+def _cholesky_complex_with_steps(A_real: np.ndarray, b_real: np.ndarray, steps: Optional[list] = None) -> Dict[str, Any]:
     """
     Fallback: complex Cholesky with steps (L/U, original matrix, etc.).
     It does NOT raise an error if A is not SPD; it just records 'error' in the dict.
@@ -180,7 +180,8 @@ def _cholesky_complex_with_steps(A_real: np.ndarray, b_real: np.ndarray) -> Dict
 
     n = A.shape[0]
     L = np.zeros_like(A, dtype=np.complex128)
-    etapas = []
+    # steps: StepLog from main.py to stream each stage as it is produced
+    etapas = [] if steps is None else steps
     error_msg = ""
 
     # Step 0: original matrix
@@ -238,7 +239,8 @@ def _cholesky_complex_with_steps(A_real: np.ndarray, b_real: np.ndarray) -> Dict
 
 
 # ====== main API (used by FastAPI) ======
-def compute_cholesky(A: List[List[float]], b: List[float], track_etapas: bool = True) -> Dict[str, Any]:
+def compute_cholesky(A: List[List[float]], b: List[float], track_etapas: bool = True,
+                     steps: Optional[list] = None) -> Dict[str, Any]:
     """
     Uses YOUR Cholesky decomposition to solve Ax=b.
     Returns a dict with x, L, Lt (=L.T), y and etapas (if available).
@@ -246,16 +248,17 @@ def compute_cholesky(A: List[List[float]], b: List[float], track_etapas: bool =
     If your module is not found or fails, it falls back to:
     - complex Cholesky with steps (L/U per step, including non-SPD cases).
     """
-    if not isinstance(A, list) or not A or not all(isinstance(r, list) for r in A):
+    if not isinstance(A, (list, np.ndarray)) or len(A) == 0 or not all(isinstance(r, (list, np.ndarray)) for r in A):
         raise ValueError("A must be a non-empty list of lists.")
     n = len(A)
     if any(len(r) != n for r in A):
         raise ValueError("A must be square.")
-    if not isinstance(b, list) or len(b) != n:
+    if not isinstance(b, (list, np.ndarray)) or len(b) != n:
         raise ValueError("b must have length n.")
 
-    A_np = np.array(A, dtype=float)
-    b_np = np.array(b, dtype=float)
+    # Sin copia si ya llega como arreglo float64 (ingesta de main.py)
+    A_np = np.asarray(A, dtype=float)
+    b_np = np.asarray(b, dtype=float)
 
     # 1) try to use your module/function as BEFORE
     user_mod = _import_first(CANDIDATE_MODULES)
@@ -272,7 +275,7 @@ def compute_cholesky(A: List[List[float]], b: List[float], track_etapas: bool =
 
     # 2) if there is no module or it failed -> COMPLEX fallback with steps
     if L is None:
-        result = _cholesky_complex_with_steps(A_np, b_np)
+        result = _cholesky_complex_with_steps(A_np, b_np, steps)
         if not track_etapas and "etapas" in result:
             result.pop("etapas", None)
         return result
@@ -1,10 +1,11 @@
 import numpy as np
-import pandas as pd
+from tools.tables import Table
 
-def crout(A: list, b: list, decimals: int = 6):
-    A = np.array(A, dtype=float)
-    b = np.array(b, dtype=float)
-    logs = []
+def crout(A: list, b: list, decimals: int = 6, logs: list = None):
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    # logs: lista (por defecto) o un StepLog que envía cada paso en streaming
+    logs = [] if logs is None else logs
 
     # --- Shape checks ---
     if A.shape[0] != A.shape[1]:
@@ -12,7 +13,7 @@ def crout(A: list, b: list, decimals: int = 6):
             "solution": None,
             "logs": [{
                 "step": "Check",
-                "matrix": pd.DataFrame(
+                "matrix": Table(
                     np.column_stack((A, b)),
                     columns=[f"x{i+1}" for i in range(A.shape[1])] + ["b"]
                 ).round(decimals),
@@ -25,7 +26,7 @@ def crout(A: list, b: list, decimals: int = 6):
             "solution": None,
             "logs": [{
                 "step": "Check",
-                "matrix": pd.DataFrame(
+                "matrix": Table(
                     np.column_stack((A, b)),
                     columns=[f"x{i+1}" for i in range(A.shape[1])] + ["b"]
                 ).round(decimals),
@@ -42,7 +43,7 @@ def crout(A: list, b: list, decimals: int = 6):
             "solution": None,
             "logs": [{
                 "step": "Check",
-                "matrix": pd.DataFrame(
+                "matrix": Table(
                     np.column_stack((A, b)),
                     columns=[f"x{i+1}" for i in range(n)] + ["b"]
                 ).round(decimals),
@@ -55,7 +56,7 @@ def crout(A: list, b: list, decimals: int = 6):
             "solution": None,
             "logs": [{
                 "step": "Check",
-                "matrix": pd.DataFrame(
+                "matrix": Table(
                     np.column_stack((A, b)),
                     columns=[f"x{i+1}" for i in range(n)] + ["b"]
                 ).round(decimals),
@@ -66,7 +67,7 @@ def crout(A: list, b: list, decimals: int = 6):
     # --- Initialization ---
     logs.append({
         "step": "Initial",
-        "matrix": pd.DataFrame(
+        "matrix": Table(
             np.column_stack((A, b)),
             columns=[f"x{i+1}" for i in range(n)] + ["b"]
         ).round(decimals),
@@ -83,23 +84,21 @@ def crout(A: list, b: list, decimals: int = 6):
 
         for i in range(j + 1, n):
             if np.isclose(L[j, j], 0):
-                return {
-                    "solution": None,
-                    "logs": logs + [{
-                        "step": f"Step {j+1}",
-                        "matrix": pd.DataFrame(
-                            np.column_stack((A, b)),
-                            columns=[f"x{i+1}" for i in range(n)] + ["b"]
-                        ).round(decimals),
-                        "message": f"Zero pivot at L[{j},{j}]. Method fails."
-                    }]
-                }
+                logs.append({
+                    "step": f"Step {j+1}",
+                    "matrix": Table(
+                        np.column_stack((A, b)),
+                        columns=[f"x{i+1}" for i in range(n)] + ["b"]
+                    ).round(decimals),
+                    "message": f"Zero pivot at L[{j},{j}]. Method fails."
+                })
+                return {"solution": None, "logs": logs}
             U[j, i] = (A[j, i] - np.sum(L[j, :j] * U[:j, i])) / L[j, j]
 
         logs.append({
             "step": f"Step {j+1}",
-            "L": pd.DataFrame(L).round(decimals),
-            "U": pd.DataFrame(U).round(decimals),
+            "L": Table(L).round(decimals),
+            "U": Table(U).round(decimals),
             "message": f"Column {j+1} processed."
         })
 
@@ -111,7 +110,7 @@ def crout(A: list, b: list, decimals: int = 6):
     logs.append({
         "step": "Forward Substitution",
         "message": "Forward substitution complete (Ly = b).",
-        "y": pd.Series(y.round(decimals))
+        "y": Table(y.round(decimals))
     })
 
     # --- Backward substitution ---
@@ -122,7 +121,7 @@ def crout(A: list, b: list, decimals: int = 6):
     logs.append({
         "step": "Backward Substitution",
         "message": "Backward substitution complete (Ux = y).",
-        "x": pd.Series(x.round(decimals))
+        "x": Table(x.round(decimals))
     })
 
     return {
@@ -1,10 +1,11 @@
 import numpy as np
-import pandas as pd
+from tools.tables import Table
 
-def doolittle(A: list, b: list, decimals: int = 6):
-    A = np.array(A, dtype=float)
-    b = np.array(b, dtype=float)
-    logs = []
+def doolittle(A: list, b: list, decimals: int = 6, logs: list = None):
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    # logs: lista (por defecto) o un StepLog que envía cada paso en streaming
+    logs = [] if logs is None else logs
 
 
     if A.shape[0] != A.shape[1]:
@@ -12,7 +13,7 @@ def doolittle(A: list, b: list, decimals: int = 6):
             "solution": None,
             "logs": [{
                 "step": "Check",
-                "matrix": pd.DataFrame(
+                "matrix": Table(
                     np.column_stack((A, b)),
                     columns=[f"x{i+1}" for i in range(A.shape[1])] + ["b"]
                 ).round(decimals),
@@ -25,7 +26,7 @@ def doolittle(A: list, b: list, decimals: int = 6):
             "solution": None,
             "logs": [{
                 "step": "Check",
-                "matrix": pd.DataFrame(
+                "matrix": Table(
                     np.column_stack((A, b)),
                     columns=[f"x{i+1}" for i in range(A.shape[1])] + ["b"]
                 ).round(decimals),
@@ -42,7 +43,7 @@ def doolittle(A: list, b: list, decimals: int = 6):
             "solution": None,
             "logs": [{
                 "step": "Check",
-                "matrix": pd.DataFrame(
+                "matrix": Table(
                     np.column_stack((A, b)),
                     columns=[f"x{i+1}" for i in range(n)] + ["b"]
                 ).round(decimals),
@@ -55,7 +56,7 @@ def doolittle(A: list, b: list, decimals: int = 6):
             "solution": None,
             "logs": [{
                 "step": "Check",
-                "matrix": pd.DataFrame(
+                "matrix": Table(
                     np.column_stack((A, b)),
                     columns=[f"x{i+1}" for i in range(n)] + ["b"]
                 ).round(decimals),
@@ -66,7 +67,7 @@ def doolittle(A: list, b: list, decimals: int = 6):
 
     logs.append({
         "step": "Initial",
-        "matrix": pd.DataFrame(
+        "matrix": Table(
             np.column_stack((A, b)),
             columns=[f"x{i+1}" for i in range(n)] + ["b"]
         ).round(decimals),
@@ -85,23 +86,21 @@ def doolittle(A: list, b: list, decimals: int = 6):
         # Calculate L elements for column i (below diagonal)
         for j in range(i + 1, n):
             if np.isclose(U[i, i], 0):
-                return {
-                    "solution": None,
-                    "logs": logs + [{
-                        "step": f"Step {i+1}",
-                        "matrix": pd.DataFrame(
-                            np.column_stack((A, b)),
-                            columns=[f"x{i+1}" for i in range(n)] + ["b"]
-                        ).round(decimals),
-                        "message": f"Zero pivot at U[{i},{i}]. Method fails."
-                    }]
-                }
+                logs.append({
+                    "step": f"Step {i+1}",
+                    "matrix": Table(
+                        np.column_stack((A, b)),
+                        columns=[f"x{i+1}" for i in range(n)] + ["b"]
+                    ).round(decimals),
+                    "message": f"Zero pivot at U[{i},{i}]. Method fails."
+                })
+                return {"solution": None, "logs": logs}
             L[j, i] = (A[j, i] - np.sum(L[j, :i] * U[:i, i])) / U[i, i]
 
         logs.append({
             "step": f"Step {i+1}",
-            "L": pd.DataFrame(L).round(decimals),
-            "U": pd.DataFrame(U).round(decimals),
+            "L": Table(L).round(decimals),
+            "U": Table(U).round(decimals),
             "message": f"Row {i+1} processed."
         })
 
@@ -113,26 +112,24 @@ def doolittle(A: list, b: list, decimals: int = 6):
     logs.append({
         "step": "Forward Substitution",
         "message": "Forward substitution complete (Ly = b).",
-        "y": pd.Series(y.round(decimals))
+        "y": Table(y.round(decimals))
     })
 
     # --- Backward substitution (Ux = y) ---
     x = np.zeros(n)
     for i in reversed(range(n)):
         if np.isclose(U[i, i], 0):
-            return {
-                "solution": None,
-                "logs": logs + [{
-                    "step": "Backward Substitution",
-                    "message": f"Zero diagonal element in U at position [{i},{i}]. System may be singular."
-                }]
-            }
+            logs.append({
+                "step": "Backward Substitution",
+                "message": f"Zero diagonal element in U at position [{i},{i}]. System may be singular."
+            })
+            return {"solution": None, "logs": logs}
         x[i] = (y[i] - np.dot(U[i, i+1:], x[i+1:])) / U[i, i]
 
     logs.append({
         "step": "Backward Substitution",
         "message": "Backward substitution complete (Ux = y).",
-        "x": pd.Series(x.round(decimals))
+        "x": Table(x.round(decimals))
     })
 
     return {
@@ -1,79 +1,104 @@
-from sympy import *
+import time
 
 from sympy import *
+from tools.history import IterationHistory
+
+# Variantes de regula falsi modificada: cuando el mismo extremo se conserva
+# dos iteraciones seguidas, su f se multiplica por m para que la siguiente
+# cuerda se acerque a la raíz por ese lado (f_old: f del extremo que se
+# reemplaza, f_new: f del nuevo punto).
+def _m_illinois(f_old, f_new):
+    return 0.5
+
+
+def _m_pegasus(f_old, f_new):
+    return f_old / (f_old + f_new)
+
+
+def _m_anderson_bjorck(f_old, f_new):
+    m = 1 - f_new / f_old
+    return m if m > 0 else 0.5
+
+
+VARIANTS = {
+    "classic": None,
+    "illinois": _m_illinois,
+    "pegasus": _m_pegasus,
+    "anderson_bjorck": _m_anderson_bjorck,
+}
 
-def false_position(f: str, a: float, b: float, nmax: int, last_n_rows: int, tolerance: float):
+
+def false_position(f: str, a: float, b: float, nmax: int, last_n_rows: int, tolerance: float, variant: str = "classic", trace_stride: int = 0):
     x = symbols("x")
     f_math = lambdify(x, sympify(f), "math")
 
-    # History containers
-    list_iter, list_a, list_b, list_root, list_fx, list_abs = [], [], [], [], [], []
+    t0 = time.perf_counter()
 
-    # Initial checks
-    if f_math(a) * f_math(b) > 0:
-        return {
-            "iterations": [],
-            "a_values": [],
-            "roots": [],
-            "b_values": [],
-            "fxm": [],
-            "errors": [],
-            "final_root": None,
-            "message": "Function does not change sign on the interval [a, b]"
+    # History: solo las últimas last_n_rows filas (<= 0: todas, como el antiguo [-n:])
+    history = IterationHistory(("iterations", "a_values", "roots", "b_values", "fxm", "errors"),
+                               tail=last_n_rows if last_n_rows > 0 else None, stride=trace_stride)
+
+    def answer(root, message):
+        result = {
+            **history.as_dict(),
+            "final_root": root,
+            "variant": variant,
+            "evaluations": evaluations,
+            "elapsed_ms": (time.perf_counter() - t0) * 1000.0,
+            "message": message
         }
+        if trace_stride:
+            result["trace"] = history.trace()
+        return result
+
+    evaluations = 0
+    if variant not in VARIANTS:
+        return answer(None, f"Unknown variant '{variant}', expected one of: {', '.join(VARIANTS)}")
+    scale = VARIANTS[variant]
+
+    # f(a) y f(b) se evalúan una vez y se arrastran entre iteraciones
+    fa, fb = f_math(a), f_math(b)
+    evaluations = 2
+
+    # Initial checks
+    if fa * fb > 0:
+        return answer(None, "Function does not change sign on the interval [a, b]")
 
     x0 = a
+    kept = None  # extremo conservado en la iteración anterior ("a" o "b")
     for i in range(nmax):
-        fa, fb = f_math(a), f_math(b)
-
         # Compute the false position
         root = b - fb * (b - a) / (fb - fa)
         f_root = f_math(root)
+        evaluations += 1
         abs_error = abs(root - x0)
 
         # Save iteration data
-        list_iter.append(i + 1)
-        list_a.append(a)
-        list_b.append(b)
-        list_root.append(root)
-        list_fx.append(f_root)
-        list_abs.append(abs_error)
+        history.append(i + 1, a, root, b, f_root, abs_error)
 
         # Check tolerance
         if abs_error < tolerance or f_root == 0:
-            return {
-                "iterations": list_iter[-last_n_rows:],
-                "a_values": list_a[-last_n_rows:],
-                "roots": list_root[-last_n_rows:],
-                "b_values": list_b[-last_n_rows:],
-                "fxm": list_fx[-last_n_rows:],
-                "errors": list_abs[-last_n_rows:],
-                "final_root": root,
-                "message": "Convergence, tolerance satisfied"
-            }
+            return answer(root, "Convergence, tolerance satisfied")
 
         # Update interval
         if fa * f_root < 0:
-            b = root
+            if scale is not None and kept == "a":
+                fa *= scale(fb, f_root)
+            b, fb = root, f_root
+            kept = "a"
         else:
-            a = root
+            if scale is not None and kept == "b":
+                fb *= scale(fa, f_root)
+            a, fa = root, f_root
+            kept = "b"
 
         x0 = root
 
-    return {
-        "iterations": list_iter[-last_n_rows:],
-        "a_values": list_a[-last_n_rows:],
-        "roots": list_root[-last_n_rows:],
-        "b_values": list_b[-last_n_rows:],
-        "fxm": list_fx[-last_n_rows:],
-        "errors": list_abs[-last_n_rows:],
-        "final_root": root,
-        "message": "Max iterations reached"
-    }
+    return answer(root, "Max iterations reached")
 
 
 
-def false_position_controller(function: str, a: float, b: float, nmax: int, last_n_rows: int, tolerance: float):
+def false_position_controller(function: str, a: float, b: float, nmax: int, last_n_rows: int, tolerance: float, variant: str = "classic", trace_stride: int = 0):
     # Debug prints
     print("=== Parameters received in false_position_controller ===")
     print(f"function: {function}")
@@ -84,6 +109,6 @@ def false_position_controller(function: str, a: float, b: float, nmax: int, last
     print(f"tolerance: {tolerance}")
     print("=======================================================")
 
-    answer = false_position(function, a, b, nmax, last_n_rows, tolerance)
+    answer = false_position(function, a, b, nmax, last_n_rows, tolerance, variant, trace_stride)
 
     return answer
@@ -14,11 +14,16 @@ from dataclasses import dataclass
 import math
 import re
 import io, base64
+from functools import lru_cache
 
 import numpy as np
 import matplotlib
 matplotlib.use("Agg")          # headless rendering on server
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+
+from tools.history import IterationHistory
 
 # === Turn expression strings into safe f(x) callables ===
 _ALLOWED = {
@@ -30,33 +35,238 @@ _ALLOWED = {
     "sqrt": math.sqrt, "abs": abs, "floor": math.floor, "ceil": math.ceil,
     "pow": pow
 }
+# Same names, but NumPy ufuncs: lets one eval() cover a whole grid of x values
+_ALLOWED_NP = {
+    "pi": np.pi, "e": np.e, "E": np.e,
+    "sin": np.sin, "cos": np.cos, "tan": np.tan,
+    "asin": np.arcsin, "acos": np.arccos, "atan": np.arctan,
+    "sinh": np.sinh, "cosh": np.cosh, "tanh": np.tanh,
+    "exp": np.exp, "log": np.log, "log10": np.log10,
+    "sqrt": np.sqrt, "abs": np.abs, "floor": np.floor, "ceil": np.ceil,
+    "pow": np.power
+}
 _VAR_PATTERN = re.compile(r"\bx\b")
 
+# === Forward-mode automatic differentiation (dual numbers) ===
+class Dual:
+    """
+    a + b·ε with ε² = 0: carries f(x) in `val` and f'(x) in `der`.
+    Evaluating an expression at Dual(x, 1.0) yields f and f' in one pass,
+    exactly (no step size, no cancellation).
+    """
+    __slots__ = ("val", "der")
+
+    def __init__(self, val: float, der: float = 0.0):
+        self.val = val
+        self.der = der
+
+    def __repr__(self) -> str:
+        return f"Dual({self.val!r}, {self.der!r})"
+
+    def __add__(self, o):
+        if isinstance(o, Dual):
+            return Dual(self.val + o.val, self.der + o.der)
+        return Dual(self.val + o, self.der)
+    __radd__ = __add__
+
+    def __sub__(self, o):
+        if isinstance(o, Dual):
+            return Dual(self.val - o.val, self.der - o.der)
+        return Dual(self.val - o, self.der)
+
+    def __rsub__(self, o):
+        return Dual(o - self.val, -self.der)
+
+    def __mul__(self, o):
+        if isinstance(o, Dual):
+            return Dual(self.val * o.val, self.der * o.val + self.val * o.der)
+        return Dual(self.val * o, self.der * o)
+    __rmul__ = __mul__
+
+    def __truediv__(self, o):
+        if isinstance(o, Dual):
+            return Dual(self.val / o.val, (self.der * o.val - self.val * o.der) / (o.val * o.val))
+        return Dual(self.val / o, self.der / o)
+
+    def __rtruediv__(self, o):
+        return Dual(o / self.val, -o * self.der / (self.val * self.val))
+
+    def __pow__(self, o):
+        if isinstance(o, Dual):
+            # d(u^v) = u^v · (v'·ln u + v·u'/u)
+            p = self.val ** o.val
+            return Dual(p, p * (o.der * math.log(self.val) + o.val * self.der / self.val))
+        if o == 0:
+            return Dual(1.0, 0.0)
+        return Dual(self.val ** o, o * self.val ** (o - 1) * self.der)
+
+    def __rpow__(self, o):
+        if o <= 0:
+            # c^u con c <= 0 no tiene derivada real: make_newton_g_from_f usa la numérica
+            raise ValueError("d/dx c**u is undefined for c <= 0")
+        p = o ** self.val
+        return Dual(p, p * math.log(o) * self.der)
+
+    def __neg__(self):
+        return Dual(-self.val, -self.der)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return Dual(abs(self.val), math.copysign(1.0, self.val) * self.der)
+
+    # Comparaciones por el valor: en expresiones por tramos se toma la rama
+    # de x y la derivada es la de esa rama
+    def __eq__(self, o):
+        return self.val == (o.val if isinstance(o, Dual) else o)
+
+    def __ne__(self, o):
+        return self.val != (o.val if isinstance(o, Dual) else o)
+
+    def __lt__(self, o):
+        return self.val < (o.val if isinstance(o, Dual) else o)
+
+    def __le__(self, o):
+        return self.val <= (o.val if isinstance(o, Dual) else o)
+
+    def __gt__(self, o):
+        return self.val > (o.val if isinstance(o, Dual) else o)
+
+    def __ge__(self, o):
+        return self.val >= (o.val if isinstance(o, Dual) else o)
+
+    def __hash__(self):
+        return hash(self.val)
+
+def _lift(fun: Callable[[float], float], dfun: Callable[[float], float]) -> Callable:
+    """Chain rule: fun(u) → Dual(fun(u), fun'(u)·u')."""
+    def lifted(u):
+        if isinstance(u, Dual):
+            return Dual(fun(u.val), dfun(u.val) * u.der)
+        return fun(u)
+    return lifted
+
+def _dual_log(u, base=None):
+    out = _lift(math.log, lambda v: 1.0 / v)(u)
+    return out / math.log(base) if base is not None else out
+
+def _dual_pow(u, v):
+    return u ** v
+
+def _dual_step(fun: Callable[[float], float]) -> Callable:
+    # piecewise constant: derivative 0 (where it exists)
+    return lambda u: fun(u.val) if isinstance(u, Dual) else fun(u)
+
+_ALLOWED_DUAL = {
+    "pi": math.pi, "e": math.e, "E": math.e,
+    "sin": _lift(math.sin, math.cos),
+    "cos": _lift(math.cos, lambda v: -math.sin(v)),
+    "tan": _lift(math.tan, lambda v: 1.0 / math.cos(v) ** 2),
+    "asin": _lift(math.asin, lambda v: 1.0 / math.sqrt(1.0 - v * v)),
+    "acos": _lift(math.acos, lambda v: -1.0 / math.sqrt(1.0 - v * v)),
+    "atan": _lift(math.atan, lambda v: 1.0 / (1.0 + v * v)),
+    "sinh": _lift(math.sinh, math.cosh),
+    "cosh": _lift(math.cosh, math.sinh),
+    "tanh": _lift(math.tanh, lambda v: 1.0 - math.tanh(v) ** 2),
+    "exp": _lift(math.exp, math.exp),
+    "log": _dual_log,
+    "log10": _lift(math.log10, lambda v: 1.0 / (v * math.log(10.0))),
+    "sqrt": _lift(math.sqrt, lambda v: 0.5 / math.sqrt(v)),
+    "abs": abs, "floor": _dual_step(math.floor), "ceil": _dual_step(math.ceil),
+    "pow": _dual_pow
+}
+
+def value_and_derivative(f: Callable[[float], float], x: float) -> Tuple[float, float]:
+    """
+    (f(x), f'(x)) in a single evaluation through f's `dual` variant
+    (see compile_expr). Raises AttributeError if f has none.
+    """
+    out = f.dual(Dual(float(x), 1.0))
+    if isinstance(out, Dual):
+        return float(out.val), float(out.der)
+    return float(out), 0.0   # constant expression
+
 def _sanitize(expr: str) -> str:
     """Light normalization (e.g., ^ → **)."""
     expr = expr.strip()
     expr = expr.replace("^", "**")
     return expr
 
+def _build_function(s: str, names: Dict[str, Any], to_float: bool) -> Callable:
+    """
+    Turn the (already validated) expression into a real function object,
+    once. The whitelisted names live in the function's own globals, so a
+    call is a plain Python call: no dict copy and no eval() per evaluation.
+    """
+    namespace = {"__builtins__": {}, "_float_": float}
+    namespace.update(names)
+    body = f"_float_({s})" if to_float else f"({s})"
+    return eval(f"lambda x: {body}", namespace)
+
+@lru_cache(maxsize=256)
+def _compile_cached(s: str) -> Callable[[float], float]:
+    f = _build_function(s, _ALLOWED, to_float=True)
+    f.vectorized = _build_function(s, _ALLOWED_NP, to_float=False)
+    f.dual = _build_function(s, _ALLOWED_DUAL, to_float=False)
+    return f
+
 def compile_expr(expr_str: str) -> Tuple[Callable[[float], float], str]:
     """
     Given e.g. 'cos(x)+x**2', returns:
       (callable f(x), normalized_expression)
+    The callable also carries:
+      - `f.vectorized`: the same expression over NumPy ufuncs, for array
+        inputs (may return NaN/inf on domain errors);
+      - `f.dual`: the same expression over dual numbers, used by
+        value_and_derivative to get f and f' in one pass.
     Raises ValueError if the expression fails to compile.
     """
     s = _sanitize(expr_str)
     try:
-        code = compile(s, "<expr>", "eval")
+        # validates that s is exactly one expression before wrapping it
+        compile(s, "<expr>", "eval")
     except Exception as e:
         # Mensaje en español
         raise ValueError(f"Expresión inválida: {expr_str!r} → {e}")
 
-    def f(x: float) -> float:
-        env = dict(_ALLOWED)
-        env["x"] = x
-        return float(eval(code, {"__builtins__": {}}, env))
+    return _compile_cached(s), s
+
+# función auxiliar segura (evita errores de dominio)
+def _safe_eval(fun: Callable[[float], float], v: float) -> float:
+    try:
+        return float(fun(v))
+    except Exception:
+        return float("nan")
+
+def _eval_vectorized(fun: Callable[[float], float], xs: np.ndarray) -> np.ndarray:
+    """
+    Evaluate `fun` over an array in one call through its `vectorized` variant;
+    point-by-point (NaN on errors) if it has none or the vectorized pass fails.
+    """
+    vec = getattr(fun, "vectorized", None)
+    if vec is not None:
+        try:
+            with np.errstate(all="ignore"):
+                ys = np.asarray(vec(xs), dtype=float)
+            # constant expressions (e.g. g(x) = 2) come back as scalars
+            return np.array(np.broadcast_to(ys, xs.shape), dtype=float)
+        except Exception:
+            pass
+    return np.array([_safe_eval(fun, v) for v in xs], dtype=float)
 
-    return f, s
+# === Vectorized sampling over a grid (for plots) ===
+def sample_expr(expr_str: str, xs: np.ndarray) -> np.ndarray:
+    """
+    Evaluate the expression on a whole array of x values in a single call,
+    using the NumPy variant produced by compile_expr.
+    Domain errors (sqrt/log of negatives, overflow, ...) become NaN instead of
+    raising. Falls back to point-by-point evaluation if the vectorized pass fails.
+    """
+    fun, _ = compile_expr(expr_str)
+    ys = _eval_vectorized(fun, np.asarray(xs, dtype=float))
+    ys[~np.isfinite(ys)] = np.nan
+    return ys
 
 # === Central numerical derivative: f'(x) ≈ (f(x+h)-f(x-h))/(2h) ===
 def d_numeric(f: Callable[[float], float], h: float = 1e-6) -> Callable[[float], float]:
@@ -70,19 +280,45 @@ def make_newton_g_from_f(f: Callable[[float], float], h: float = 1e-6) -> Callab
     """
     If user provides f(x) but not g(x), generate:
       g(x) = x - f(x)/f'(x)
-    using a numerical derivative. This enables fixed-point iteration
-    “Newton-style” without asking for a symbolic derivative.
+    This enables fixed-point iteration “Newton-style” without asking for a
+    symbolic derivative. When f comes from compile_expr, f and f' are taken
+    from one dual-number evaluation (exact derivative, one pass per step);
+    otherwise f' falls back to a central difference. The fallback is also
+    used, for that evaluation only, when the dual one fails (%, //, c**x
+    with c <= 0 ...).
+    If f has a `vectorized` variant (see compile_expr), g gets one too
+    (NaN where f'(x) ≈ 0).
     """
     df = d_numeric(f, h=h)
+    use_dual = getattr(f, "dual", None) is not None
+
+    def fdf(x: float) -> Tuple[float, float]:
+        if use_dual:
+            try:
+                return value_and_derivative(f, x)
+            except (TypeError, ValueError, ArithmeticError):
+                # Solo en este x (p. ej. c**x con c <= 0): el siguiente vuelve a intentar
+                pass
+        return f(x), df(x)
+
     def g(x: float) -> float:
-        dfx = df(x)
+        fx, dfx = fdf(x)
         if abs(dfx) < 1e-14:
             # Mensaje en español
             raise ZeroDivisionError(
                 "f'(x) es aproximadamente 0 en make_newton_g_from_f; "
                 "no se puede construir g(x)."
             )
-        return x - f(x) / dfx
+        return x - fx / dfx
+
+    f_vec = getattr(f, "vectorized", None)
+    if f_vec is not None:
+        def g_vec(x: np.ndarray) -> np.ndarray:
+            x = np.asarray(x, dtype=float)
+            with np.errstate(all="ignore"):
+                dfx = (f_vec(x + h) - f_vec(x - h)) / (2.0 * h)
+                return np.where(np.abs(dfx) < 1e-14, np.nan, x - f_vec(x) / dfx)
+        g.vectorized = g_vec
     return g
 
 # === Core fixed-point iteration (logic mostly unchanged, pero con try/except) ===
@@ -92,49 +328,163 @@ def fixed_point_full(
     tol: float = 1e-6,
     nmax: int = 100,
     f: Optional[Callable[[float], float]] = None,
-    use_relative_error: bool = False
+    use_relative_error: bool = False,
+    tail: Optional[int] = None,
+    progress: Optional[Callable[[int, float, float], None]] = None
 ) -> Tuple[List[Tuple[int, float, float, Optional[float], float]], float]:
     """
     Iterate x_{i+1} = g(x_i) until tolerance is met or nmax is reached.
 
     Returns:
-      - rows: list of (i, x_i, g(x_i), f(x_i) or None, error_i)
+      - rows: list of (i, x_i, g(x_i), f(x_i) or None, error_i); only the
+        last `tail` rows when tail > 0 (all of them by default)
       - x_last: last value (final approximation)
+
+    f(x_i) is only informative, so when f has a `vectorized` variant the
+    whole column is computed in one call after the loop.
+    `progress(i, error_i, g(x_i))`, if given, is called every iteration.
     """
-    rows: List[Tuple[int, float, float, Optional[float], float]] = []
+    history = IterationHistory(("i", "x", "gx", "fx", "E"), tail=tail)
     xi = float(x0)
+    f_vec = getattr(f, "vectorized", None) if f is not None else None
 
     for i in range(nmax):
         # g(x_i)
-        try:
-            gxi = float(g(xi))
-        except Exception as e:
-            raise ValueError(f"Error al evaluar g(x) en x={xi}: {e}")
+        gxi = _eval_g_checked(g, xi)
 
         # f(x_i) opcional
-        if f is not None:
-            try:
-                fxi = float(f(xi))
-            except Exception as e:
-                raise ValueError(f"Error al evaluar f(x) en x={xi}: {e}")
+        if f is not None and f_vec is None:
+            fxi = _eval_f_checked(f, xi)
         else:
             fxi = None
 
-        if use_relative_error:
-            denom = max(1.0, abs(gxi))
-            Ei = abs(gxi - xi) / denom
-        else:
-            Ei = abs(gxi - xi)
+        Ei = _step_error(gxi, xi, use_relative_error)
 
-        rows.append((i, xi, gxi, fxi, Ei))
+        history.append(i, xi, gxi, fxi, Ei)
+        if progress is not None:
+            progress(i, Ei, gxi)
 
         if Ei <= tol:
             xi = gxi
             break
         xi = gxi
 
+    rows = history.rows()
+    if f_vec is not None:
+        rows = _fill_f_column(rows, f)
+
     return rows, xi
 
+def _eval_f_checked(f: Callable[[float], float], x: float) -> float:
+    try:
+        return float(f(x))
+    except Exception as e:
+        raise ValueError(f"Error al evaluar f(x) en x={x}: {e}")
+
+def _eval_g_checked(g: Callable[[float], float], x: float) -> float:
+    try:
+        return float(g(x))
+    except Exception as e:
+        raise ValueError(f"Error al evaluar g(x) en x={x}: {e}")
+
+def _fill_f_column(rows: List[tuple], f: Callable[[float], float]) -> List[tuple]:
+    """Fill position 3 (f(x_i)) of every row with one vectorized call."""
+    if not rows:
+        return rows
+    xs = np.fromiter((r[1] for r in rows), dtype=float, count=len(rows))
+    fxs = _eval_vectorized(f, xs)
+    return [
+        r[:3] + (float(fx) if math.isfinite(fx) else _eval_f_checked(f, r[1]),) + r[4:]
+        for r, fx in zip(rows, fxs)
+    ]
+
+def _step_error(new: float, old: float, use_relative_error: bool) -> float:
+    if use_relative_error:
+        return abs(new - old) / max(1.0, abs(new))
+    return abs(new - old)
+
+# === Accelerated fixed-point iteration (Aitken Δ² / Steffensen) ===
+ACCELERATIONS = ("none", "aitken", "steffensen")
+
+def fixed_point_accelerated(
+    g: Callable[[float], float],
+    x0: float,
+    tol: float = 1e-6,
+    nmax: int = 100,
+    f: Optional[Callable[[float], float]] = None,
+    use_relative_error: bool = False,
+    method: str = "steffensen",
+    tail: Optional[int] = None
+) -> Tuple[List[Tuple[int, float, float, Optional[float], float, float]], float, int]:
+    """
+    Same contract as fixed_point_full, with an extrapolated estimate per row.
+
+    - "aitken":     runs the plain sequence x_{n+1} = g(x_n) and applies
+                    Δ² to each triple: x̂_n = x_n - (Δx_n)² / Δ²x_n.
+                    One g evaluation per step; error is |x̂_n - x̂_{n-1}|.
+    - "steffensen": restarts from the extrapolated value every step:
+                    x_{n+1} = x_n - (g(x_n)-x_n)² / (g(g(x_n)) - 2g(x_n) + x_n).
+                    Two g evaluations per step, quadratic convergence.
+    If Δ²x_n = 0 the plain value is used instead of dividing by zero.
+
+    Returns:
+      - rows: list of (i, x_i, g(x_i), f(x_i) or None, error_i, x̂_i)
+        (last `tail` rows when tail > 0)
+      - x_last: final approximation
+      - g_evals: number of g evaluations performed
+    """
+    if method not in ("aitken", "steffensen"):
+        raise ValueError(f"Aceleración desconocida: {method!r}")
+
+    history = IterationHistory(("i", "x", "gx", "fx", "E", "x_hat"), tail=tail)
+    f_vec = getattr(f, "vectorized", None) if f is not None else None
+    g_evals = 0
+
+    def fx_of(x: float) -> Optional[float]:
+        return _eval_f_checked(f, x) if f is not None and f_vec is None else None
+
+    if method == "steffensen":
+        xi = float(x0)
+        for i in range(nmax):
+            g1 = _eval_g_checked(g, xi)
+            g2 = _eval_g_checked(g, g1)
+            g_evals += 2
+            d2 = g2 - 2.0 * g1 + xi
+            x_next = xi - (g1 - xi) ** 2 / d2 if d2 != 0 else g2
+
+            Ei = _step_error(x_next, xi, use_relative_error)
+            history.append(i, xi, g1, fx_of(xi), Ei, x_next)
+            xi = x_next
+            if Ei <= tol:
+                break
+    else:
+        # sliding window over the plain sequence: (x_n, x_{n+1}, x_{n+2})
+        a = float(x0)
+        b = _eval_g_checked(g, a)
+        c = _eval_g_checked(g, b)
+        g_evals += 2
+        prev = a
+        xi = a
+        for i in range(nmax):
+            d2 = c - 2.0 * b + a
+            x_hat = a - (b - a) ** 2 / d2 if d2 != 0 else c
+
+            Ei = _step_error(x_hat, prev, use_relative_error)
+            history.append(i, a, b, fx_of(a), Ei, x_hat)
+            xi = x_hat
+            if Ei <= tol or i == nmax - 1:
+                break
+            prev = x_hat
+            a, b = b, c
+            c = _eval_g_checked(g, c)
+            g_evals += 1
+
+    rows = history.rows()
+    if f_vec is not None:
+        rows = _fill_f_column(rows, f)
+
+    return rows, xi, g_evals
+
 # === Web layer: prepare data for the template (same contract) ===
 @dataclass
 class PFStep:
@@ -144,20 +494,22 @@ class PFStep:
     gx: float
     fx: Optional[float]
     err: float
+    acc: Optional[float] = None   # extrapolated x̂ (only with acceleration)
 
-def _cobweb_lines(steps: List[PFStep]) -> List[tuple]:
+def _cobweb_lines(path: Tuple[Tuple[float, float], ...]) -> List[tuple]:
     """
-    Produce “cobweb” line segments to visualize the iteration:
+    Produce “cobweb” line segments to visualize the iteration
+    from the (x_i, g(x_i)) pairs:
       - vertical:   (x_i, x_i) → (x_i, g(x_i))
       - horizontal: (x_i, g(x_i)) → (g(x_i), g(x_i))
     Purely visual; does not affect computation.
     """
     segs = []
-    if not steps:
+    if not path:
         return segs
-    for s in steps:
-        segs.append((s.x, s.x, s.x, s.gx))   # vertical
-        segs.append((s.x, s.gx, s.gx, s.gx)) # horizontal
+    for x, gx in path:
+        segs.append(((x, x), (x, gx)))   # vertical
+        segs.append(((x, gx), (gx, gx))) # horizontal
     return segs
 
 def _plot_base64(
@@ -174,39 +526,45 @@ def _plot_base64(
       - cobweb lines to illustrate the iteration path
     Returns a data URL (base64) ready for <img src="...">.
     """
+    path = tuple((s.x, s.gx) for s in steps) if steps else ()
+    return _render_plot_cached(f_str or None, g_str, float(x_star), float(span), path)
 
-    # función auxiliar segura (evita errores de dominio)
-    def _safe_eval(fun: Callable[[float], float], v: float) -> float:
-        try:
-            return float(fun(v))
-        except Exception:
-            return float("nan")
-
+@lru_cache(maxsize=64)
+def _render_plot_cached(
+    f_str: Optional[str],
+    g_str: str,
+    x_star: float,
+    span: float,
+    path: Tuple[Tuple[float, float], ...]
+) -> str:
+    """
+    Cached by (g, f, x*, span, cobweb path): re-submitting the same problem
+    skips sampling and rendering entirely.
+    Uses the object-oriented Figure API (no pyplot global state), so it can
+    run on worker threads.
+    """
     xmin, xmax = x_star - span, x_star + span
     xs = np.linspace(xmin, xmax, 500)
 
-    g_fun, _ = compile_expr(g_str)
-    f_fun = None
-    if f_str:
-        f_fun, _ = compile_expr(f_str)
-
-    g_vals = np.array([_safe_eval(g_fun, v) for v in xs])
-    y_eq_x = xs.copy()
+    g_vals = sample_expr(g_str, xs)
+    y_eq_x = xs
 
-    fig, ax = plt.subplots(figsize=(6.6, 4.2), dpi=160)
+    fig = Figure(figsize=(6.6, 4.2), dpi=160)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
     ax.set_facecolor("#fafafa")
 
     # Main curves
     ax.plot(xs, g_vals, linewidth=2.4, label="g(x)")
     ax.plot(xs, y_eq_x, linestyle="--", linewidth=1.6, label="y = x")
-    if f_fun is not None:
-        f_vals = np.array([_safe_eval(f_fun, v) for v in xs])
+    if f_str:
+        f_vals = sample_expr(f_str, xs)
         ax.plot(xs, f_vals, linestyle=":", linewidth=1.8, label="f(x)")
 
-    # Cobweb (if steps provided)
-    if steps:
-        for (x0, y0, x1, y1) in _cobweb_lines(steps):
-            ax.plot([x0, x1], [y0, y1], linewidth=1.1)
+    # Cobweb (if steps provided): one collection instead of one plot() per segment
+    if path:
+        ax.add_collection(LineCollection(_cobweb_lines(path), linewidths=1.1, colors="C3"))
+        ax.autoscale_view()
 
     # Marker at the final approximation
     ax.axvline(x_star, linestyle="--", linewidth=1.1)
@@ -222,9 +580,12 @@ def _plot_base64(
     fig.tight_layout()
     buf = io.BytesIO()
     fig.savefig(buf, format="png")
-    plt.close(fig)
     return "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode("ascii")
 
+# Filas (las últimas) que la vista recibe y dibuja; con max_iter grande el
+# historial completo haría enorme la respuesta y el gráfico
+WEB_MAX_ROWS = 1000
+
 # ---- núcleo original de run_fixed_point_web (sin manejo de errores) ----
 def _run_fixed_point_web_core(
     g_text: Optional[str],
@@ -233,8 +594,13 @@ def _run_fixed_point_web_core(
     tol: float = 1e-6,
     max_iter: int = 100,
     use_relative_error: bool = False,
-    plot_span: float = 5.0
+    plot_span: float = 5.0,
+    acceleration: str = "none"
 ) -> Dict[str, Any]:
+    acceleration = (acceleration or "none").strip().lower()
+    if acceleration not in ACCELERATIONS:
+        raise ValueError(f"Aceleración desconocida: {acceleration!r} (usa none, aitken o steffensen).")
+
     g_fun = None
     f_fun = None
     g_str = (g_text or "").strip()
@@ -253,12 +619,43 @@ def _run_fixed_point_web_core(
         # Mensaje en español
         raise ValueError("Debes proporcionar g(x) o f(x).")
 
-    rows, x_last = fixed_point_full(
-        g_fun, x0, tol=tol, nmax=max_iter, f=f_fun, use_relative_error=use_relative_error
-    )
+    accel_info = None
+    if acceleration == "none":
+        rows, x_last = fixed_point_full(
+            g_fun, x0, tol=tol, nmax=max_iter, f=f_fun, use_relative_error=use_relative_error,
+            tail=WEB_MAX_ROWS
+        )
+    else:
+        # Corrida simple solo como referencia del ahorro (puede fallar si diverge);
+        # basta con la última fila: su índice da el número de iteraciones
+        try:
+            plain_rows, _ = fixed_point_full(
+                g_fun, x0, tol=tol, nmax=max_iter, use_relative_error=use_relative_error, tail=1
+            )
+            plain_iters: Optional[int] = plain_rows[-1][0] + 1 if plain_rows else 0
+            plain_converged = bool(plain_rows) and (plain_rows[-1][4] <= tol)
+        except ValueError:
+            plain_iters, plain_converged = None, False
+
+        rows, x_last, g_evals = fixed_point_accelerated(
+            g_fun, x0, tol=tol, nmax=max_iter, f=f_fun,
+            use_relative_error=use_relative_error, method=acceleration, tail=WEB_MAX_ROWS
+        )
+        # Solo quedan las últimas filas: el índice de la última da las iteraciones
+        iterations = rows[-1][0] + 1 if rows else 0
+        accel_info = {
+            "method": acceleration,
+            "iterations": iterations,
+            "g_evals": g_evals,
+            "plain_iterations": plain_iters,
+            "plain_g_evals": plain_iters,
+            "plain_converged": plain_converged,
+            "iterations_saved": None if plain_iters is None else plain_iters - iterations,
+            "g_evals_saved": None if plain_iters is None else plain_iters - g_evals,
+        }
 
     steps: List[PFStep] = [
-        PFStep(i=i, x=xi, gx=gxi, fx=fxi, err=Ei) for (i, xi, gxi, fxi, Ei) in rows
+        PFStep(*row) for row in rows
     ]
 
     plot_url = _plot_base64(
@@ -282,14 +679,51 @@ def _run_fixed_point_web_core(
         "converged": converged,
         "reason": reason,
         "x_final": float(x_last),
+        "acceleration": accel_info,
         "form_echo": {
             "g": g_str,
             "f": f_str,
             "x0": x0, "tol": tol, "max_iter": max_iter,
-            "use_relative_error": use_relative_error
+            "use_relative_error": use_relative_error,
+            "acceleration": acceleration
         }
     }
 
+# === Streaming entry point: no table/plot, only progress + final value ===
+def run_fixed_point_progress(
+    g_text: Optional[str],
+    f_text: Optional[str],
+    x0: float,
+    tol: float,
+    max_iter: int,
+    use_relative_error: bool,
+    progress: Callable[[int, float, float], None]
+) -> Dict[str, Any]:
+    """
+    Same iteration as run_fixed_point_web, for long runs: keeps only the
+    last row and reports each step through `progress`. Raises ValueError
+    on bad input (the stream turns it into an "error" event).
+    """
+    g_str = (g_text or "").strip()
+    f_str = (f_text or "").strip()
+    g_fun = compile_expr(g_str)[0] if g_str else None
+    f_fun = compile_expr(f_str)[0] if f_str else None
+    if g_fun is None and f_fun is not None:
+        g_fun = make_newton_g_from_f(f_fun)
+    if g_fun is None:
+        raise ValueError("Debes proporcionar g(x) o f(x).")
+
+    rows, x_last = fixed_point_full(
+        g_fun, x0, tol=tol, nmax=max_iter, use_relative_error=use_relative_error,
+        tail=1, progress=progress
+    )
+    converged = bool(rows) and (rows[-1][4] <= tol)
+    return {
+        "x_final": float(x_last),
+        "iterations": rows[-1][0] + 1 if rows else 0,
+        "converged": converged,
+    }
+
 # === Web entry point with error handling (lo que debe usar tu endpoint) ===
 def run_fixed_point_web(
     g_text: Optional[str],
@@ -298,12 +732,15 @@ def run_fixed_point_web(
     tol: float = 1e-6,
     max_iter: int = 100,
     use_relative_error: bool = False,
-    plot_span: float = 5.0
+    plot_span: float = 5.0,
+    acceleration: str = "none"
 ) -> Dict[str, Any]:
     """
     Igual que antes, pero ya NO lanza excepciones hacia afuera.
     Devuelve un dict:
       - en caso OK: las mismas llaves de siempre (plot_data_url, steps, ...)
+        y "acceleration": None, o con acceleration="aitken"/"steffensen"
+        el resumen de iteraciones y evaluaciones de g frente a la corrida simple
       - en caso de error: {"error": "...mensaje en español..."}
     """
     try:
@@ -313,6 +750,7 @@ def run_fixed_point_web(
             max_iter=max_iter,
             use_relative_error=use_relative_error,
             plot_span=plot_span,
+            acceleration=acceleration,
         )
     except ValueError as ve:
         # Errores de usuario (expresión mala, dominio, etc.) en ESPAÑOL
@@ -1,9 +1,12 @@
 import numpy as np
 
-def gauss_seidel(A: list, b: list, tolerance: float, x_0: list, n_max: int, decimals: int = 6, norma = "inf"):
-    A = np.array(A, dtype=float)
-    b = np.array(b, dtype=float)
-    x_0 = np.array(x_0, dtype=float)
+def gauss_seidel(A: list, b: list, tolerance: float, x_0: list, n_max: int, decimals: int = 6, norma = "inf",
+                 progress=None, keep_logs: bool = True):
+    # progress(iteration, error, x): optional per-iteration hook (streaming);
+    # keep_logs=False skips the per-iteration log entries.
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    x_0 = np.asarray(x_0, dtype=float)
     n = len(b)
     logs = []
 
@@ -66,11 +69,14 @@ def gauss_seidel(A: list, b: list, tolerance: float, x_0: list, n_max: int, deci
 
         # error = np.linalg.norm(x_new - x, ord=2)
         error = _vec_norm(x_new - x, norma)
-        logs.append({
-            "step": f"Iteration {iteration}",
-            "x": np.round(x_new, decimals).tolist(),
-            "error": round(error, decimals)
-        })
+        if keep_logs:
+            logs.append({
+                "step": f"Iteration {iteration}",
+                "x": np.round(x_new, decimals).tolist(),
+                "error": round(error, decimals)
+            })
+        if progress is not None:
+            progress(iteration, error, x_new)
 
         if error < tolerance:
             return {
@@ -1,18 +1,20 @@
 import numpy as np
-import pandas as pd
+from tools.tables import Table
 
-def gauss_simple(A: list, b: list, decimals: int = 6):
-    A = np.array(A, dtype=float)
-    b = np.array(b, dtype=float)
-    logs = []
+def gauss_simple(A: list, b: list, decimals: int = 6, logs: list = None):
+    # Sin copia si ya es float64: A y b se modifican en sitio (la ruta los crea para esta llamada)
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    # logs: lista (por defecto) o un StepLog que envía cada paso en streaming
+    logs = [] if logs is None else logs
 
     if A.shape[0] != A.shape[1]:
         return {
             "solution": None,
             "logs": [{
                 "step": "Check",
-                "A": pd.DataFrame(A).round(decimals),
-                "b": pd.Series(b).round(decimals),
+                "A": Table(A).round(decimals),
+                "b": Table(b).round(decimals),
                 "message": f"Matrix A must be square. Received {A.shape[0]}x{A.shape[1]}."
             }]
         }
@@ -22,8 +24,8 @@ def gauss_simple(A: list, b: list, decimals: int = 6):
             "solution": None,
             "logs": [{
                 "step": "Check",
-                "A": pd.DataFrame(A).round(decimals),
-                "b": pd.Series(b).round(decimals),
+                "A": Table(A).round(decimals),
+                "b": Table(b).round(decimals),
                 "message": f"The size of vector b ({len(b)}) does not match the number of rows in A ({A.shape[0]})."
             }]
         }
@@ -39,8 +41,8 @@ def gauss_simple(A: list, b: list, decimals: int = 6):
         "solution": None,
         "logs": [{
             "step": "Check",
-            "A": pd.DataFrame(A).round(decimals),
-            "b": pd.Series(b).round(decimals),
+            "A": Table(A).round(decimals),
+            "b": Table(b).round(decimals),
             "message": "det(A) = 0. The matrix is singular. The system may have no unique solution or the system does not have solution."
         }]
     }
@@ -50,8 +52,8 @@ def gauss_simple(A: list, b: list, decimals: int = 6):
         "solution": None,
         "logs": [{
             "step": "Check",
-            "A": pd.DataFrame(A).round(decimals),
-            "b": pd.Series(b).round(decimals),
+            "A": Table(A).round(decimals),
+            "b": Table(b).round(decimals),
             "message": f"det(A) ≈ {det:.2e}, the system is ill-conditioned and may present numerical instability."
         }]
     }
@@ -59,7 +61,7 @@ def gauss_simple(A: list, b: list, decimals: int = 6):
 
     logs.append({
         "step": "Initial",
-        "matrix": pd.DataFrame(np.column_stack((A, b)), 
+        "matrix": Table(np.column_stack((A, b)), 
                                columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
         "message": f"Initial system. Determinant = {det:.4f}"
     })
@@ -71,7 +73,7 @@ def gauss_simple(A: list, b: list, decimals: int = 6):
         if pivot == 0:
             logs.append({
                 "step": f"Iteration {k+1}",
-                "matrix": pd.DataFrame(np.column_stack((A, b)),
+                "matrix": Table(np.column_stack((A, b)),
                                        columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
                 "message": f"Pivot at row {k+1} is zero. Method fails."
             })
@@ -81,7 +83,7 @@ def gauss_simple(A: list, b: list, decimals: int = 6):
         if abs(pivot) < 1e-7:
             logs.append({
                 "step": f"Iteration {k+1}",
-                "matrix": pd.DataFrame(np.column_stack((A, b)),
+                "matrix": Table(np.column_stack((A, b)),
                                        columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
                 "message": f"Warning: Pivot at row {k+1} is very small ({pivot:.2e}). Numerical instability may occur."
             })
@@ -95,7 +97,7 @@ def gauss_simple(A: list, b: list, decimals: int = 6):
 
         logs.append({
             "step": f"Iteration {k+1}",
-            "matrix": pd.DataFrame(np.column_stack((A, b)),
+            "matrix": Table(np.column_stack((A, b)),
                                    columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
             "message": f"Elimination at column {k+1} complete."
         })
@@ -106,7 +108,7 @@ def gauss_simple(A: list, b: list, decimals: int = 6):
         if A[i, i] == 0:
             logs.append({
                 "step": "Back Substitution",
-                "matrix": pd.DataFrame(np.column_stack((A, b)),
+                "matrix": Table(np.column_stack((A, b)),
                                        columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
                 "message": f"Zero pivot at row {i+1}. Method fails."
             })
@@ -115,7 +117,7 @@ def gauss_simple(A: list, b: list, decimals: int = 6):
 
     logs.append({
         "step": "Back Substitution",
-        "matrix": pd.DataFrame(np.column_stack((A, b)),
+        "matrix": Table(np.column_stack((A, b)),
                                columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
         "message": "Back substitution complete."
     })
@@ -1,17 +1,19 @@
 import numpy as np
-import pandas as pd
+from tools.tables import Table
 
-def gauss_partial(A: list, b: list, decimals: int = 6):
-    A = np.array(A, dtype=float)
-    b = np.array(b, dtype=float)
-    logs = []
+def gauss_partial(A: list, b: list, decimals: int = 6, logs: list = None):
+    # Sin copia si ya es float64: A y b se modifican en sitio (la ruta los crea para esta llamada)
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    # logs: lista (por defecto) o un StepLog que envía cada paso en streaming
+    logs = [] if logs is None else logs
 
     if A.shape[0] != A.shape[1]:
         return {
             "solution": None,
             "logs": [{
                 "step": "Check",
-                "matrix": pd.DataFrame(np.column_stack((A, b)),
+                "matrix": Table(np.column_stack((A, b)),
                                        columns=[f"x{i+1}" for i in range(A.shape[1])] + ["b"]).round(decimals),
                 "message": f"Matrix A must be square. Received {A.shape[0]}x{A.shape[1]}."
             }]
@@ -22,7 +24,7 @@ def gauss_partial(A: list, b: list, decimals: int = 6):
             "solution": None,
             "logs": [{
                 "step": "Check",
-                "matrix": pd.DataFrame(np.column_stack((A, b)),
+                "matrix": Table(np.column_stack((A, b)),
                                        columns=[f"x{i+1}" for i in range(A.shape[1])] + ["b"]).round(decimals),
                 "message": f"The size of vector b ({len(b)}) does not match the number of rows in A ({A.shape[0]})."
             }]
@@ -37,7 +39,7 @@ def gauss_partial(A: list, b: list, decimals: int = 6):
             "solution": None,
             "logs": [{
                 "step": "Check",
-                "matrix": pd.DataFrame(np.column_stack((A, b)),
+                "matrix": Table(np.column_stack((A, b)),
                                        columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
                 "message": "det(A) = 0. The matrix is singular. The system may have no unique solution or no solution at all."
             }]
@@ -48,7 +50,7 @@ def gauss_partial(A: list, b: list, decimals: int = 6):
             "solution": None,
             "logs": [{
                 "step": "Check",
-                "matrix": pd.DataFrame(np.column_stack((A, b)),
+                "matrix": Table(np.column_stack((A, b)),
                                        columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
                 "message": f"det(A) ≈ {det:.2e}, the system is ill-conditioned and may present numerical instability."
             }]
@@ -57,7 +59,7 @@ def gauss_partial(A: list, b: list, decimals: int = 6):
     # --- Initial system log ---
     logs.append({
         "step": "Initial",
-        "matrix": pd.DataFrame(np.column_stack((A, b)),
+        "matrix": Table(np.column_stack((A, b)),
                                columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
         "message": f"Initial system. Determinant = {det:.4f}"
     })
@@ -69,7 +71,7 @@ def gauss_partial(A: list, b: list, decimals: int = 6):
         if np.isclose(A[max_row, k], 0):
             logs.append({
                 "step": f"Iteration {k+1}",
-                "matrix": pd.DataFrame(np.column_stack((A, b)),
+                "matrix": Table(np.column_stack((A, b)),
                                        columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
                 "message": f"No non-zero pivot found in column {k+1}. Method fails."
             })
@@ -80,7 +82,7 @@ def gauss_partial(A: list, b: list, decimals: int = 6):
             b[[k, max_row]] = b[[max_row, k]]
             logs.append({
                 "step": f"Pivot {k+1}",
-                "matrix": pd.DataFrame(np.column_stack((A, b)),
+                "matrix": Table(np.column_stack((A, b)),
                                        columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
                 "message": f"Rows {k+1} and {max_row+1} swapped for partial pivoting."
             })
@@ -89,7 +91,7 @@ def gauss_partial(A: list, b: list, decimals: int = 6):
         if abs(pivot) < 1e-7:
             logs.append({
                 "step": f"Iteration {k+1}",
-                "matrix": pd.DataFrame(np.column_stack((A, b)),
+                "matrix": Table(np.column_stack((A, b)),
                                        columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
                 "message": f"Warning: Pivot at row {k+1} is very small ({pivot:.2e}). Numerical instability may occur."
             })
@@ -103,7 +105,7 @@ def gauss_partial(A: list, b: list, decimals: int = 6):
 
         logs.append({
             "step": f"Iteration {k+1}",
-            "matrix": pd.DataFrame(np.column_stack((A, b)),
+            "matrix": Table(np.column_stack((A, b)),
                                    columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
             "message": f"Elimination at column {k+1} complete."
         })
@@ -114,7 +116,7 @@ def gauss_partial(A: list, b: list, decimals: int = 6):
         if np.isclose(A[i, i], 0):
             logs.append({
                 "step": "Back Substitution",
-                "matrix": pd.DataFrame(np.column_stack((A, b)),
+                "matrix": Table(np.column_stack((A, b)),
                                        columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
                 "message": f"Zero (or near-zero) pivot at row {i+1}. Method fails."
             })
@@ -123,7 +125,7 @@ def gauss_partial(A: list, b: list, decimals: int = 6):
 
     logs.append({
         "step": "Back Substitution",
-        "matrix": pd.DataFrame(np.column_stack((A, b)),
+        "matrix": Table(np.column_stack((A, b)),
                                columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
         "message": "Back substitution complete."
     })
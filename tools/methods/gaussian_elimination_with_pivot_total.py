@@ -1,10 +1,12 @@
 import numpy as np
-import pandas as pd
+from tools.tables import Table
 
-def gauss_total(A: list, b: list, decimals: int = 6):
-    A = np.array(A, dtype=float)
-    b = np.array(b, dtype=float)
-    logs = []
+def gauss_total(A: list, b: list, decimals: int = 6, logs: list = None):
+    # Sin copia si ya es float64: A y b se modifican en sitio (la ruta los crea para esta llamada)
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    # logs: lista (por defecto) o un StepLog que envía cada paso en streaming
+    logs = [] if logs is None else logs
 
     # --- Verificaciones iniciales ---
     if A.shape[0] != A.shape[1]:
@@ -12,7 +14,7 @@ def gauss_total(A: list, b: list, decimals: int = 6):
             "solution": None,
             "logs": [{ 
                 "step": "Check",
-                "matrix": pd.DataFrame(np.column_stack((A, b)),
+                "matrix": Table(np.column_stack((A, b)),
                                        columns=[f"x{i+1}" for i in range(A.shape[1])] + ["b"]).round(decimals),
                 "message": f"Matrix A must be square. Received {A.shape[0]}x{A.shape[1]}."
             }]
@@ -23,7 +25,7 @@ def gauss_total(A: list, b: list, decimals: int = 6):
             "solution": None,
             "logs": [{
                 "step": "Check",
-                "matrix": pd.DataFrame(np.column_stack((A, b)),
+                "matrix": Table(np.column_stack((A, b)),
                                        columns=[f"x{i+1}" for i in range(A.shape[1])] + ["b"]).round(decimals),
                 "message": f"The size of vector b ({len(b)}) does not match the number of rows in A ({A.shape[0]})."
             }]
@@ -41,7 +43,7 @@ def gauss_total(A: list, b: list, decimals: int = 6):
             "solution": None,
             "logs": [{
                 "step": "Check",
-                "matrix": pd.DataFrame(np.column_stack((A, b)),
+                "matrix": Table(np.column_stack((A, b)),
                                        columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
                 "message": "det(A) = 0. The matrix is singular. The system may have no unique solution or no solution at all."
             }]
@@ -52,7 +54,7 @@ def gauss_total(A: list, b: list, decimals: int = 6):
             "solution": None,
             "logs": [{
                 "step": "Check",
-                "matrix": pd.DataFrame(np.column_stack((A, b)),
+                "matrix": Table(np.column_stack((A, b)),
                                        columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
                 "message": f"det(A) ≈ {det:.2e}, the system is ill-conditioned and may present numerical instability."
             }]
@@ -61,7 +63,7 @@ def gauss_total(A: list, b: list, decimals: int = 6):
     # --- Registro inicial ---
     logs.append({
         "step": "Initial",
-        "matrix": pd.DataFrame(np.column_stack((A, b)),
+        "matrix": Table(np.column_stack((A, b)),
                                columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
         "message": f"Initial system. Determinant = {det:.4f}"
     })
@@ -76,7 +78,7 @@ def gauss_total(A: list, b: list, decimals: int = 6):
         if np.isclose(A[p, q], 0):
             logs.append({
                 "step": f"Iteration {k+1}",
-                "matrix": pd.DataFrame(np.column_stack((A, b)),
+                "matrix": Table(np.column_stack((A, b)),
                                        columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
                 "message": f"No non-zero pivot found near position ({p+1},{q+1}). Method fails."
             })
@@ -93,7 +95,7 @@ def gauss_total(A: list, b: list, decimals: int = 6):
 
         logs.append({
             "step": f"Pivot {k+1}",
-            "matrix": pd.DataFrame(np.column_stack((A, b)),
+            "matrix": Table(np.column_stack((A, b)),
                                    columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
             "message": f"Swapped column {k+1} ↔ {q+1} and row {k+1} ↔ {p+1} for total pivoting."
         })
@@ -102,7 +104,7 @@ def gauss_total(A: list, b: list, decimals: int = 6):
         if abs(pivot) < 1e-7:
             logs.append({
                 "step": f"Iteration {k+1}",
-                "matrix": pd.DataFrame(np.column_stack((A, b)),
+                "matrix": Table(np.column_stack((A, b)),
                                        columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
                 "message": f"Warning: Pivot at position ({k+1},{k+1}) is very small ({pivot:.2e}). Numerical instability may occur."
             })
@@ -117,7 +119,7 @@ def gauss_total(A: list, b: list, decimals: int = 6):
 
         logs.append({
             "step": f"Iteration {k+1}",
-            "matrix": pd.DataFrame(np.column_stack((A, b)),
+            "matrix": Table(np.column_stack((A, b)),
                                    columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
             "message": f"Elimination at column {k+1} complete."
         })
@@ -128,7 +130,7 @@ def gauss_total(A: list, b: list, decimals: int = 6):
         if np.isclose(A[i, i], 0):
             logs.append({
                 "step": "Back Substitution",
-                "matrix": pd.DataFrame(np.column_stack((A, b)),
+                "matrix": Table(np.column_stack((A, b)),
                                        columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
                 "message": f"Zero (or near-zero) pivot at row {i+1}. Method fails."
             })
@@ -143,7 +145,7 @@ def gauss_total(A: list, b: list, decimals: int = 6):
 
     logs.append({
         "step": "Back Substitution",
-        "matrix": pd.DataFrame(np.column_stack((A, b)),
+        "matrix": Table(np.column_stack((A, b)),
                                columns=[f"x{i+1}" for i in range(n)] + ["b"]).round(decimals),
         "message": "Back substitution complete."
     })
@@ -1,25 +1,28 @@
 import math
 
+from tools.history import IterationHistory
+
 def incremental_search(f, x0, delta_x, max_iter=100, tolerance=1e-6):
 
     a = x0
     b = x0 + delta_x
     iter_count = 0
-    search_history = []
+    search_history = IterationHistory(("a", "b", "fa", "fb"))
     intervals_found = []
     
 
+    # f(b) de un paso es f(a) del siguiente: una evaluación por paso
+    fa = f(a)
     while iter_count < max_iter:
-        fa = f(a)
         fb = f(b)
-        search_history.append([a, b, fa, fb])
+        search_history.append(a, b, fa, fb)
         
 
         if fa * fb < 0:
             intervals_found.append([a, b])
         
        
-        a = b
+        a, fa = b, fb
         b = a + delta_x
         iter_count += 1
     
@@ -35,7 +38,7 @@ def incremental_search(f, x0, delta_x, max_iter=100, tolerance=1e-6):
         "intervals": intervals_found, 
         "interval": intervals_found[0] if intervals_found else None, 
         "history": {
-            "search_points": search_history,
+            "search_points": [list(row) for row in search_history.rows()],
             "iterations": iter_count,
             "total_intervals": len(intervals_found)
         }
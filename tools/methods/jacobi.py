@@ -66,8 +66,9 @@ def _vec_norm(v: np.ndarray, norma: str = "inf") -> float:
     return float(np.linalg.norm(v, np.inf))
 
 def _jacobi_fallback(A: np.ndarray, b: np.ndarray, x0: np.ndarray,
-                     tol: float, nmax: int, norma: str) -> Dict[str, Any]:
-    """Standard Jacobi implementation with history."""
+                     tol: float, nmax: int, norma: str,
+                     progress: Optional[Callable] = None, keep_history: bool = True) -> Dict[str, Any]:
+    """Standard Jacobi implementation with history (optional per-iteration progress hook)."""
     A = A.astype(float)
     b = b.astype(float)
     x = x0.astype(float).copy()
@@ -83,7 +84,10 @@ def _jacobi_fallback(A: np.ndarray, b: np.ndarray, x0: np.ndarray,
     for k in range(nmax):
         x_new = D_inv @ (b - R @ x)
         err = _vec_norm(x_new - x, norma)
-        history.append({"k": k+1, "x": _to_list(x_new), "error": float(err)})
+        if keep_history:
+            history.append({"k": k+1, "x": _to_list(x_new), "error": float(err)})
+        if progress is not None:
+            progress(k+1, err, x_new)
         x = x_new
         if err < tol:
             break
@@ -153,24 +157,30 @@ def _normalize_user_output(out, A: np.ndarray, b: np.ndarray, x0: np.ndarray,
 
 # ===== Main API =====
 def compute_jacobi(A: List[List[float]], b: List[float], x0: List[float],
-                   tol: float = 1e-7, nmax: int = 100, norma: str = "inf") -> Dict[str, Any]:
-    if not isinstance(A, list) or not A or not all(isinstance(r, list) for r in A):
+                   tol: float = 1e-7, nmax: int = 100, norma: str = "inf",
+                   progress: Optional[Callable] = None, keep_history: bool = True) -> Dict[str, Any]:
+    if not isinstance(A, (list, np.ndarray)) or len(A) == 0 or not all(isinstance(r, (list, np.ndarray)) for r in A):
         raise ValueError("A must be a non-empty list of lists.")
     n = len(A)
     if any(len(r) != n for r in A):
         raise ValueError("A must be square.")
-    if not isinstance(b, list) or len(b) != n:
+    if not isinstance(b, (list, np.ndarray)) or len(b) != n:
         raise ValueError("b must have length n.")
-    if not isinstance(x0, list) or len(x0) != n:
+    if not isinstance(x0, (list, np.ndarray)) or len(x0) != n:
         raise ValueError("x0 must have length n.")
 
-    A_np = np.array(A, dtype=float)
-    b_np = np.array(b, dtype=float)
-    x0_np = np.array(x0, dtype=float)
+    # Sin copia si ya llega como arreglo float64 (ingesta de main.py)
+    A_np = np.asarray(A, dtype=float)
+    b_np = np.asarray(b, dtype=float)
+    x0_np = np.asarray(x0, dtype=float)
     tol = float(tol)
     nmax = int(nmax)
     norma = str(norma or "inf")
 
+    # Progress/streaming needs the instrumented loop: skip user modules
+    if progress is not None or not keep_history:
+        return _jacobi_fallback(A_np, b_np, x0_np, tol, nmax, norma, progress, keep_history)
+
     # 1) Try user's module first
     user_mod = _import_first(CANDIDATE_MODULES)
     user_fn = _get_first_callable(user_mod, JACOBI_FUNC_NAMES) if user_mod else None
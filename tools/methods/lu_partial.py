@@ -138,12 +138,13 @@ def _solve_with_helpers(L: np.ndarray, U: np.ndarray, P: np.ndarray, b: np.ndarr
 # 4) Internal fallback (if there is no user-code available)
 #     -> Factorizes with partial pivoting and solves
 # ------------------------------------------------------------
-def _fallback_lu(A: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, list]:
+def _fallback_lu(A: np.ndarray, steps: Optional[list] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, list]:
     n = A.shape[0]
     U = A.copy().astype(float)
     L = np.eye(n, dtype=float)
     P = np.eye(n, dtype=float)
-    etapas = []
+    # steps: StepLog from main.py to stream each stage as it is produced
+    etapas = [] if steps is None else steps
 
     for k in range(n-1):
         piv = np.argmax(np.abs(U[k:, k])) + k
@@ -163,17 +164,19 @@ def _fallback_lu(A: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, lis
 # ------------------------------------------------------------
 # 5) Main API used by FastAPI
 # ------------------------------------------------------------
-def compute_gauss_pivote_parcial(A: List[List[float]], b: List[float], track_etapas: bool = True) -> Dict[str, Any]:
-    if not isinstance(A, list) or not A or not all(isinstance(r, list) for r in A):
+def compute_gauss_pivote_parcial(A: List[List[float]], b: List[float], track_etapas: bool = True,
+                                 steps: Optional[list] = None) -> Dict[str, Any]:
+    if not isinstance(A, (list, np.ndarray)) or len(A) == 0 or not all(isinstance(r, (list, np.ndarray)) for r in A):
         raise ValueError("A must be a non-empty list of lists.")
     n = len(A)
     if any(len(r) != n for r in A):
         raise ValueError("A must be square.")
-    if not isinstance(b, list) or len(b) != n:
+    if not isinstance(b, (list, np.ndarray)) or len(b) != n:
         raise ValueError("b must have length n.")
 
-    A_np = np.array(A, dtype=float)
-    b_np = np.array(b, dtype=float)
+    # Sin copia si ya llega como arreglo float64 (ingesta de main.py)
+    A_np = np.asarray(A, dtype=float)
+    b_np = np.asarray(b, dtype=float)
 
     etapas = None
 
@@ -202,7 +205,7 @@ def compute_gauss_pivote_parcial(A: List[List[float]], b: List[float], track_eta
             x = _solve_with_helpers(L, U, P, b_np)
         else:
             # d) Internal fallback (to avoid breaking)
-            L, U, P, etapas = _fallback_lu(A_np)
+            L, U, P, etapas = _fallback_lu(A_np, steps)
             x = _solve_with_helpers(L, U, P, b_np)
 
     # final augmented [U | y]
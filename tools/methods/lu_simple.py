@@ -133,11 +133,12 @@ def _solve_with_helpers(L: np.ndarray, U: np.ndarray, b: np.ndarray) -> np.ndarr
 # ------------------------------------------------------------
 # 4) Fallback interno (LU Simple sin pivoteo)
 # ------------------------------------------------------------
-def _fallback_lu_simple(A: np.ndarray) -> Tuple[np.ndarray, np.ndarray, list]:
+def _fallback_lu_simple(A: np.ndarray, steps: Optional[list] = None) -> Tuple[np.ndarray, np.ndarray, list]:
     n = A.shape[0]
     U = A.copy().astype(float)
     L = np.eye(n, dtype=float)
-    etapas = []
+    # steps: StepLog de main.py para enviar cada etapa en streaming
+    etapas = [] if steps is None else steps
 
     for k in range(n-1):
         if abs(U[k, k]) < 1e-15:
@@ -154,17 +155,19 @@ def _fallback_lu_simple(A: np.ndarray) -> Tuple[np.ndarray, np.ndarray, list]:
 # ------------------------------------------------------------
 # 5) API principal usada por FastAPI
 # ------------------------------------------------------------
-def compute_lu_simple(A: List[List[float]], b: List[float], track_etapas: bool = True) -> Dict[str, Any]:
-    if not isinstance(A, list) or not A or not all(isinstance(r, list) for r in A):
+def compute_lu_simple(A: List[List[float]], b: List[float], track_etapas: bool = True,
+                      steps: Optional[list] = None) -> Dict[str, Any]:
+    if not isinstance(A, (list, np.ndarray)) or len(A) == 0 or not all(isinstance(r, (list, np.ndarray)) for r in A):
         raise ValueError("A debe ser una lista de listas no vacía.")
     n = len(A)
     if any(len(r) != n for r in A):
         raise ValueError("A debe ser cuadrada.")
-    if not isinstance(b, list) or len(b) != n:
+    if not isinstance(b, (list, np.ndarray)) or len(b) != n:
         raise ValueError("b debe tener longitud n.")
 
-    A_np = np.array(A, dtype=float)
-    b_np = np.array(b, dtype=float)
+    # Sin copia si ya llega como arreglo float64 (ingesta de main.py)
+    A_np = np.asarray(A, dtype=float)
+    b_np = np.asarray(b, dtype=float)
 
     etapas = None
 
@@ -192,7 +195,7 @@ def compute_lu_simple(A: List[List[float]], b: List[float], track_etapas: bool =
             x = _solve_with_helpers(L, U, b_np)
         else:
             # d) Fallback interno (para no romper)
-            L, U, etapas = _fallback_lu_simple(A_np)
+            L, U, etapas = _fallback_lu_simple(A_np, steps)
             x = _solve_with_helpers(L, U, b_np)
 
     # aumentada final [U | y]
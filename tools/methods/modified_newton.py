@@ -1,4 +1,6 @@
 from sympy import *
+from tools.methods.newton import newton_all_roots
+from tools.history import IterationHistory
 
 def newton_multiple_method(
     f: str,
@@ -7,7 +9,8 @@ def newton_multiple_method(
     Nmax: int,
     ultimasNfilas: int,
     df: str = None,
-    d2f: str = None
+    d2f: str = None,
+    trace_stride: int = 0
 ):
     Nmax = int(Nmax)
     x = symbols("x")
@@ -27,96 +30,46 @@ def newton_multiple_method(
     else:
         f2 = lambdify(x, diff(f_sym, x, 2), "math")
 
-    # Historial
-    historial_x = []
-    historial_iteraciones = []
-    historial_errorAbs = []
-    historial_denom = []
+    # Historial: últimas N filas en un buffer circular
+    historial = IterationHistory(("x", "errorAbs", "iteraciones", "denominadores"), tail=ultimasNfilas, stride=trace_stride)
 
+    def answer(message, value, type_):
+        result = {
+            "message": message,
+            "value": value,
+            "type": type_,
+            "historial": historial.as_dict()
+        }
+        if trace_stride:
+            result["trace"] = historial.trace()
+        return result
+
+    x1 = x0
     for n in range(Nmax):
         try:
             denom = (f1(x0)**2 - func(x0)*f2(x0))
             if denom == 0:
-                return {
-                    "message": "Denominator equal to 0 (f'(x)^2 - f(x)f''(x) = 0)",
-                    "value": x0,
-                    "type": "danger",
-                    "historial": {
-                        "x": historial_x,
-                        "errorAbs": historial_errorAbs,
-                        "iteraciones": historial_iteraciones,
-                        "denominadores": historial_denom
-                    }
-                }
+                return answer("Denominator equal to 0 (f'(x)^2 - f(x)f''(x) = 0)", x0, "danger")
 
             x1 = x0 - (func(x0) * f1(x0)) / denom
 
         except OverflowError:
-            return {
-                "message": "too Big or to small denominator (f'(x)^2 - f(x)f''(x) = 0)",
-                "value": x0,
-                "type":"danger",
-                "historial": {
-                    "x": historial_x,
-                    "errorAbs": historial_errorAbs,
-                    "iteraciones": historial_iteraciones,
-                    "denominadores": historial_denom
-                }
-            }
+            return answer("too Big or to small denominator (f'(x)^2 - f(x)f''(x) = 0)", x0, "danger")
         except Exception as e:
-            return {
-                "message": f"Error en la iteración: {str(e)}",
-                "value": x0,
-                "type": "danger",
-                "historial": {
-                    "x": historial_x,
-                    "errorAbs": historial_errorAbs,
-                    "iteraciones": historial_iteraciones,
-                    "denominadores": historial_denom
-                }
-            }
+            return answer(f"Error en la iteración: {str(e)}", x0, "danger")
 
         errorAbs = abs(x1 - x0)
 
         # Guardar en historial
-        historial_x.append(x0)
-        historial_errorAbs.append(errorAbs)
-        historial_iteraciones.append(n)
-        historial_denom.append(denom)
-
-        if len(historial_x) > ultimasNfilas:
-            historial_x.pop(0)
-            historial_errorAbs.pop(0)
-            historial_iteraciones.pop(0)
-            historial_denom.pop(0)   
+        historial.append(x0, errorAbs, n, denom)
 
         # Verificar tolerancia
         if abs(func(x1)) < tol:
-            return {
-                "message": "Tolerance satisfied",
-                "value": x1,
-                "type": "success",
-                "historial": {
-                    "x": historial_x,
-                    "errorAbs": historial_errorAbs,
-                    "iteraciones": historial_iteraciones,
-                    "denominadores": historial_denom
-                }
-            }
+            return answer("Tolerance satisfied", x1, "success")
 
         x0 = x1
 
-    return {
-        "message": "Number of iterations exceeded",
-        "value": x1,
-        "type": "info",
-        "historial": {
-            "x": historial_x,
-            "errorAbs": historial_errorAbs,
-            "iteraciones": historial_iteraciones,
-            "denominadores": historial_denom
-        }
-    }
+    return answer("Number of iterations exceeded", x1, "info")
 
 
 def newton_multiple_controller(
@@ -126,8 +79,15 @@ def newton_multiple_controller(
     tol: float,
     nrows: int,
     df: str = None,
-    d2f: str = None
+    d2f: str = None,
+    mode: str = "single",
+    trace_stride: int = 0
 ):
+    if mode == "all_roots":
+        answer = newton_all_roots(function, tol)
+        answer["historial"]["denominadores"] = []
+        return answer
+
     # 🐞 Debug print
     print("\n[DEBUG] Parámetros recibidos en newton_multiple_controller:")
     print(f"  function = {function}")
@@ -138,5 +98,5 @@ def newton_multiple_controller(
     print(f"  tol      = {tol}")
     print(f"  nrows    = {nrows}\n")
 
-    return newton_multiple_method(function, x0, tol, Nmax, nrows, df, d2f)
+    return newton_multiple_method(function, x0, tol, Nmax, nrows, df, d2f, trace_stride=trace_stride)
 
@@ -1,6 +1,18 @@
 from sympy import *
+import numpy as np
+import base64
+import io
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from tools.sympyUtilities import polynomial_roots
+from tools.history import IterationHistory
 
-def newton_method(f:str, x0:float, tol:float, Nmax:int, ultimasNfilas:int, df:str= None):
+def newton_method(f:str, x0:float, tol:float, Nmax:int, ultimasNfilas:int, df:str= None, trace_stride:int = 0):
     
     Nmax = int(Nmax)
     x = symbols("x")
@@ -10,83 +22,375 @@ def newton_method(f:str, x0:float, tol:float, Nmax:int, ultimasNfilas:int, df:st
     else:
         deriv = lambdify(x, sympify(df), "math")
     
-    historial_x = []
-    historial_iteraciones = []
-    historial_errorAbs = []
-    
+    # Últimas N filas en un buffer circular (+ traza diezmada opcional)
+    historial = IterationHistory(("x", "errorAbs", "iteraciones"), tail=ultimasNfilas, stride=trace_stride)
+
+    def answer(message, value, type_):
+        result = {
+            "message": message,
+            "value": value,
+            "type": type_,
+            "historial": historial.as_dict()
+        }
+        if trace_stride:
+            result["trace"] = historial.trace()
+        return result
     
     for n in range(Nmax):
         
         try: 
             test = 1/deriv(x0)
         except OverflowError:
-            return {
-                "message": "f'(x0) is too Big or to small for f(x0)/f'(x0)",
-                "value": x0,
-                "type":"danger",
-                "historial": {
-                    "x": historial_x,
-                    "errorAbs": historial_errorAbs,
-                    "iteraciones": historial_iteraciones
-                }
-            }
+            return answer("f'(x0) is too Big or to small for f(x0)/f'(x0)", x0, "danger")
         except ZeroDivisionError:
-            return {
-                "message": "Division by 0 occurred, derivate equal to 0",
-                "value": x0,
-                "type":"danger",
-                "historial": {
-                    "x": historial_x,
-                    "errorAbs": historial_errorAbs,
-                    "iteraciones": historial_iteraciones
-                }
-            }
+            return answer("Division by 0 occurred, derivate equal to 0", x0, "danger")
         
         x1 = x0 - (func(x0)/deriv(x0))
         
         errorAbs = abs(x1 - x0)
     
-        
-        historial_x.append(x0)
-        historial_errorAbs.append(errorAbs)
-        historial_iteraciones.append(n)
-        
-        if len(historial_x) > ultimasNfilas:
-            historial_x.pop(0)
-            historial_errorAbs.pop(0)
-            historial_iteraciones.pop(0)    
+        historial.append(x0, errorAbs, n)
         
         if abs(x1 - x0) < tol:
-            return {
-                "message": "Tolerancia satisfecha",
-                "value": x1,
-                "type":"success",
-                "historial": {
-                    "x": historial_x,
-                    "errorAbs": historial_errorAbs,
-                    "iteraciones": historial_iteraciones
-                }
-            }
-
-        if int(n) >= int(Nmax):
-            return {
-                "message": "Cantidad de iteraciones superadas",
-                "value": x1,
-                "type":"info",
-                "historial": {
-                    "x": historial_x,
-                    "errorAbs": historial_errorAbs,
-                    "iteraciones": historial_iteraciones
-                }
-            }
-        
+            return answer("Tolerancia satisfecha", x1, "success")
         
         x0 = x1
+
+    return answer("Cantidad de iteraciones superadas", x0, "info")
     
 
-def newton_method_controller(function: str, x0: float, Nmax: int, tol: float, nrows: int):
+def _lambdify_np(expr, x):
+    """lambdify con backend numpy; las constantes se expanden al tamaño del arreglo."""
+    fun = lambdify(x, expr, "numpy")
+    return lambda xs: np.broadcast_to(np.asarray(fun(xs), dtype=float), xs.shape)
+
+
+def _dedupe_roots(xs, fxs, iters, tol):
+    """Agrupa raíces a distancia <= tol (ordenadas); por grupo se queda la de menor |f|."""
+    order = np.argsort(xs)
+    xs, fxs, iters = xs[order], fxs[order], iters[order]
+    breaks = np.flatnonzero(np.diff(xs) > tol * np.maximum(1.0, np.abs(xs[1:]))) + 1
+    roots = []
+    for group in np.split(np.arange(xs.size), breaks):
+        if group.size == 0:
+            continue
+        best = group[np.argmin(np.abs(fxs[group]))]
+        roots.append({
+            "x": float(xs[best]),
+            "fx": float(fxs[best]),
+            "starts": int(group.size),
+            "iterations": int(iters[group].min())
+        })
+    return roots
+
+
+def newton_batch(f: str, x0s, tol: float, Nmax: int, df: str = None, dedupe_tol: float = None):
+    """
+    Newton sobre muchos puntos iniciales a la vez (lambdify "numpy").
+    Cada carril que converge o falla (f' = 0, overflow, NaN) sale de la
+    máscara activa y deja de evaluarse. Las raíces convergidas se agrupan
+    en raíces distintas.
+    """
+    x = symbols("x")
+    f_sym = sympify(f)
+    func = _lambdify_np(f_sym, x)
+    deriv = _lambdify_np(sympify(df) if df is not None else diff(f_sym, x), x)
+
+    xs = np.array(x0s, dtype=float).ravel()
+    iterations = np.zeros(xs.size, dtype=int)
+    converged = np.zeros(xs.size, dtype=bool)
+    failed = ~np.isfinite(xs)
+    active = ~failed
+
+    tol = float(tol)
+    with np.errstate(all="ignore"):
+        for n in range(int(Nmax)):
+            idx = np.flatnonzero(active)
+            if idx.size == 0:
+                break
+            xa = xs[idx]
+            step = func(xa) / deriv(xa)
+            bad = ~np.isfinite(step)
+            x1 = xa - step
+
+            ok = idx[~bad]
+            xs[ok] = x1[~bad]
+            iterations[idx] = n + 1
+            failed[idx[bad]] = True
+            converged[ok[np.abs(step[~bad]) < tol]] = True
+            active[idx[bad]] = False
+            active[converged] = False
+
+        fxs = func(xs)
+
+    hit = converged & np.isfinite(fxs)
+    roots = []
+    if hit.any():
+        roots = _dedupe_roots(xs[hit], fxs[hit], iterations[hit],
+                              dedupe_tol if dedupe_tol is not None else max(100 * tol, 1e-10))
+
+    return {
+        "roots": roots,
+        "starts": int(xs.size),
+        "converged": int(converged.sum()),
+        "failed": int(failed.sum()),
+        "not_converged": int(xs.size - converged.sum() - failed.sum()),
+        "max_iterations": int(iterations.max()) if xs.size else 0
+    }
+
+
+def newton_batch_controller(function: str, a: float, b: float, n_starts: int, Nmax: int, tol: float):
+    """Todas las raíces en [a, b]: n_starts puntos iniciales equiespaciados, Newton en lote."""
+    a, b, n_starts = float(a), float(b), int(n_starts)
+    if not a < b:
+        return {"message": "a must be less than b", "type": "danger", "roots": []}
+    if n_starts < 1:
+        return {"message": "n_starts must be positive", "type": "danger", "roots": []}
+
+    try:
+        result = newton_batch(function, np.linspace(a, b, n_starts), tol, Nmax)
+    except (SympifyError, TypeError, ValueError) as e:
+        return {"message": f"Invalid function: {e}", "type": "danger", "roots": []}
+
+    inside = [r for r in result["roots"] if a <= r["x"] <= b]
+    result["roots_outside"] = [r for r in result["roots"] if not a <= r["x"] <= b]
+    result["roots"] = inside
+    result["message"] = f"{len(inside)} distinct roots in [{a}, {b}]"
+    result["type"] = "success" if inside else "info"
+    return result
+
+
+# ===================== Cuencas de atracción (plano complejo) =====================
+
+BASINS_MAX_SIDE = 2000      # píxeles por lado
+BASINS_CHUNK_ROWS = 64      # filas por bloque: temporales acotados (~64*ancho complejos)
+BASINS_MAX_ROOTS = 255      # etiquetas uint8; 0 = no convergió
+
+# Pool de procesos compartido entre peticiones: arrancar workers (spawn +
+# importar sympy/numpy) cuesta segundos, así que se crea una vez, con tamaño
+# fijo, y se reutiliza. `workers` de cada petición solo limita cuántos usa.
+BASINS_POOL_SIZE = os.cpu_count() or 1
+_basins_pool = None
+_basins_pool_lock = threading.Lock()
+
+
+def _get_basins_pool():
+    global _basins_pool
+    with _basins_pool_lock:
+        if _basins_pool is None:
+            # spawn: el proceso padre puede tener hilos (threadpool, JVM) y fork no es seguro
+            _basins_pool = ProcessPoolExecutor(max_workers=BASINS_POOL_SIZE,
+                                               mp_context=multiprocessing.get_context("spawn"))
+        return _basins_pool
+
+
+def _discard_basins_pool(pool) -> None:
+    """Pool roto (un worker murió): se descarta para que el próximo uso cree otro."""
+    global _basins_pool
+    with _basins_pool_lock:
+        if _basins_pool is pool:
+            _basins_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _map_basins_tiles(args, workers: int):
+    """Bloques en el pool; si se rompe, se recrea y se reintenta una vez, luego en serie."""
+    # `workers` tandas de bloques: la petición ocupa a lo sumo `workers` procesos
+    chunksize = -(-len(args) // workers)
+    for _ in range(2):
+        pool = _get_basins_pool()
+        try:
+            return list(pool.map(_basins_tile, *zip(*args), chunksize=chunksize))
+        except BrokenProcessPool:
+            _discard_basins_pool(pool)
+    return [_basins_tile(*a) for a in args]
+
+
+@lru_cache(maxsize=32)
+def _complex_newton_step(f: str, df: str = None):
+    """f/f' como función numpy sobre arreglos complejos (cacheada por proceso)."""
+    x = symbols("x")
+    f_sym = sympify(f)
+    func = lambdify(x, f_sym, "numpy")
+    deriv = lambdify(x, sympify(df) if df else diff(f_sym, x), "numpy")
+
+    def step(z):
+        return np.broadcast_to(func(z), z.shape) / np.broadcast_to(deriv(z), z.shape)
+    return step
+
+
+def _basins_tile(f, df, re_axis, im_axis, Nmax, tol):
+    """
+    Newton sobre un bloque de filas de la malla compleja.
+    Devuelve (z final, iteraciones uint16, convergió). Solo se evalúan los
+    carriles activos: los que convergen o fallan salen del índice.
+    """
+    step_fn = _complex_newton_step(f, df)
+    z = (re_axis[None, :] + 1j * im_axis[:, None]).ravel()
+    iters = np.full(z.size, Nmax, dtype=np.uint16)
+    converged = np.zeros(z.size, dtype=bool)
+    idx = np.arange(z.size)
+
+    with np.errstate(all="ignore"):
+        for n in range(Nmax):
+            if idx.size == 0:
+                break
+            za = z[idx]
+            step = step_fn(za)
+            bad = ~np.isfinite(step)
+            z[idx] = za - step
+            done = ~bad & (np.abs(step) < tol)
+            converged[idx[done]] = True
+            iters[idx[done]] = n + 1
+            idx = idx[~(bad | done)]
+
+    shape = (im_axis.size, re_axis.size)
+    return z.reshape(shape), iters.reshape(shape), converged.reshape(shape)
+
+
+def _label_roots(z, converged, cluster_tol=1e-6):
+    """Etiqueta cada punto convergido con su raíz (redondeo a cluster_tol)."""
+    labels = np.zeros(z.shape, dtype=np.uint8)
+    zc = z[converged]
+    if zc.size == 0:
+        return labels, [], False
+    keys = np.round(zc / cluster_tol)
+    uniq, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    counts = np.bincount(inverse, minlength=uniq.size)
+    truncated = uniq.size > BASINS_MAX_ROOTS
+    # Raíces ordenadas por parte real/imaginaria (colores estables entre llamadas);
+    # si hay demasiadas se conservan las de cuencas más grandes
+    keep = np.argsort(-counts, kind="stable")[:BASINS_MAX_ROOTS]
+    keep = keep[np.lexsort((uniq[keep].imag, uniq[keep].real))]
+    remap = np.zeros(uniq.size, dtype=np.uint8)
+    remap[keep] = np.arange(1, keep.size + 1, dtype=np.uint8)
+    labels[converged] = remap[inverse]
+    roots = [
+        {"real": float(r.real), "imag": float(r.imag), "pixels": int(c)}
+        for r, c in zip(zc[first[keep]], counts[keep])
+    ]
+    return labels, roots, truncated
+
+
+def _basins_rgb(labels, iters, n_roots, Nmax):
+    """Color por raíz, más oscuro cuantas más iteraciones; negro si no convergió."""
+    from matplotlib import colormaps
+    palette = np.zeros((n_roots + 1, 3))
+    if 0 < n_roots <= 10:
+        palette[1:] = colormaps["tab10"](np.arange(n_roots))[:, :3]
+    elif n_roots > 10:
+        palette[1:] = colormaps["hsv"](np.linspace(0, 1, n_roots, endpoint=False))[:, :3]
+    shade = 1.0 - 0.75 * np.log1p(iters) / np.log1p(max(Nmax, 1))
+    rgb = palette[labels] * shade[..., None]
+    return (rgb * 255).astype(np.uint8)
+
+
+def newton_basins(f: str, re_min: float, re_max: float, im_min: float, im_max: float,
+                  width: int, height: int, Nmax: int, tol: float, df: str = None, workers: int = 0):
+    """
+    Cuencas de atracción de Newton sobre una malla width x height del plano
+    complejo. La malla se procesa por bloques de BASINS_CHUNK_ROWS filas;
+    con workers > 0 los bloques se reparten en un pool de procesos.
+    Devuelve etiquetas (uint8, fila 0 = im_max), iteraciones (uint16) y las raíces.
+    """
+    width, height, Nmax = int(width), int(height), int(Nmax)
+    if not (1 <= width <= BASINS_MAX_SIDE and 1 <= height <= BASINS_MAX_SIDE):
+        raise ValueError(f"width and height must be between 1 and {BASINS_MAX_SIDE}")
+    if not (re_min < re_max and im_min < im_max):
+        raise ValueError("Invalid region: need re_min < re_max and im_min < im_max")
+    if not 1 <= Nmax <= np.iinfo(np.uint16).max:
+        raise ValueError("Nmax out of range")
+
+    # Valida f (y compila en este proceso) antes de repartir trabajo
+    _complex_newton_step(f, df)
+
+    re_axis = np.linspace(re_min, re_max, width)
+    im_axis = np.linspace(im_max, im_min, height)  # fila 0 arriba
+    chunks = [im_axis[i:i + BASINS_CHUNK_ROWS] for i in range(0, height, BASINS_CHUNK_ROWS)]
+
+    t0 = time.perf_counter()
+    workers = min(max(int(workers or 0), 0), BASINS_POOL_SIZE, len(chunks))
+    if workers > 1:
+        parts = _map_basins_tiles([(f, df, re_axis, c, Nmax, tol) for c in chunks], workers)
+    else:
+        parts = [_basins_tile(f, df, re_axis, c, Nmax, tol) for c in chunks]
+    compute_ms = (time.perf_counter() - t0) * 1000.0
+
+    z = np.vstack([p[0] for p in parts])
+    iters = np.vstack([p[1] for p in parts])
+    converged = np.vstack([p[2] for p in parts])
+    labels, roots, truncated = _label_roots(z, converged)
+
+    return {
+        "labels": labels,
+        "iterations": iters,
+        "roots": roots,
+        "roots_truncated": truncated,
+        "converged_fraction": float(converged.mean()),
+        "compute_ms": compute_ms,
+    }
+
+
+def newton_basins_controller(function: str, re_min: float, re_max: float, im_min: float, im_max: float,
+                             width: int, height: int, Nmax: int, tol: float, workers: int = 0,
+                             output: str = "png"):
+    """
+    output="png": bytes PNG coloreado. output="raw": etiquetas e
+    iteraciones como uint8 en base64 (fila mayor), más las raíces.
+    """
+    result = newton_basins(function, re_min, re_max, im_min, im_max, width, height, Nmax, tol,
+                           workers=workers)
+    labels, iters = result.pop("labels"), result.pop("iterations")
+    result["width"], result["height"] = int(width), int(height)
+
+    if output == "raw":
+        result["labels"] = base64.b64encode(labels.tobytes()).decode("ascii")
+        result["iterations"] = base64.b64encode(np.minimum(iters, 255).astype(np.uint8).tobytes()).decode("ascii")
+        result["dtype"] = "uint8"
+        return result
+
+    from matplotlib.image import imsave
+    buf = io.BytesIO()
+    imsave(buf, _basins_rgb(labels, iters, len(result["roots"]), int(Nmax)), format="png")
+    result["png"] = buf.getvalue()
+    return result
+
+
+def newton_all_roots(f: str, tol: float):
+    """
+    Modo "all_roots": si f es un polinomio, todas sus raíces de una vez
+    (matriz compañera + pulido con Newton en lote). El historial lista las
+    raíces reales para que la tabla del front siga funcionando.
+    """
+    result = polynomial_roots(f, tol=float(tol))
+    if result is None:
+        return {
+            "message": "all_roots mode needs a polynomial in x",
+            "value": None,
+            "type": "danger",
+            "historial": {"x": [], "errorAbs": [], "iteraciones": []}
+        }
+
+    real = [r for r in result["roots"] if r["imag"] == 0.0]
+    return {
+        "message": f"{len(result['roots'])} roots found ({len(real)} real)",
+        "value": real[0]["real"] if real else None,
+        "type": "success",
+        "historial": {
+            "x": [r["real"] for r in real],
+            "errorAbs": [r["residual"] for r in real],
+            "iteraciones": list(range(len(real)))
+        },
+        **result
+    }
+
+
+def newton_method_controller(function: str, x0: float, Nmax: int, tol: float, nrows: int, mode: str = "single", trace_stride: int = 0):
+
+    if mode == "all_roots":
+        return newton_all_roots(function, tol)
 
     # Llamar al método de Newton
-    answer = newton_method(function, x0, tol, Nmax, nrows)
+    answer = newton_method(function, x0, tol, Nmax, nrows, trace_stride=trace_stride)
 
     return answer
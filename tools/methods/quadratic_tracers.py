@@ -1,6 +1,6 @@
 import numpy as np
-import logging
-import json
+
+from tools.spline_log import spline_log
 
 def quadratic_spline_method(x, y):
 
@@ -31,23 +31,6 @@ def quadratic_spline_method(x, y):
     return coefficients
 
 
-logging.basicConfig(
-    filename="splines.log",
-    level=logging.INFO,
-    format="%(asctime)s - %(message)s"
-)
-
-logging.basicConfig(
-    filename="splines.log",
-    level=logging.INFO,
-    format="%(asctime)s - %(message)s"
-)
-
-def save_single_tracer(tracer_obj, path="splines.log"):
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(tracer_obj, ensure_ascii=False) + "\n")
-
-
 def save_quadratic_tracer(x, coefficients, decimals=None):
 
     logs = []
@@ -73,9 +56,7 @@ def save_quadratic_tracer(x, coefficients, decimals=None):
 
         logs.append(log_entry)
 
-        try:
-            save_single_tracer(log_entry, path="splines.log")
-        except Exception:
-            pass
+    # Una sola entrada a la cola por spline; la escritura ocurre en segundo plano
+    spline_log.write_many(logs)
 
     return logs
@@ -1,91 +1,54 @@
 from sympy import *
+from tools.history import IterationHistory
 
-def secant_method(f: str, x0: float, x1: float, tol: float, Nmax: int, lastNrows: int):
+def secant_method(f: str, x0: float, x1: float, tol: float, Nmax: int, lastNrows: int, trace_stride: int = 0):
     Nmax = int(Nmax)
     x = symbols("x")
     func = lambdify(x, sympify(f), "math")
 
-    history_iter = []
-    history_x = []
-    history_fx = []
-    history_error = []
+    # Columns: iter, xi, f(xi), E (last N rows in a ring buffer)
+    history = IterationHistory(("iter", "xi", "f(xi)", "E"), tail=lastNrows, stride=trace_stride)
 
+    def answer(message, value, type_):
+        result = {
+            "message": message,
+            "value": value,
+            "type": type_,
+            "history": history.as_dict()
+        }
+        if trace_stride:
+            result["trace"] = history.trace()
+        return result
+
+    f_x0 = None
     for n in range(Nmax):
         try:
-            f_x0 = func(x0)
+            # f(x0) is the previous f(x1): only one new evaluation per iteration
+            if f_x0 is None:
+                f_x0 = func(x0)
             f_x1 = func(x1)
             if f_x1 - f_x0 == 0:
-                return {
-                    "message": "Division by zero occurred in denominator (f(x1) - f(x0))",
-                    "value": x1,
-                    "type": "danger",
-                    "history": {
-                        "iter": history_iter,
-                        "xi": history_x,
-                        "f(xi)": history_fx,
-                        "E": history_error
-                    }
-                }
+                return answer("Division by zero occurred in denominator (f(x1) - f(x0))", x1, "danger")
 
             x2 = x1 - f_x1 * (x1 - x0) / (f_x1 - f_x0)
             absError = abs(x2 - x1)
 
-            # Save history (columns: iter, xi, f(xi), E)
-            history_iter.append(n)
-            history_x.append(x1)
-            history_fx.append(f_x1)
-            history_error.append(absError)
-
-            # Limit history to last N rows
-            if len(history_x) > lastNrows:
-                history_iter.pop(0)
-                history_x.pop(0)
-                history_fx.pop(0)
-                history_error.pop(0)
+            history.append(n, x1, f_x1, absError)
 
             if absError < tol:
-                return {
-                    "message": "Tolerance satisfied",
-                    "value": x2,
-                    "type": "success",
-                    "history": {
-                        "iter": history_iter,
-                        "xi": history_x,
-                        "f(xi)": history_fx,
-                        "E": history_error
-                    }
-                }
+                return answer("Tolerance satisfied", x2, "success")
 
             # Update points
             x0, x1 = x1, x2
+            f_x0 = f_x1
 
         except ZeroDivisionError:
-            return {
-                "message": "Division by zero occurred during secant method calculation",
-                "value": x1,
-                "type":"danger",
-                "history": {
-                    "iter": history_iter,
-                    "xi": history_x,
-                    "f(xi)": history_fx,
-                    "E": history_error
-                }
-            }
+            return answer("Division by zero occurred during secant method calculation", x1, "danger")
 
-    return {
-        "message": "Maximum number of iterations exceeded",
-        "value": x2,
-        "type":"danger",
-        "history": {
-            "iter": history_iter,
-            "xi": history_x,
-            "f(xi)": history_fx,
-            "E": history_error
-        }
-    }
+    return answer("Maximum number of iterations exceeded", x1, "danger")
 
 
-def secant_method_controller(function: str, x0: float, x1: float, Nmax: int, tol: float, nrows: int):
+def secant_method_controller(function: str, x0: float, x1: float, Nmax: int, tol: float, nrows: int, trace_stride: int = 0):
     # Debug prints
     print("=== Parameters received in secant_method_controller ===")
     print(f"function: {function}")
@@ -96,6 +59,6 @@ def secant_method_controller(function: str, x0: float, x1: float, Nmax: int, tol
     print("=======================================================")
 
     # Call secant method
-    answer = secant_method(function, x0, x1, tol, Nmax, nrows)
+    answer = secant_method(function, x0, x1, tol, Nmax, nrows, trace_stride)
 
     return answer
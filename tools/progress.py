@@ -0,0 +1,137 @@
+# tools/progress.py
+# ---------------------------------------------------------------
+# Progress streaming for long-running iterative solvers (SSE).
+# - The solver runs in a worker thread and calls `channel.report(k, err, x)`
+#   once per iteration; only every `every`-th iteration becomes an event.
+# - Events cross to the event loop with call_soon_threadsafe and are sent
+#   as Server-Sent Events ("event: progress", "done", "error", "cancelled").
+# - When the client disconnects the channel is cancelled and the next
+#   report() raises SolverCancelled, which ends the solver loop.
+# ---------------------------------------------------------------
+
+import asyncio
+import json
+import math
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+# Approximate number of progress events per run when `every` is automatic
+DEFAULT_EVENTS = 500
+# Pending events before new progress events are dropped (done/error are never dropped)
+MAX_PENDING = 1024
+
+
+class SolverCancelled(Exception):
+    """Raised inside the solver loop once the stream has been cancelled."""
+
+
+def auto_every(nmax: int, events: int = DEFAULT_EVENTS) -> int:
+    return max(1, int(nmax) // events)
+
+
+class ProgressChannel:
+    """Bridge between a solver loop (worker thread) and an SSE response."""
+
+    def __init__(self, every: int = 1, residual: Optional[Callable[[Any], float]] = None):
+        self.every = max(1, int(every))
+        self.residual = residual
+        self.cancelled = threading.Event()
+        self.iteration = 0
+        self.error: Optional[float] = None
+        self._t0 = time.perf_counter()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional["asyncio.Queue[Dict[str, Any]]"] = None
+
+    # ===== solver side (worker thread) =====
+    def report(self, iteration: int, error: float, x: Any = None) -> None:
+        """Called every iteration by the solver; cheap unless an event is due."""
+        if self.cancelled.is_set():
+            raise SolverCancelled()
+        self.iteration, self.error = iteration, error
+        if iteration % self.every:
+            return
+        event: Dict[str, Any] = {"iteration": iteration, "error": _num(error)}
+        if self.residual is not None and x is not None:
+            try:
+                event["residual"] = _num(self.residual(x))
+            except Exception:
+                event["residual"] = None
+        event["elapsed_ms"] = (time.perf_counter() - self._t0) * 1000.0
+        self._emit("progress", event, droppable=True)
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+    # ===== plumbing =====
+    def _emit(self, kind: str, event: Dict[str, Any], droppable: bool = False) -> None:
+        if self._loop is None or self._queue is None:
+            return
+        event["event"] = kind
+        if droppable and self._queue.qsize() >= MAX_PENDING:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+        except RuntimeError:
+            # Event loop already closed (server shutting down)
+            self.cancel()
+
+    def _summary(self) -> Dict[str, Any]:
+        return {
+            "iteration": self.iteration,
+            "error": _num(self.error),
+            "elapsed_ms": (time.perf_counter() - self._t0) * 1000.0,
+        }
+
+    def _run(self, solve: Callable[["ProgressChannel"], Dict[str, Any]]) -> None:
+        try:
+            result = solve(self)
+            self._emit("done", {**self._summary(), "result": result})
+        except SolverCancelled:
+            self._emit("cancelled", self._summary())
+        except Exception as e:
+            self._emit("error", {**self._summary(), "error": str(e)})
+
+    async def stream(self, request, solve: Callable[["ProgressChannel"], Dict[str, Any]]) -> AsyncIterator[str]:
+        """
+        Run `solve(channel)` in the threadpool and yield SSE frames until it
+        finishes. Disconnects (checked between events) cancel the solver.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        worker = asyncio.ensure_future(run_in_threadpool(self._run, solve))
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(self._queue.get(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    continue
+                yield sse_frame(event)
+                if event["event"] in ("done", "error", "cancelled"):
+                    break
+        finally:
+            # Client gone, stream closed or finished: the loop stops at its next report()
+            self.cancel()
+            worker.cancel()
+
+
+def sse_frame(event: Dict[str, Any]) -> str:
+    return f"event: {event['event']}\ndata: {json.dumps(event, default=_json_default)}\n\n"
+
+
+def _num(v: Optional[float]) -> Optional[float]:
+    if v is None:
+        return None
+    v = float(v)
+    return v if math.isfinite(v) else None
+
+
+def _json_default(o: Any):
+    # numpy scalars / arrays inside solver results
+    if hasattr(o, "tolist"):
+        return o.tolist()
+    return str(o)
@@ -0,0 +1,300 @@
+# tools/result_cache.py
+# ---------------------------------------------------------------
+# Content-addressed response cache for deterministic /eval/* routes.
+# - Key: sha256 of (path + query, canonical body). JSON bodies are
+#   normalised (sorted keys, 1 == 1.0); form bodies are sorted by field.
+# - Stores the finished response (status 200, headers, body bytes), so a
+#   hit skips both the computation and the serialization. Streams (SSE /
+#   ndjson, or any response with "Cache-Control: no-store") are passed
+#   through without buffering; a body is only kept once it is complete
+#   and while it fits in max_entry_bytes.
+# - Tier 1: in-memory LRU bounded by total bytes.
+# - Tier 2 (optional): SQLite file that survives restarts, bounded by
+#   entries; hits are promoted to memory.
+# - Single-flight: identical requests that arrive while the first one is
+#   still computing wait for it and get the same response (even errors).
+# - Response headers: X-Cache (HIT / MISS / COALESCED / BYPASS), X-Cache-Tier,
+#   X-Cache-Key.
+#   A request with "Cache-Control: no-cache" bypasses the cache.
+# - Only JSON and urlencoded bodies are read (to hash them); any other body
+#   (multipart uploads) bypasses the cache and streams to the app unread.
+# ---------------------------------------------------------------
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from starlette.concurrency import run_in_threadpool
+
+from tools.asgi import read_body, replay_body, with_headers
+
+# Bump when a method's output changes, so old disk entries stop matching
+CACHE_VERSION = 1
+MAX_MEMORY_BYTES = 64 * 1024 * 1024
+MAX_ENTRY_BYTES = 8 * 1024 * 1024
+MAX_DISK_ENTRIES = 20_000
+
+# (status, [(header, value)], body)
+Entry = Tuple[int, List[Tuple[bytes, bytes]], bytes]
+
+SKIPPED_HEADERS = {b"set-cookie", b"date", b"server"}
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return str(value)
+
+
+KEYED_CONTENT_TYPES = ("application/json", "application/x-www-form-urlencoded")
+
+
+def cache_key(path: str, content_type: str, body: bytes) -> Optional[str]:
+    """Canonical hash of one request, or None if the body can't be normalised."""
+    if content_type.startswith("application/json"):
+        try:
+            canon = _canonical(json.loads(body or b"null"))
+        except ValueError:
+            return None
+    elif content_type.startswith("application/x-www-form-urlencoded"):
+        canon = sorted(parse_qsl(body.decode("utf-8", errors="replace"), keep_blank_values=True))
+    else:
+        return None
+    text = json.dumps([CACHE_VERSION, path, canon], sort_keys=True, separators=(",", ":"), allow_nan=True)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class ResultCache:
+    """LRU of finished responses with an optional SQLite tier."""
+
+    def __init__(self, max_bytes: int = MAX_MEMORY_BYTES, max_entry_bytes: int = MAX_ENTRY_BYTES,
+                 db_path: Optional[str] = None, max_disk_entries: int = MAX_DISK_ENTRIES):
+        self.max_bytes = int(max_bytes)
+        self.max_entry_bytes = int(max_entry_bytes)
+        self.max_disk_entries = int(max_disk_entries)
+        self._entries: "OrderedDict[str, Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # coalesced: peticiones servidas con el cálculo de otra idéntica en curso
+        # waiting: peticiones esperando ahora mismo a un cálculo en curso
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0,
+                      "coalesced": 0, "waiting": 0}
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if db_path:
+            self._open_db(db_path)
+
+    @property
+    def persistent(self) -> bool:
+        return self._db is not None
+
+    # ===== memory tier =====
+    def get(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+            return entry
+
+    def put(self, key: str, entry: Entry) -> bool:
+        size = len(entry[2])
+        if size > self.max_entry_bytes:
+            return False
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[2])
+            self._entries[key] = entry
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted[2])
+                self.stats["evictions"] += 1
+        return True
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "entries": len(self._entries), "bytes": self._bytes,
+                    "disk": self.persistent}
+
+    # ===== disk tier =====
+    def _open_db(self, path: str) -> None:
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY, status INTEGER, headers TEXT, body BLOB, accessed REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results(accessed)")
+
+    def disk_get(self, key: str) -> Optional[Entry]:
+        if self._db is None:
+            return None
+        with self._db_lock:
+            row = self._db.execute("SELECT status, headers, body FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+        status, headers, body = row
+        entry = (status, [(k.encode("latin-1"), v.encode("latin-1")) for k, v in json.loads(headers)], bytes(body))
+        with self._lock:
+            self.stats["disk_hits"] += 1
+        self.put(key, entry)
+        return entry
+
+    def disk_put(self, key: str, entry: Entry) -> None:
+        if self._db is None:
+            return
+        status, headers, body = entry
+        headers_json = json.dumps([(k.decode("latin-1"), v.decode("latin-1")) for k, v in headers])
+        with self._db_lock:
+            self._db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                             (key, status, headers_json, body, time.time()))
+            # Poda por antigüedad de acceso cuando se pasa del límite
+            count = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            if count > self.max_disk_entries:
+                self._db.execute(
+                    "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY accessed LIMIT ?)",
+                    (count - self.max_disk_entries,))
+
+
+class ResultCacheMiddleware:
+    """
+    ASGI middleware: POSTs to `paths` are answered from `cache` when the
+    same canonical request was already computed; 200 responses are stored.
+    """
+
+    def __init__(self, app, cache: ResultCache, paths: Iterable[str]):
+        self.app = app
+        self.cache = cache
+        self.paths = frozenset(paths)
+        # key -> Future con la respuesta de la petición que la está calculando
+        self._inflight: Dict[str, "asyncio.Future[Optional[Entry]]"] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_type = headers.get(b"content-type", b"").decode("latin-1")
+        if b"no-cache" in headers.get(b"cache-control", b"") or not content_type.startswith(KEYED_CONTENT_TYPES):
+            # Sin leer el cuerpo: un multipart grande pasa en streaming
+            await self.app(scope, receive, with_headers(send, [(b"x-cache", b"BYPASS")]))
+            return
+
+        body = await read_body(receive)
+        replay = replay_body(body, receive)
+
+        # La query cuenta (p. ej. ?format=json da otra respuesta)
+        path = scope["path"]
+        if scope.get("query_string"):
+            path += "?" + scope["query_string"].decode("latin-1")
+        key = cache_key(path, content_type, body)
+        if key is None:
+            await self.app(scope, replay, with_headers(send, [(b"x-cache", b"BYPASS")]))
+            return
+
+        short = key[:16].encode()
+        entry = self.cache.get(key)
+        if entry is not None:
+            await _send_entry(send, entry, [(b"x-cache", b"HIT"), (b"x-cache-tier", b"memory"), (b"x-cache-key", short)])
+            return
+
+        # Single-flight: si la misma petición ya se está calculando, se espera su respuesta
+        leader = self._inflight.get(key)
+        if leader is not None:
+            self.cache.stats["waiting"] += 1
+            try:
+                shared = await asyncio.shield(leader)
+            finally:
+                self.cache.stats["waiting"] -= 1
+            if shared is not None:
+                self.cache.stats["coalesced"] += 1
+                await _send_entry(send, shared, [(b"x-cache", b"COALESCED"), (b"x-cache-key", short)])
+                return
+            # El líder falló o su respuesta no es compartible: se calcula aparte
+            await self.app(scope, replay, with_headers(send, [(b"x-cache", b"MISS"), (b"x-cache-key", short)]))
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        shared = None
+        try:
+            if self.cache.persistent:
+                entry = await run_in_threadpool(self.cache.disk_get, key)
+                if entry is not None:
+                    shared = entry
+                    await _send_entry(send, entry, [(b"x-cache", b"HIT"), (b"x-cache-tier", b"disk"), (b"x-cache-key", short)])
+                    return
+            shared = await self._compute(scope, replay, send, key, short)
+        finally:
+            del self._inflight[key]
+            future.set_result(shared)
+
+    async def _compute(self, scope, receive, send, key: str, short: bytes) -> Optional[Entry]:
+        """
+        Runs the route, stores a cacheable 200 and returns the full response
+        (None if it was streamed, cut short or too big to keep).
+        """
+        self.cache.stats["misses"] += 1
+        captured: Dict[str, Any] = {"status": None, "headers": [], "chunks": [], "size": 0,
+                                    "buffering": True, "complete": False}
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                captured["status"] = message["status"]
+                captured["headers"] = [(k, v) for k, v in message.get("headers", []) if k.lower() not in SKIPPED_HEADERS]
+                found = {k.lower(): v for k, v in captured["headers"]}
+                streaming = found.get(b"content-type", b"").startswith((b"text/event-stream", b"application/x-ndjson"))
+                captured["buffering"] = not streaming and b"no-store" not in found.get(b"cache-control", b"")
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"x-cache", b"MISS"), (b"x-cache-key", short)]}
+            elif message["type"] == "http.response.body":
+                if captured["buffering"]:
+                    chunk = message.get("body", b"")
+                    captured["size"] += len(chunk)
+                    if captured["size"] > self.cache.max_entry_bytes:
+                        # No cabe en la caché: se deja de acumular
+                        captured["buffering"] = False
+                        captured["chunks"] = []
+                    else:
+                        captured["chunks"].append(chunk)
+                if not message.get("more_body", False):
+                    captured["complete"] = True
+            await send(message)
+
+        await self.app(scope, receive, capture)
+
+        if not (captured["buffering"] and captured["complete"]) or captured["status"] is None:
+            return None
+        entry = (captured["status"], captured["headers"], b"".join(captured["chunks"]))
+        # Las respuestas de error se comparten con las peticiones en espera, pero no se guardan
+        if entry[0] == 200 and self.cache.put(key, entry):
+            self.cache.stats["stores"] += 1
+            if self.cache.persistent:
+                await run_in_threadpool(self.cache.disk_put, key, entry)
+        return entry
+
+
+async def _send_entry(send, entry: Entry, extra: List[Tuple[bytes, bytes]]) -> None:
+    status, headers, body = entry
+    await send({"type": "http.response.start", "status": status, "headers": headers + extra})
+    await send({"type": "http.response.body", "body": body})
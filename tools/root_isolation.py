@@ -0,0 +1,115 @@
+# tools/root_isolation.py
+# ---------------------------------------------------------------
+# Root-isolation pipeline (one request instead of N+1):
+# 1) Incremental scan for sign changes, vectorized with numpy.
+# 2) Every bracket is refined concurrently (bisection / false position)
+#    on a shared worker pool.
+# 3) Events are yielded as each root converges, so the route can
+#    stream them (NDJSON) instead of waiting for the slowest bracket.
+# ---------------------------------------------------------------
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator
+
+import numpy as np
+from sympy import symbols, sympify, lambdify
+
+from tools.methods.bisection import bisection
+from tools.methods.false_position import false_position
+
+REFINERS = {
+    "bisection": bisection,
+    "false_position": false_position,
+}
+
+MAX_SCAN_POINTS = 1_000_000
+REFINE_WORKERS = 4
+
+# Shared by all requests; a cancelled stream cancels its pending futures
+_refine_pool = ThreadPoolExecutor(max_workers=REFINE_WORKERS, thread_name_prefix="bracket-refine")
+
+
+def scan_sign_changes(f: str, x0: float, delta_x: float, max_iter: int):
+    """
+    Same grid as incremental_search (a = x0 + k*delta_x, k < max_iter),
+    evaluated in one numpy call. Returns the brackets [a, b] with
+    f(a)*f(b) < 0 and the grid points where f is exactly 0.
+    """
+    max_iter = int(max_iter)
+    if not 1 <= max_iter <= MAX_SCAN_POINTS:
+        raise ValueError(f"max_iter must be between 1 and {MAX_SCAN_POINTS}")
+    if delta_x == 0:
+        raise ValueError("delta_x must be non-zero")
+
+    x = symbols("x")
+    fun = lambdify(x, sympify(f), "numpy")
+    xs = x0 + delta_x * np.arange(max_iter + 1, dtype=float)
+    with np.errstate(all="ignore"):
+        fx = np.broadcast_to(np.asarray(fun(xs), dtype=float), xs.shape)
+
+    change = np.flatnonzero(fx[:-1] * fx[1:] < 0)
+    brackets = [[float(xs[k]), float(xs[k + 1])] for k in change]
+    exact = [float(v) for v in xs[fx == 0]]
+    return brackets, exact
+
+
+def isolate_roots(f: str, x0: float, delta_x: float, max_iter: int,
+                  method: str = "bisection", nmax: int = 100, tolerance: float = 1e-7) -> Iterator[Dict[str, Any]]:
+    """
+    Generator of pipeline events:
+      {"event": "scan", ...}  brackets found
+      {"event": "root", ...}  one per bracket, in completion order
+      {"event": "done", ...}  all roots sorted
+    If the consumer stops iterating (client disconnect), the brackets
+    not yet started are cancelled.
+    """
+    refine = REFINERS.get(method)
+    if refine is None:
+        raise ValueError(f"method must be one of {sorted(REFINERS)}")
+
+    t0 = time.perf_counter()
+    brackets, exact = scan_sign_changes(f, x0, delta_x, max_iter)
+    yield {
+        "event": "scan",
+        "intervals": brackets,
+        "exact_roots": exact,
+        "scan_ms": (time.perf_counter() - t0) * 1000.0,
+    }
+
+    roots = [{"root": r, "interval": [r, r], "iterations": 0, "error": 0.0,
+              "message": "Exact zero on the scan grid"} for r in exact]
+
+    futures = {
+        _refine_pool.submit(refine, f, lo, hi, int(nmax), 1, float(tolerance)): (lo, hi)
+        for lo, hi in (sorted(b) for b in brackets)
+    }
+    try:
+        for fut in as_completed(futures):
+            lo, hi = futures[fut]
+            try:
+                res = fut.result()
+                event = {
+                    "root": res["final_root"],
+                    "interval": [lo, hi],
+                    "iterations": res["iterations"][-1] if res["iterations"] else 0,
+                    "error": res["errors"][-1] if res["errors"] else None,
+                    "message": res["message"],
+                }
+                roots.append(event)
+            except Exception as e:
+                event = {"root": None, "interval": [lo, hi], "message": f"Error: {e}"}
+            event["event"] = "root"
+            event["elapsed_ms"] = (time.perf_counter() - t0) * 1000.0
+            yield event
+    finally:
+        for fut in futures:
+            fut.cancel()
+
+    roots = sorted((r for r in roots if r["root"] is not None), key=lambda r: r["root"])
+    yield {
+        "event": "done",
+        "roots": [r["root"] for r in roots],
+        "total_intervals": len(brackets),
+        "total_ms": (time.perf_counter() - t0) * 1000.0,
+    }
@@ -0,0 +1,162 @@
+# tools/spline_log.py
+# ---------------------------------------------------------------
+# Buffered background sink for the spline tracer logs (splines.log).
+# - One JSON object per line, same format as before.
+# - Writes happen on a daemon thread; the request path only enqueues.
+# - Records are batched into a single write() per flush.
+# - Size-based rotation: splines.log -> splines.log.1 -> ... .N
+# - close() drains the queue (called from the app shutdown and atexit).
+# ---------------------------------------------------------------
+
+import atexit
+import json
+import os
+import queue
+import threading
+from typing import Any, Dict, Iterable, List
+
+
+class SplineLogWriter:
+    """Queue-backed JSON-lines writer with batching and rotation."""
+
+    def __init__(
+        self,
+        path: str = "splines.log",
+        max_bytes: int = 5 * 1024 * 1024,
+        backup_count: int = 3,
+        batch_size: int = 1024,
+        flush_interval: float = 0.5,
+    ):
+        self.path = path
+        self.max_bytes = int(max_bytes)
+        self.backup_count = int(backup_count)
+        self.batch_size = int(batch_size)
+        self.flush_interval = float(flush_interval)
+
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    # ===== public API =====
+    def write(self, record: Dict[str, Any]) -> None:
+        """Enqueue a single record."""
+        self.write_many([record])
+
+    def write_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Enqueue a group of records as one item (one queue put per request)."""
+        records = list(records)
+        if not records or self._closed:
+            return
+        self._ensure_started()
+        self._queue.put(records)
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until everything enqueued so far has been written."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Drain pending records and stop the worker thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+
+    # ===== worker =====
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="spline-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        stream = None
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+
+                # Gather whatever else is already waiting, up to batch_size records
+                lines: List[str] = []
+                waiters: List[threading.Event] = []
+                stop = False
+                while True:
+                    if item is None:
+                        stop = True
+                    elif isinstance(item, threading.Event):
+                        waiters.append(item)
+                    else:
+                        for rec in item:
+                            try:
+                                lines.append(json.dumps(rec, ensure_ascii=False))
+                            except (TypeError, ValueError):
+                                continue
+                    if stop or len(lines) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+
+                if lines:
+                    try:
+                        stream = self._write_batch(stream, lines)
+                    except OSError:
+                        # Logging must never break the computation
+                        stream = self._close_stream(stream)
+
+                for w in waiters:
+                    w.set()
+                if stop:
+                    break
+        finally:
+            self._close_stream(stream)
+
+    def _write_batch(self, stream, lines: List[str]):
+        if stream is None:
+            stream = open(self.path, "a", encoding="utf-8")
+        stream.write("\n".join(lines) + "\n")
+        stream.flush()
+        if self.max_bytes > 0 and stream.tell() >= self.max_bytes:
+            stream = self._close_stream(stream)
+            self._rotate()
+        return stream
+
+    def _rotate(self) -> None:
+        if self.backup_count <= 0:
+            os.remove(self.path)
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    @staticmethod
+    def _close_stream(stream):
+        if stream is not None:
+            try:
+                stream.close()
+            except OSError:
+                pass
+        return None
+
+
+# Shared sink used by the tracer modules
+spline_log = SplineLogWriter("splines.log")
+atexit.register(spline_log.close)
@@ -0,0 +1,197 @@
+# tools/step_stream.py
+# ---------------------------------------------------------------
+# Streaming JSON writer for the step logs of the direct methods
+# (gauss_*, crout, doolittle, lu_*, cholesky).
+# - The solver runs in the threadpool and appends its steps to a StepLog
+#   instead of a list. Each step is serialized as soon as it is appended
+#   and handed to the response through a small bounded queue, so only a
+#   few steps are in memory at once (the solver waits if the client is
+#   slower than it, at most SEND_TIMEOUT_S per step; then it is cancelled).
+# - Small logs (< STREAM_AFTER_BYTES) still go out as one plain JSON
+#   response, byte-identical to the old JSONResponse. Bigger ones are
+#   sent chunked as they are produced: same keys, step list first
+#   ({"logs": [step, step, ...], "solution": ...}).
+# - A failure before streaming starts is raised to the route (usual 4xx /
+#   500); a failure afterwards closes the document with an "error" key.
+#   Streamed responses go out with "Cache-Control: no-store" so the result
+#   cache never keeps them (they may end in an error or be cut short).
+# - Client disconnect: the next append() raises StepsCancelled and the
+#   solver stops; the response waits for its thread before finishing.
+# ---------------------------------------------------------------
+
+import asyncio
+import concurrent.futures
+import json
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response, StreamingResponse
+
+# Bytes of serialized steps held back before switching to streaming
+STREAM_AFTER_BYTES = 64 * 1024
+# Serialized steps waiting to be sent
+MAX_PENDING = 4
+# Longest the solver thread waits for room in the queue (slow reader)
+SEND_TIMEOUT_S = 30.0
+
+
+class StepsCancelled(Exception):
+    """Raised inside the solver by StepLog.append once the response is gone."""
+
+
+def dumps(value: Any) -> str:
+    # Mismo formato que JSONResponse.render
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"))
+
+
+class StepLog:
+    """
+    Stand-in for a solver's list of steps: append() serializes the step and
+    queues it for the response; nothing is kept.
+    """
+
+    def __init__(self, stream: "StepStream"):
+        self._stream = stream
+        self.count = 0
+
+    def append(self, step: Any) -> None:
+        self._stream._put(("step", dumps(self._stream.serialize(step))))
+        self.count += 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self):
+        # Los pasos ya se enviaron
+        return iter(())
+
+
+class StepStream:
+    """
+    One response of a step-logging solver. `key` is the result field that
+    holds the steps ("logs" / "etapas"); `serialize` turns one step into
+    JSON-able data and `encode` does the same for the other fields.
+    """
+
+    def __init__(self, key: str, serialize: Optional[Callable[[Any], Any]] = None,
+                 encode: Optional[Callable[[Any], Any]] = None, stream_after: int = STREAM_AFTER_BYTES):
+        self.key = key
+        self.serialize = serialize or (lambda step: step)
+        self.encode = encode or (lambda value: value)
+        self.stream_after = int(stream_after)
+        self.cancelled = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional["asyncio.Queue[Tuple[str, Any]]"] = None
+        self._task: Optional[asyncio.Future] = None
+
+    # ===== solver side (worker thread) =====
+    def _put(self, item: Tuple[str, Any]) -> None:
+        if self.cancelled.is_set():
+            raise StepsCancelled()
+        try:
+            # Bloquea mientras la cola está llena (contrapresión), con límite
+            future = asyncio.run_coroutine_threadsafe(self._queue.put(item), self._loop)
+            future.result(SEND_TIMEOUT_S)
+        except concurrent.futures.TimeoutError:
+            # El cliente no lee: se abandona la respuesta en vez de retener el hilo
+            future.cancel()
+            self.cancelled.set()
+            raise StepsCancelled()
+        except (RuntimeError, concurrent.futures.CancelledError):
+            # Event loop cerrado (el servidor se está apagando)
+            self.cancelled.set()
+            raise StepsCancelled()
+
+    def _run(self, solve: Callable[[StepLog], Dict[str, Any]]) -> None:
+        try:
+            result = solve(StepLog(self))
+            self._put(("done", result))
+        except StepsCancelled:
+            pass
+        except Exception as e:
+            try:
+                self._put(("error", e))
+            except StepsCancelled:
+                pass
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+        # Vacía la cola para liberar un put() bloqueado; el siguiente append() se detiene
+        while self._queue is not None and not self._queue.empty():
+            self._queue.get_nowait()
+
+    async def _join(self) -> None:
+        """Cancel and wait for the solver thread (it stops at its next append)."""
+        self.cancel()
+        if self._task is None or self._task.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), SEND_TIMEOUT_S)
+        except asyncio.TimeoutError:
+            # Paso muy largo sin append(): el hilo termina solo, la tarea sigue referenciada
+            pass
+
+    # ===== response side (event loop) =====
+    async def response(self, solve: Callable[[StepLog], Dict[str, Any]]) -> Response:
+        """Run `solve(steps)` in the threadpool; exceptions before streaming starts propagate."""
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(MAX_PENDING)
+        self._task = asyncio.ensure_future(run_in_threadpool(self._run, solve))
+
+        chunks: List[str] = []
+        size = 0
+        try:
+            while size < self.stream_after:
+                kind, value = await self._queue.get()
+                if kind == "error":
+                    raise value
+                if kind == "done":
+                    return Response(self._document(value, chunks), media_type="application/json")
+                chunks.append(value)
+                size += len(value)
+        except BaseException:
+            await self._join()
+            raise
+        return StreamingResponse(self._stream(chunks), media_type="application/json",
+                                 headers={"cache-control": "no-store"})
+
+    def _document(self, result: Dict[str, Any], chunks: List[str]) -> str:
+        """Whole result in its own key order, steps already serialized."""
+        members = []
+        for k, v in result.items():
+            if k == self.key:
+                members.append(dumps(k) + ":[" + ",".join(chunks + self._extra(v)) + "]")
+            else:
+                members.append(dumps(k) + ":" + dumps(self.encode(v)))
+        return "{" + ",".join(members) + "}"
+
+    def _extra(self, steps: Any) -> List[str]:
+        # Pasos devueltos en una lista normal (no pasaron por el StepLog)
+        if isinstance(steps, StepLog) or not isinstance(steps, list):
+            return []
+        return [dumps(self.serialize(s)) for s in steps]
+
+    def _tail(self, result: Dict[str, Any]) -> str:
+        extra = "".join("," + c for c in self._extra(result.get(self.key)))
+        rest = "".join("," + dumps(k) + ":" + dumps(self.encode(v)) for k, v in result.items() if k != self.key)
+        return extra + "]" + rest + "}"
+
+    async def _stream(self, chunks: List[str]):
+        try:
+            head = "{" + dumps(self.key) + ":[" + ",".join(chunks)
+            chunks.clear()
+            yield head
+            while True:
+                kind, value = await self._queue.get()
+                if kind == "step":
+                    yield "," + value
+                elif kind == "done":
+                    yield self._tail(value)
+                    return
+                else:
+                    # Ya se envió el 200: el error cierra el documento
+                    yield "]," + dumps("error") + ":" + dumps(f"Internal server error: {value}") + "}"
+                    return
+        finally:
+            await self._join()
@@ -1,5 +1,6 @@
 from sympy.parsing.latex import parse_latex
 from sympy import *
+import numpy as np
 
 #TODO: Este metodo deberia, verificar continuidad, encontrar intervalo adeacuado
 def validate_math_function(expr_str: str) -> bool:
@@ -125,4 +126,184 @@ def latex_to_callable_function(latex_str):
     expr = sympify(sympy_str)
     func = lambdify(x, expr, modules=['numpy', 'math'])
     
-    return func
\ No newline at end of file
+    return func
+
+
+# ===================== Polinomios: todas las raíces a la vez =====================
+
+def polynomial_coefficients(f: str):
+    """
+    Si f es un polinomio en x (grado >= 1, coeficientes numéricos reales)
+    devuelve sus coeficientes como array float, grado mayor primero.
+    En cualquier otro caso (sin(x), 1/x, x**0.5, parámetros libres...) None.
+    """
+    x = symbols("x")
+    try:
+        poly = Poly(sympify(f), x)
+        if poly.degree() < 1:
+            return None
+        return np.array([float(c) for c in poly.all_coeffs()], dtype=float)
+    except Exception:
+        return None
+
+
+_EPS = np.finfo(float).eps
+_SQRT_EPS = np.sqrt(_EPS)
+# Holguras al aceptar un grupo: dispersión frente a eps**(1/m), |p(centro)|
+# y |p^(j)(centro)| frente al error de redondeo de Horner
+_SPREAD_SLACK = 100.0
+_MERGE_SLACK = 10.0
+_DERIV_SLACK = 1e3
+
+
+def _horner_error(c, z):
+    """Cota del error de redondeo de np.polyval(c, z)."""
+    return _EPS * np.polyval(np.abs(c), np.abs(z))
+
+
+def _vanishes(c, z, slack: float = _DERIV_SLACK):
+    """|p(z)| al nivel del redondeo (z escalar o array)."""
+    return np.abs(np.polyval(c, z)) <= slack * _horner_error(c, z)
+
+
+def _merge_multiple_roots(coeffs, z, polish_steps: int = 3):
+    """
+    Agrupa las raíces que son una misma raíz múltiple. Un grupo de m
+    valores se acepta si su dispersión es del orden de eps**(1/m)
+    (relativo) y en su centro, pulido, p y sus derivadas hasta la m-1 se
+    anulan (al nivel del redondeo; |p| también puede igualar el residuo de
+    los miembros). Dos raíces simples cercanas no lo cumplen: p' no se
+    anula entre ellas. Cada grupo pasa a ser su centro, repetido m veces
+    (el grado no cambia). Devuelve (raíces, multiplicidad de cada una).
+    """
+    z = np.asarray(z, dtype=complex).copy()
+    multiplicity = np.ones(len(z), dtype=int)
+    free = np.ones(len(z), dtype=bool)
+    # derivs[j] = coeficientes de p^(j)
+    derivs = [coeffs]
+    for _ in range(len(z)):
+        derivs.append(np.polyder(derivs[-1]))
+    # Radio de búsqueda: dispersión de una raíz de multiplicidad = grado
+    radius = 2.0 * _SPREAD_SLACK * _EPS ** (1.0 / max(len(z), 1))
+    for i in range(len(z)):
+        if not free[i]:
+            continue
+        scale = max(1.0, abs(z[i]))
+        near = np.flatnonzero(free & (np.abs(z - z[i]) <= radius * scale))
+        if len(near) < 2:
+            continue
+        near = near[np.argsort(np.abs(z[near] - z[i]))]
+        # Candidatos: los m más cercanos, para todo m a la vez. Descartes
+        # baratos antes de pulir: dispersión y p'(centro) ~ 0 (el centro de
+        # un grupo de eigvals es exacto casi a eps)
+        sizes = np.arange(1, len(near) + 1)
+        centers = np.cumsum(z[near]) / sizes
+        inside = np.arange(len(near))[None, :] < sizes[:, None]
+        spread = np.where(inside, np.abs(z[near][None, :] - centers[:, None]), 0.0).max(axis=1)
+        ok = (spread <= _SPREAD_SLACK * _EPS ** (1.0 / sizes) * scale) & _vanishes(derivs[1], centers)
+        # El grupo más grande que se acepta (los más cercanos primero)
+        for m in sizes[1:][ok[1:]][::-1]:
+            group = near[:m]
+            center = _polish_multiple(derivs[m - 1], derivs[m], centers[m - 1], polish_steps)
+            if _is_multiple_root(derivs, center, m, z[group]):
+                z[group] = center
+                multiplicity[group] = m
+                free[group] = False
+                break
+    return z, multiplicity
+
+
+def _is_multiple_root(derivs, center, m: int, members) -> bool:
+    members_residual = np.max(np.abs(np.polyval(derivs[0], members)))
+    bound = max(members_residual, _horner_error(derivs[0], center))
+    if abs(np.polyval(derivs[0], center)) > _MERGE_SLACK * bound:
+        return False
+    return all(_vanishes(derivs[j], center) for j in range(1, m))
+
+
+def _polish_multiple(d, dd, z0, steps: int = 3):
+    """Newton sobre d = p^(m-1) (dd = p^(m)), donde una raíz de multiplicidad m es simple."""
+    z, value = z0, abs(np.polyval(d, z0))
+    for _ in range(int(steps)):
+        slope = np.polyval(dd, z)
+        if slope == 0:
+            break
+        z_new = z - np.polyval(d, z) / slope
+        value_new = abs(np.polyval(d, z_new))
+        if not value_new < value:
+            break
+        z, value = z_new, value_new
+    return z
+
+
+def polynomial_roots(f: str, polish_steps: int = 3, tol: float = 1e-12):
+    """
+    Todas las raíces (reales y complejas) de un polinomio en una sola llamada:
+    autovalores de la matriz compañera y luego unos pasos de Newton en lote
+    sobre todas las raíces a la vez (Horner vectorizado con np.polyval).
+    Un paso solo se acepta en las raíces donde baja el residuo |p(z)|.
+    Una raíz de multiplicidad m sale de eigvals como un grupo de m valores
+    a distancia ~eps**(1/m) (p. ej. (x-1)**3 -> 0.999997 ± 6e-6i): antes
+    del pulido el grupo se reemplaza por su centro, pulido con Newton sobre
+    la derivada m-1 (ver _merge_multiple_roots).
+    Devuelve None si f no es un polinomio.
+    """
+    coeffs = polynomial_coefficients(f)
+    if coeffs is None:
+        return None
+
+    # Ceros finales -> raíces exactas en 0 (la matriz compañera sería singular)
+    nonzero = np.flatnonzero(coeffs)
+    zeros_at_origin = len(coeffs) - 1 - nonzero[-1]
+    c = coeffs[: nonzero[-1] + 1]
+
+    n = len(c) - 1
+    if n > 0:
+        companion = np.zeros((n, n), dtype=float)
+        companion[0, :] = -c[1:] / c[0]
+        companion[1:, :-1] = np.eye(n - 1)
+        z = np.linalg.eigvals(companion).astype(complex)
+    else:
+        z = np.empty(0, dtype=complex)
+    z = np.concatenate([z, np.zeros(zeros_at_origin, dtype=complex)])
+
+    # Raíces múltiples: cada grupo pasa a su centro (ya pulido)
+    z, multiplicity = _merge_multiple_roots(coeffs, z, polish_steps)
+
+    # Pulido con Newton en lote de las raíces simples
+    simple = multiplicity == 1
+    dcoeffs = np.polyder(coeffs)
+    residual = np.abs(np.polyval(coeffs, z))
+    steps_done = 0
+    for _ in range(int(polish_steps)):
+        dp = np.polyval(dcoeffs, z)
+        safe = simple & (dp != 0)
+        step = np.zeros_like(z)
+        step[safe] = np.polyval(coeffs, z[safe]) / dp[safe]
+        z_new = z - step
+        residual_new = np.abs(np.polyval(coeffs, z_new))
+        better = safe & (residual_new < residual)
+        z = np.where(better, z_new, z)
+        residual = np.where(better, residual_new, residual)
+        steps_done += 1
+        if not better.any() or np.max(np.abs(step[better])) < tol:
+            break
+
+    # Parte imaginaria despreciable (del orden de sqrt(eps)) -> raíz real
+    scale = np.maximum(1.0, np.abs(z))
+    is_real = np.abs(z.imag) <= _SQRT_EPS * scale
+    z = np.where(is_real, z.real + 0j, z)
+
+    order = np.lexsort((z.imag, z.real, ~is_real))
+    roots = [
+        {"real": float(z[k].real), "imag": float(z[k].imag), "residual": float(residual[k]),
+         "multiplicity": int(multiplicity[k])}
+        for k in order
+    ]
+    return {
+        "degree": int(len(coeffs) - 1),
+        "coefficients": coeffs.tolist(),
+        "roots": roots,
+        "real_roots": [r["real"] for r in roots if r["imag"] == 0.0],
+        "polish_steps": steps_done,
+    }
@@ -0,0 +1,115 @@
+# tools/tables.py
+# ---------------------------------------------------------------
+# Numeric tables of the step logs written by the elimination methods
+# (gauss_*, crout, doolittle), without pandas.
+# - Table keeps the float64 values and the column labels; it replaces the
+#   pd.DataFrame / pd.Series snapshots the solvers used to build.
+# - format=html (default): each table goes out as HTML + JSON, as the
+#   frontend expects. render_html writes the same "gauss-table" markup
+#   pandas' to_html produced, with a plain string builder (no DataFrame).
+# - format=json / msgpack: lean response, every table becomes a plain
+#   list of numbers (rows for matrices, flat for vectors).
+# ---------------------------------------------------------------
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import msgpack
+except ImportError:  # dependencia opcional (solo para format=msgpack)
+    msgpack = None
+
+FORMATS = ("html", "json", "msgpack")
+MEDIA_TYPES = {"json": "application/json", "msgpack": "application/msgpack"}
+
+
+class Table:
+    """Matrix (n x m) or vector snapshot: float64 values + column labels."""
+
+    __slots__ = ("values", "columns", "vector")
+
+    def __init__(self, data: Any, columns: Optional[Iterable[Any]] = None):
+        values = np.asarray(data, dtype=float)
+        # Un vector se guarda como una columna ("value", como Series.to_frame)
+        self.vector = values.ndim == 1
+        if self.vector:
+            values = values.reshape(-1, 1)
+        self.values = values
+        if columns is not None:
+            self.columns: List[Any] = list(columns)
+        else:
+            self.columns = ["value"] if self.vector else list(range(values.shape[1]))
+
+    def round(self, decimals: int) -> "Table":
+        """Rounded copy (the snapshot no longer shares memory with the solver)."""
+        table = Table.__new__(Table)
+        table.values = np.round(self.values, decimals)
+        table.columns = self.columns
+        table.vector = self.vector
+        return table
+
+    def tolist(self) -> List[Any]:
+        return self.values[:, 0].tolist() if self.vector else self.values.tolist()
+
+    def to_json(self) -> Dict[str, Any]:
+        """{'columns', 'rows'} as the html format sends next to the markup."""
+        return {"columns": [str(c) for c in self.columns], "rows": self.values.tolist()}
+
+    def to_html(self, decimals: int = 6) -> str:
+        return render_html(self.values, self.columns, decimals)
+
+
+# ===================== HTML =====================
+# Mismo marcado que DataFrame.round(d).to_html(index=False, classes="gauss-table",
+# border=0, float_format="%.{d}f"), que es lo que esperan las plantillas / JS.
+_TABLE_HEAD = '<table class="dataframe gauss-table">\n  <thead>\n    <tr style="text-align: right;">\n'
+_CELL_SEP = "</td>\n      <td>"
+
+
+def _escape(label: Any) -> str:
+    return str(label).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def render_html(values: Any, columns: Sequence[Any], decimals: int = 6) -> str:
+    """Numeric table (rows x columns) as a gauss-table HTML string."""
+    values = np.round(np.asarray(values, dtype=float), decimals)
+    if values.ndim == 1:
+        values = values.reshape(-1, 1)
+    fmt = f"%.{int(decimals)}f"
+    parts = [_TABLE_HEAD]
+    parts += [f"      <th>{_escape(c)}</th>\n" for c in columns]
+    parts.append("    </tr>\n  </thead>\n  <tbody>\n")
+    if np.isnan(values).any():
+        cells = [[("NaN" if math.isnan(v) else fmt % v) for v in row] for row in values.tolist()]
+    else:
+        cells = [[fmt % v for v in row] for row in values.tolist()]
+    for row in cells:
+        parts.append("    <tr>\n      <td>" + _CELL_SEP.join(row) + "</td>\n    </tr>\n")
+    parts.append("  </tbody>\n</table>")
+    return "".join(parts)
+
+
+def parse_format(value: Any) -> str:
+    """'html' (default), 'json' or 'msgpack'; ValueError otherwise."""
+    fmt = "html" if value in (None, "") else str(value).strip().lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Parameter 'format' must be one of: {', '.join(FORMATS)}.")
+    if fmt == "msgpack" and msgpack is None:
+        raise ValueError("format=msgpack is not available: the msgpack package is not installed.")
+    return fmt
+
+
+def lean_log(log: Dict[str, Any]) -> Dict[str, Any]:
+    """One step with every Table replaced by its numbers."""
+    return {k: (v.tolist() if isinstance(v, Table) else v) for k, v in log.items()}
+
+
+def lean(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Result of an elimination method with every Table replaced by its numbers."""
+    return {**result, "logs": [lean_log(log) for log in result.get("logs", [])]}
+
+
+def packb(content: Any) -> bytes:
+    return msgpack.packb(content, use_bin_type=True)